@@ -4,3 +4,18 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate
+
+        from . import signals  # noqa: F401
+        from .utils.db import configure_sqlite
+        from .utils.search_index import repair_sqlite_triggers
+
+        connection_created.connect(
+            configure_sqlite, dispatch_uid="api.configure_sqlite"
+        )
+        post_migrate.connect(
+            repair_sqlite_triggers, sender=self, dispatch_uid="api.search_index"
+        )
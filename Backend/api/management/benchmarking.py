@@ -0,0 +1,248 @@
+"""Offline stand-ins for the external services, shared by the benchmarks.
+
+``offline_services`` swaps yt-dlp, AssemblyAI, Gemini and oEmbed for local
+fakes with configurable latency, and ``throwaway_database`` runs a block
+against a freshly migrated database that is dropped afterwards.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import ExitStack, contextmanager
+from types import SimpleNamespace
+from typing import Iterator, Optional
+from unittest import mock
+
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from api.services.blog_generation import BlogGenerator
+from api.services.clients import registry
+from api.services.youtube import YouTubeAudioDownloader
+
+# Stands in for yt-dlp: sleeps, then writes a few KiB where yt-dlp would.
+FAKE_YTDLP = (
+    "import sys, time; time.sleep(float(sys.argv[1])); "
+    "open(sys.argv[2].replace('%(ext)s', 'webm'), 'wb').write(b'\\0' * 4096)"
+)
+
+
+class Latency:
+    def __init__(self, seconds: float, jitter: float, seed: int = 0):
+        self.seconds = seconds
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self) -> float:
+        with self._lock:
+            spread = self._rng.uniform(-self.jitter, self.jitter)
+        return max(0.0, self.seconds * (1 + spread))
+
+    def sleep(self) -> None:
+        time.sleep(self())
+
+
+def _gemini_response(text: Optional[str]) -> SimpleNamespace:
+    parts = [SimpleNamespace(text=text)] if text else []
+    return SimpleNamespace(text=text or "", parts=parts)
+
+
+class FakeGemini:
+    """``GenerativeModel`` stand-in writing a fixed markdown article.
+
+    Streams send the article in ``chunks`` pieces spread over the latency and
+    end with a chunk without parts, as Gemini's can.
+    """
+
+    def __init__(self, latency: Latency, article: str, chunks: int = 8):
+        self.latency = latency
+        self.article = article
+        self.chunks = chunks
+
+    def _pieces(self) -> list[str]:
+        size = -(-len(self.article) // self.chunks)
+        return [
+            self.article[start : start + size]
+            for start in range(0, len(self.article), size)
+        ]
+
+    def generate_content(self, prompt, stream=False):
+        if not stream:
+            self.latency.sleep()
+            return _gemini_response(self.article)
+        return self._stream()
+
+    def _stream(self):
+        pieces = self._pieces()
+        delay = self.latency() / len(pieces)
+        for piece in pieces:
+            time.sleep(delay)
+            yield _gemini_response(piece)
+        yield _gemini_response(None)
+
+    async def generate_content_async(self, prompt, stream=False):
+        if not stream:
+            await asyncio.sleep(self.latency())
+            return _gemini_response(self.article)
+        return self._astream()
+
+    async def _astream(self):
+        pieces = self._pieces()
+        delay = self.latency() / len(pieces)
+        for piece in pieces:
+            await asyncio.sleep(delay)
+            yield _gemini_response(piece)
+        yield _gemini_response(None)
+
+
+class FakeTranscriber:
+    """``aai.Transcriber`` stand-in."""
+
+    def __init__(self, latency: Latency, text: str):
+        self.latency = latency
+        self.text = text
+
+    def _transcript(self) -> SimpleNamespace:
+        return SimpleNamespace(text=self.text, words=[], audio_duration=0)
+
+    def transcribe(self, audio):
+        self.latency.sleep()
+        return self._transcript()
+
+    def transcribe_async(self, audio) -> Future:
+        future = Future()
+        threading.Timer(self.latency(), future.set_result, [self._transcript()]).start()
+        return future
+
+
+class FakeResponse:
+    def __init__(self, data: dict):
+        self._data = data
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return self._data
+
+
+def _oembed(params: dict) -> FakeResponse:
+    return FakeResponse({"title": f"Benchmark video {params['url'][-6:]}"})
+
+
+class FakeSession:
+    """Pooled ``requests.Session`` stand-in answering oEmbed lookups."""
+
+    def __init__(self, latency: Latency):
+        self.latency = latency
+
+    def get(self, url, params=None, timeout=None):
+        self.latency.sleep()
+        return _oembed(params)
+
+
+class FakeAsyncClient:
+    """``httpx.AsyncClient`` stand-in answering oEmbed lookups."""
+
+    def __init__(self, latency: Latency):
+        self.latency = latency
+
+    async def get(self, url, params=None):
+        await asyncio.sleep(self.latency())
+        return _oembed(params)
+
+
+@contextmanager
+def offline_services(
+    *,
+    transcript: str,
+    article: str,
+    gemini: Latency,
+    assemblyai: Latency,
+    oembed: Latency,
+    ytdlp: Latency,
+    **overrides,
+) -> Iterator[None]:
+    """Fakes every external service and uses a local-memory cache.
+
+    ``overrides`` are extra settings for the block. Throttles keep their code
+    path but never reject a request.
+    """
+
+    def fake_command(cls, link, output, mode):
+        return [sys.executable, "-c", FAKE_YTDLP, str(ytdlp()), output]
+
+    fakes = {
+        f"gemini:{BlogGenerator.DEFAULT_MODEL_NAME}": FakeGemini(gemini, article),
+        "assemblyai": FakeTranscriber(assemblyai, transcript),
+        "http": FakeSession(oembed),
+        "httpx": FakeAsyncClient(oembed),
+    }
+    with ExitStack() as stack:
+        stack.enter_context(
+            override_settings(
+                CACHES={
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                        "LOCATION": f"benchmark-{os.getpid()}",
+                    }
+                },
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+                TRANSCRIPT_CAPTIONS_ENABLED=False,
+                **overrides,
+            )
+        )
+        for name, fake in fakes.items():
+            stack.enter_context(registry.override(name, fake))
+        stack.enter_context(
+            mock.patch.object(
+                YouTubeAudioDownloader, "_command", classmethod(fake_command)
+            )
+        )
+        # Throttle rates are read at import.
+        stack.enter_context(
+            mock.patch.object(
+                SimpleRateThrottle,
+                "THROTTLE_RATES",
+                {scope: "1000000/s" for scope in ("generate_blog", "user")},
+            )
+        )
+        yield
+
+
+@contextmanager
+def throwaway_database(run: str) -> Iterator[str]:
+    """Runs the block on a new, migrated database, dropped on exit.
+
+    Uses the configured engine (SQLite or DATABASE_URL) so the numbers stay
+    comparable; yields the database name.
+    """
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    previous_test_name = test_settings.get("NAME")
+    if connection.vendor == "sqlite":
+        test_settings["NAME"] = os.path.join(
+            tempfile.gettempdir(), f"benchmark-{run}.sqlite3"
+        )
+    else:
+        test_settings["NAME"] = f"benchmark_{run}"
+    old_name = connection.settings_dict["NAME"]
+    try:
+        name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            yield name
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+    finally:
+        test_settings["NAME"] = previous_test_name
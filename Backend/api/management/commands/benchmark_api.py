@@ -0,0 +1,259 @@
+import json
+import random
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.management.benchmarking import Latency, offline_services, throwaway_database
+from api.management.commands.benchmark_sentences import _synthetic_transcript
+from api.models import BlogPost, Transcript
+from api.services import metrics
+from api.services.blog_generation import BlogGenerator
+
+ENDPOINTS = ("generate", "stream", "save", "list", "detail")
+TONES = ("professional", "casual", "witty", "technical")
+LENGTHS = ("short", "medium", "long")
+ARTICLE = "# Benchmark article\n\n" + " ".join(["word"] * 600)
+ARTICLE_HTML = BlogGenerator.render(ARTICLE)
+
+
+def _percentile(values: list[float], share: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise CommandError(
+                f"Unknown endpoint {name!r}; use {', '.join(ENDPOINTS)}."
+            )
+        mix[name] = int(weight or 1)
+    return mix
+
+
+class Command(BaseCommand):
+    help = (
+        "Drives the generate, stream, save, list and detail endpoints at a "
+        "given concurrency with yt-dlp, AssemblyAI, Gemini and oEmbed replaced "
+        "by local fakes and a local-memory cache. Reports throughput, "
+        "p50/p95/p99 latency and database queries per endpoint. Runs on a "
+        "throwaway database unless --use-configured-db is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--requests", type=int, default=50, help="Requests per thread."
+        )
+        parser.add_argument(
+            "--mix",
+            default="generate=1,save=2,list=5,detail=2",
+            help="Relative weight of each endpoint.",
+        )
+        parser.add_argument(
+            "--videos",
+            type=int,
+            default=10,
+            help="Distinct videos generated; fewer means more cache hits.",
+        )
+        parser.add_argument(
+            "--posts", type=int, default=50, help="Posts per user before the run."
+        )
+        parser.add_argument("--ytdlp-latency", type=float, default=0.3)
+        parser.add_argument("--assemblyai-latency", type=float, default=1.0)
+        parser.add_argument("--gemini-latency", type=float, default=0.8)
+        parser.add_argument("--oembed-latency", type=float, default=0.05)
+        parser.add_argument(
+            "--jitter", type=float, default=0.2, help="+/- share of each latency."
+        )
+        parser.add_argument(
+            "--transcript-minutes",
+            type=int,
+            default=10,
+            help="Length of the fake transcript.",
+        )
+        parser.add_argument(
+            "--mode", help="BLOG_GENERATION_MODE for the run (default: settings)."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--use-configured-db",
+            action="store_true",
+            help="Run against the configured database (its throwaway users and "
+            "posts are removed afterwards) instead of a new one.",
+        )
+
+    def handle(self, *args, **options):
+        mix = _parse_mix(options["mix"])
+        threads, per_thread = options["threads"], options["requests"]
+        run = uuid.uuid4().hex[:6]
+        media_root = tempfile.mkdtemp(prefix="benchmark-media-")
+
+        def latency(name: str) -> Latency:
+            return Latency(options[f"{name}_latency"], options["jitter"])
+
+        services = offline_services(
+            transcript=_synthetic_transcript(options["transcript_minutes"]),
+            article=ARTICLE,
+            gemini=latency("gemini"),
+            assemblyai=latency("assemblyai"),
+            oembed=latency("oembed"),
+            ytdlp=latency("ytdlp"),
+            MEDIA_ROOT=media_root,
+            AUDIO_DOWNLOAD_MODE="native",
+            TRANSCRIPTION_CHUNK_THRESHOLD=0,
+            BLOG_GENERATION_MODE=options["mode"] or settings.BLOG_GENERATION_MODE,
+        )
+
+        users: list[User] = []
+        tokens: list[str] = []
+        results = {name: [] for name in ENDPOINTS}
+        lock = threading.Lock()
+
+        def worker(index: int) -> None:
+            rng = random.Random(options["seed"] + index)
+            client = Client(HTTP_AUTHORIZATION=f"Bearer {tokens[index]}")
+            post_ids = list(
+                BlogPost.objects.filter(user=users[index]).values_list("id", flat=True)
+            )
+            names, weights = zip(*mix.items())
+            local = []
+            try:
+                for _ in range(per_thread):
+                    name = rng.choices(names, weights)[0]
+                    video_id = f"bench{run}{rng.randrange(options['videos']):03d}"
+                    video = f"https://www.youtube.com/watch?v={video_id}"
+                    tone, length = rng.choice(TONES), rng.choice(LENGTHS)
+                    started = time.perf_counter()
+                    body = None
+                    # The stream's pipeline queries from its own thread, so
+                    # only the request's own queries are counted for it.
+                    with CaptureQueriesContext(connection) as queries:
+                        if name in ("generate", "stream"):
+                            path = "/api/generate-blog/"
+                            response = client.post(
+                                path if name == "generate" else f"{path}stream/",
+                                {"link": video, "tone": tone, "length": length},
+                                content_type="application/json",
+                            )
+                            if response.streaming:
+                                body = b"".join(response.streaming_content)
+                        elif name == "save":
+                            response = client.post(
+                                "/api/save-blog/",
+                                {
+                                    "title": "Benchmark",
+                                    "content": ARTICLE_HTML,
+                                    "markdown": ARTICLE,
+                                    "link": video,
+                                    "tone": tone,
+                                    "length": length,
+                                    "force_update": True,
+                                },
+                                content_type="application/json",
+                            )
+                        elif name == "list":
+                            response = client.get("/api/blogs")
+                        else:
+                            response = client.get(f"/api/blogs/{rng.choice(post_ids)}/")
+                    elapsed = time.perf_counter() - started
+                    ok = response.status_code < 400
+                    if body is not None and b"event: error" in body:
+                        ok = False
+                    if name == "save" and ok:
+                        post_ids.append(json.loads(response.content)["id"])
+                    local.append((name, elapsed, len(queries), ok))
+            finally:
+                connections.close_all()
+            with lock:
+                for name, elapsed, count, ok in local:
+                    results[name].append((elapsed, count, ok))
+
+        metrics.registry.reset()
+        # Fixtures are created and removed under the fakes too, so signal
+        # handlers touch the local cache rather than the configured one.
+        with ExitStack() as stack:
+            if not options["use_configured_db"]:
+                stack.enter_context(throwaway_database(run))
+            stack.enter_context(services)
+            try:
+                for i in range(threads):
+                    user = User.objects.create_user(f"bench-{run}-{i}")
+                    users.append(user)
+                    tokens.append(str(RefreshToken.for_user(user).access_token))
+                    BlogPost.objects.bulk_create(
+                        BlogPost(
+                            user=user,
+                            youtube_link=f"https://www.youtube.com/watch?v=seed{run}{n}",
+                            youtube_title=f"Seed post {n}",
+                            generated_content=ARTICLE_HTML,
+                        )
+                        for n in range(options["posts"])
+                    )
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=threads) as pool:
+                    list(pool.map(worker, range(threads)))
+                elapsed = time.perf_counter() - started
+            finally:
+                Transcript.objects.filter(video_id__startswith=f"bench{run}").delete()
+                BlogPost.objects.filter(user__in=users).delete()
+                User.objects.filter(pk__in=[user.pk for user in users]).delete()
+                shutil.rmtree(media_root, ignore_errors=True)
+
+        self._report(results, elapsed, threads, per_thread)
+
+    def _report(self, results, elapsed, threads, per_thread):
+        self.stdout.write(
+            f"{connection.vendor}, {threads} threads x {per_thread} requests "
+            f"in {elapsed:.2f}s"
+        )
+        self.stdout.write(
+            f"{'endpoint':<9} {'count':>6} {'errors':>6} {'req/s':>8} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'max q':>6}"
+        )
+        for name in ENDPOINTS:
+            rows = results[name]
+            if not rows:
+                continue
+            latencies = [row[0] for row in rows]
+            queries = [row[1] for row in rows]
+            errors = sum(1 for row in rows if not row[2])
+            self.stdout.write(
+                f"{name:<9} {len(rows):>6} {errors:>6} {len(rows) / elapsed:>8.1f} "
+                f"{_percentile(latencies, 0.50) * 1000:>8.1f} "
+                f"{_percentile(latencies, 0.95) * 1000:>8.1f} "
+                f"{_percentile(latencies, 0.99) * 1000:>8.1f} "
+                f"{sum(queries) / len(queries):>8.1f} {max(queries):>6}"
+            )
+
+        self.stdout.write("")
+        self.stdout.write(f"{'stage':<20} {'count':>6} {'mean ms':>9} {'errors':>6}")
+        stages: dict[str, list[float]] = {}
+        for (stage, outcome), (total, count) in metrics.stage_totals().items():
+            row = stages.setdefault(stage, [0.0, 0.0, 0.0])
+            row[0] += count
+            row[1] += total
+            if outcome == "error":
+                row[2] += count
+        for stage, (count, total, errors) in sorted(stages.items()):
+            self.stdout.write(
+                f"{stage:<20} {int(count):>6} {total / count * 1000:>9.1f} "
+                f"{int(errors):>6}"
+            )
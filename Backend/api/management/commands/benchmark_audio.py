@@ -0,0 +1,70 @@
+import os
+import resource
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.services.transcription import TranscriptionService
+from api.services.youtube import AudioMode, YouTubeAudioDownloader
+
+
+def _cpu_seconds() -> float:
+    """User + system CPU of this process and its finished children (yt-dlp, ffmpeg)."""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares audio download modes for one video: wall time, CPU seconds and "
+        "bytes that would be uploaded to the transcriber."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("link", help="YouTube link to benchmark with.")
+        parser.add_argument(
+            "--modes",
+            nargs="+",
+            default=[AudioMode.MP3, AudioMode.NATIVE, AudioMode.MONO, AudioMode.PIPE],
+            choices=[AudioMode.MP3, AudioMode.NATIVE, AudioMode.MONO, AudioMode.PIPE],
+        )
+        parser.add_argument(
+            "--transcribe",
+            action="store_true",
+            help="Also upload and transcribe (uses AssemblyAI credits).",
+        )
+
+    def handle(self, *args, **options):
+        link = options["link"]
+        transcribe = options["transcribe"]
+        service = TranscriptionService() if transcribe else None
+
+        self.stdout.write(f"{'mode':<8} {'wall s':>8} {'cpu s':>8} {'MiB':>8}")
+        for mode in options["modes"]:
+            # A fresh media root per run: the configured MediaStore would hand
+            # back an earlier download instead of timing a new one, and its
+            # files are not ours to delete.
+            with tempfile.TemporaryDirectory(prefix="benchmark-audio-") as root:
+                downloader = YouTubeAudioDownloader(media_root=root)
+                started, cpu_started = time.perf_counter(), _cpu_seconds()
+                if mode == AudioMode.PIPE:
+                    with downloader.stream_audio(link) as audio:
+                        if service:
+                            _, size = service.transcribe_stream(audio)
+                        else:
+                            size = sum(
+                                len(chunk)
+                                for chunk in iter(lambda: audio.read(1 << 16), b"")
+                            )
+                else:
+                    path = downloader.download_audio(link, mode=mode)
+                    size = os.path.getsize(path)
+                    if service:
+                        service.transcribe_file(path)
+                wall = time.perf_counter() - started
+                cpu = _cpu_seconds() - cpu_started
+            self.stdout.write(
+                f"{mode:<8} {wall:>8.2f} {cpu:>8.2f} {size / (1 << 20):>8.2f}"
+            )
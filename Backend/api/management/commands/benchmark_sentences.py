@@ -0,0 +1,84 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.utils import text
+
+WORDS = (
+    "the video explains how we build and test a small web service with python "
+    "django and a cache so that requests stay fast while the database grows"
+).split()
+
+
+def _synthetic_transcript(minutes: int, seed: int = 0) -> str:
+    """About 150 spoken words a minute, punctuated like an AssemblyAI transcript."""
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(minutes * 150 // 12):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(6, 18))]
+        words[0] = words[0].capitalize()
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(1, len(words)), "Dr.")
+        sentences.append(" ".join(words) + rng.choice(".?!.."))
+    return " ".join(sentences)
+
+
+def _legacy_split(transcript: str) -> list[str]:
+    """What split_into_sentences used to do: a resource search on every call."""
+    import nltk
+
+    nltk.data.find("tokenizers/punkt")
+    return nltk.sent_tokenize(transcript)
+
+
+class Command(BaseCommand):
+    help = (
+        "Times sentence segmentation of an hour-long transcript: the old "
+        "per-call NLTK lookup versus the cached splitter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", help="Transcript file (default: synthetic).")
+        parser.add_argument("--minutes", type=int, default=60)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--paragraphs",
+            type=int,
+            default=1,
+            help="Split the transcript into this many calls, like a caller "
+            "segmenting paragraph by paragraph.",
+        )
+
+    def handle(self, *args, **options):
+        if options["file"]:
+            with open(options["file"], encoding="utf-8") as f:
+                transcript = f.read()
+        else:
+            transcript = _synthetic_transcript(options["minutes"])
+        size = max(1, len(transcript) // options["paragraphs"])
+        parts = [transcript[i : i + size] for i in range(0, len(transcript), size)]
+        repeat = options["repeat"]
+
+        backend = "punkt" if text.get_punkt() is not None else "rule-based"
+        self.stdout.write(
+            f"{len(transcript)} chars, {len(parts)} call(s) per run, "
+            f"{repeat} runs, backend: {backend}"
+        )
+        self.stdout.write(f"{'splitter':<12} {'ms/run':>10} {'sentences':>10}")
+
+        candidates = [
+            ("cached", text.split_into_sentences),
+            ("generator", lambda part: list(text.iter_sentences(part))),
+            ("legacy", _legacy_split),
+        ]
+        for name, split in candidates:
+            try:
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    count = sum(len(split(part)) for part in parts)
+                elapsed = (time.perf_counter() - started) / repeat
+            except LookupError:
+                self.stdout.write(f"{name:<12} {'n/a':>10} {'(no punkt)':>10}")
+                continue
+            self.stdout.write(f"{name:<12} {elapsed * 1000:>10.2f} {count:>10}")
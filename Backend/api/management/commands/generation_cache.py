@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from api.services.generation_cache import GenerationCache
+
+
+class Command(BaseCommand):
+    help = "Shows hit/miss statistics for the shared generation cache or clears it."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--invalidate",
+            action="store_true",
+            help="Retire every cached article (e.g. after a prompt change).",
+        )
+        parser.add_argument(
+            "--reset-stats",
+            action="store_true",
+            help="Reset the hit/miss counters.",
+        )
+
+    def handle(self, *args, **options):
+        generation_cache = GenerationCache()
+        if options["invalidate"]:
+            generation_cache.invalidate()
+            self.stdout.write(self.style.SUCCESS("Generation cache invalidated."))
+        if options["reset_stats"]:
+            generation_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Generation cache stats reset."))
+
+        for name, value in generation_cache.stats().items():
+            self.stdout.write(f"{name}: {value}")
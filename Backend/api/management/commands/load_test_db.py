@@ -0,0 +1,109 @@
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from api.models import BlogPost
+from api.repositories.blog_repo import BlogRepository
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrent save/list load against the configured database profile "
+        "(SQLite or DATABASE_URL). Creates throwaway users and removes them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--ops", type=int, default=200, help="Per thread.")
+        parser.add_argument(
+            "--read-ratio",
+            type=float,
+            default=0.5,
+            help="Share of operations that list posts instead of saving one.",
+        )
+        parser.add_argument(
+            "--shared-user",
+            action="store_true",
+            help="All threads save the same user's posts (more key collisions).",
+        )
+        parser.add_argument("--keep", action="store_true", help="Keep the data.")
+
+    def handle(self, *args, **options):
+        threads, ops = options["threads"], options["ops"]
+        run = uuid.uuid4().hex[:8]
+        users = [
+            User.objects.create_user(f"loadtest-{run}-{i}")
+            for i in range(1 if options["shared_user"] else threads)
+        ]
+        repo = BlogRepository()
+        latencies = {"save": [], "list": []}
+        errors: list[str] = []
+        lock = threading.Lock()
+
+        def worker(index: int) -> None:
+            user = users[index % len(users)]
+            ratio = options["read_ratio"]
+            local = {"save": [], "list": []}
+            try:
+                for op in range(ops):
+                    # Spreads reads evenly: ratio 0.25 lists on every 4th op.
+                    reads_due = int((op + 1) * ratio) > int(op * ratio)
+                    kind = "list" if reads_due else "save"
+                    started = time.perf_counter()
+                    try:
+                        if kind == "save":
+                            repo.save_or_update(
+                                user=user,
+                                youtube_link=f"https://youtu.be/{run}{op % 50}",
+                                tone=("casual", "technical")[index % 2],
+                                length="medium",
+                                youtube_title="Load test",
+                                generated_content="<p>x</p>" * 200,
+                                overwrite=True,
+                            )
+                        else:
+                            list(repo.list_for_user(user)[:20])
+                    except Exception as e:
+                        with lock:
+                            errors.append(f"{kind}: {e}")
+                    local[kind].append(time.perf_counter() - started)
+            finally:
+                connections.close_all()
+            with lock:
+                for kind, values in local.items():
+                    latencies[kind].extend(values)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(worker, range(threads)))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{connection.vendor} ({connection.settings_dict['NAME']}), "
+            f"{threads} threads x {ops} ops in {elapsed:.2f}s"
+        )
+        self.stdout.write(
+            f"{'op':<6} {'count':>7} {'ops/s':>9} {'p50 ms':>8} {'p95 ms':>8}"
+        )
+        for kind, values in latencies.items():
+            if not values:
+                continue
+            values.sort()
+            p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+            self.stdout.write(
+                f"{kind:<6} {len(values):>7} {len(values) / elapsed:>9.1f} "
+                f"{statistics.median(values) * 1000:>8.2f} {p95 * 1000:>8.2f}"
+            )
+        self.stdout.write(f"errors: {len(errors)}")
+        for error in errors[:5]:
+            self.stdout.write(f"  {error}")
+
+        if not options["keep"]:
+            BlogPost.objects.filter(user__in=users).delete()
+            User.objects.filter(pk__in=[user.pk for user in users]).delete()
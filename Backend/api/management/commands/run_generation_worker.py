@@ -0,0 +1,77 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.repositories.job_repo import GenerationJobRepository
+from api.services.jobs import recover_stale_jobs, run_job
+
+# Seconds between checks for jobs lost by crashed workers.
+RECOVERY_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = "Runs queued blog generation jobs (for the DatabaseJobQueue backend)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.GENERATION_JOB_WORKERS,
+            help="Number of jobs to run in parallel.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the current queue and exit instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        repo = GenerationJobRepository()
+        self.stdout.write(f"Generation worker started with {workers} workers.")
+        poll_interval = options["poll_interval"]
+        # Jobs are submitted one by one and at most ``workers`` are in flight,
+        # so a free slot is refilled without waiting for the slowest job.
+        in_flight = {}
+        next_recovery = 0.0
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="generation-job"
+        ) as pool:
+            while True:
+                if time.monotonic() >= next_recovery:
+                    failed = recover_stale_jobs()
+                    if failed:
+                        self.stdout.write(f"Failed {failed} lost generation job(s).")
+                    next_recovery = time.monotonic() + RECOVERY_INTERVAL
+                free = workers - len(in_flight)
+                # run_job claims each id atomically, so overlapping polls
+                # from other worker processes are harmless.
+                job_ids = (
+                    repo.next_queued_ids(limit=free, exclude=in_flight.values())
+                    if free
+                    else []
+                )
+                for job_id in job_ids:
+                    in_flight[pool.submit(run_job, job_id)] = job_id
+                if in_flight:
+                    done, _ = wait(
+                        in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED
+                    )
+                    for future in done:
+                        job_id = in_flight.pop(future)
+                        if future.exception() is not None:
+                            self.stderr.write(
+                                f"Job {job_id} crashed: {future.exception()!r}"
+                            )
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(poll_interval)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from api.services.media_store import MediaStore
+
+
+class Command(BaseCommand):
+    help = "Evicts downloaded audio from MEDIA_ROOT by age and size budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-bytes",
+            type=int,
+            default=None,
+            help="Size budget in bytes (default: settings.MEDIA_MAX_BYTES).",
+        )
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=None,
+            help="Maximum seconds since last use (default: settings.MEDIA_MAX_AGE).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List what would be removed without deleting anything.",
+        )
+
+    def handle(self, *args, **options):
+        result = MediaStore().sweep(
+            max_bytes=options["max_bytes"],
+            max_age=options["max_age"],
+            dry_run=options["dry_run"],
+        )
+        for path in result.removed:
+            self.stdout.write(path)
+        verb = "Would remove" if options["dry_run"] else "Removed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {len(result.removed)} files ({result.freed_bytes} bytes); "
+                f"{result.remaining_bytes} bytes remain."
+            )
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0004_transcript"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transcript",
+            name="outline",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="transcript",
+            name="outline_version",
+            field=models.CharField(blank=True, default="", max_length=100),
+        ),
+    ]
@@ -0,0 +1,100 @@
+from django.db import migrations
+
+# Frozen copy of the index as first installed; migration 0011 replaces the
+# SQLite index and api.utils.search_index holds the current definition.
+
+SQLITE_TRIGGERS = {
+    "api_blogpost_fts_insert": """
+        CREATE TRIGGER IF NOT EXISTS api_blogpost_fts_insert
+        AFTER INSERT ON api_blogpost BEGIN
+            INSERT INTO api_blogpost_fts(rowid, youtube_title, generated_content)
+            VALUES (new.id, new.youtube_title, new.generated_content);
+        END
+    """,
+    "api_blogpost_fts_delete": """
+        CREATE TRIGGER IF NOT EXISTS api_blogpost_fts_delete
+        AFTER DELETE ON api_blogpost BEGIN
+            INSERT INTO api_blogpost_fts(
+                api_blogpost_fts, rowid, youtube_title, generated_content
+            )
+            VALUES ('delete', old.id, old.youtube_title, old.generated_content);
+        END
+    """,
+    "api_blogpost_fts_update": """
+        CREATE TRIGGER IF NOT EXISTS api_blogpost_fts_update
+        AFTER UPDATE OF youtube_title, generated_content ON api_blogpost BEGIN
+            INSERT INTO api_blogpost_fts(
+                api_blogpost_fts, rowid, youtube_title, generated_content
+            )
+            VALUES ('delete', old.id, old.youtube_title, old.generated_content);
+            INSERT INTO api_blogpost_fts(rowid, youtube_title, generated_content)
+            VALUES (new.id, new.youtube_title, new.generated_content);
+        END
+    """,
+}
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS api_blogpost_fts USING fts5(
+        youtube_title,
+        generated_content,
+        content='api_blogpost',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    *SQLITE_TRIGGERS.values(),
+    "INSERT INTO api_blogpost_fts(api_blogpost_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    *(f"DROP TRIGGER IF EXISTS {name}" for name in SQLITE_TRIGGERS),
+    "DROP TABLE IF EXISTS api_blogpost_fts",
+]
+
+# Title outranks content; HTML tags are stripped before indexing.
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE api_blogpost ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(youtube_title, '')), 'A') ||
+        setweight(
+            to_tsvector(
+                'english',
+                regexp_replace(coalesce(generated_content, ''), '<[^>]+>', ' ', 'g')
+            ),
+            'B'
+        )
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS api_blogpost_search_gin "
+    "ON api_blogpost USING GIN (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS api_blogpost_search_gin",
+    "ALTER TABLE api_blogpost DROP COLUMN IF EXISTS search_vector",
+]
+
+FORWARD = {"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}
+REVERSE = {"sqlite": SQLITE_REVERSE, "postgresql": POSTGRES_REVERSE}
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_transcript_outline"),
+    ]
+
+    operations = [
+        # SQLite FTS5 table + triggers, or a PostgreSQL tsvector column + GIN.
+        migrations.RunPython(_run(FORWARD), _run(REVERSE)),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:00
+
+import html
+import math
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+BACKFILL_BATCH_SIZE = 200
+
+# Frozen copy of the list metadata rules in api.utils.content, so later
+# changes there don't alter what this migration writes.
+EXCERPT_WORDS = 25
+EXCERPT_MAX_CHARS = 300
+WORDS_PER_MINUTE = 200
+
+
+def _metadata(content):
+    text = " ".join(html.unescape(strip_tags(content.replace(">", "> "))).split())
+    word_count = len(text.split())
+    return {
+        "excerpt": Truncator(Truncator(text).words(EXCERPT_WORDS)).chars(
+            EXCERPT_MAX_CHARS
+        ),
+        "word_count": word_count,
+        "reading_time": math.ceil(word_count / WORDS_PER_MINUTE),
+    }
+
+
+def backfill_content_fields(apps, schema_editor):
+    # Existing posts only have HTML; their markdown source stays empty.
+    BlogPost = apps.get_model("api", "BlogPost")
+    fields = ["excerpt", "word_count", "reading_time"]
+    posts = BlogPost.objects.only("id", "generated_content").order_by("id")
+    batch = []
+    for post in posts.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        for field, value in _metadata(post.generated_content or "").items():
+            setattr(post, field, value)
+        batch.append(post)
+        if len(batch) == BACKFILL_BATCH_SIZE:
+            BlogPost.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        BlogPost.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0009_generationbatch"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpost",
+            name="content_markdown",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="excerpt",
+            field=models.CharField(blank=True, default="", max_length=300),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="reading_time",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_content_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:00
+
+import html
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+BACKFILL_BATCH_SIZE = 200
+
+# Frozen copies of the SQLite index definitions (see api.utils.search_index):
+# the 0006 index over raw HTML is replaced by one over ``search_text``.
+OLD_TRIGGERS = [
+    "api_blogpost_fts_insert",
+    "api_blogpost_fts_delete",
+    "api_blogpost_fts_update",
+]
+
+
+def _sqlite_index(column):
+    return [
+        f"""
+        CREATE VIRTUAL TABLE api_blogpost_fts USING fts5(
+            youtube_title,
+            {column},
+            content='api_blogpost',
+            content_rowid='id',
+            tokenize='porter unicode61'
+        )
+        """,
+        f"""
+        CREATE TRIGGER api_blogpost_fts_insert
+        AFTER INSERT ON api_blogpost BEGIN
+            INSERT INTO api_blogpost_fts(rowid, youtube_title, {column})
+            VALUES (new.id, new.youtube_title, new.{column});
+        END
+        """,
+        f"""
+        CREATE TRIGGER api_blogpost_fts_delete
+        AFTER DELETE ON api_blogpost BEGIN
+            INSERT INTO api_blogpost_fts(
+                api_blogpost_fts, rowid, youtube_title, {column}
+            )
+            VALUES ('delete', old.id, old.youtube_title, old.{column});
+        END
+        """,
+        f"""
+        CREATE TRIGGER api_blogpost_fts_update
+        AFTER UPDATE OF youtube_title, {column} ON api_blogpost BEGIN
+            INSERT INTO api_blogpost_fts(
+                api_blogpost_fts, rowid, youtube_title, {column}
+            )
+            VALUES ('delete', old.id, old.youtube_title, old.{column});
+            INSERT INTO api_blogpost_fts(rowid, youtube_title, {column})
+            VALUES (new.id, new.youtube_title, new.{column});
+        END
+        """,
+        "INSERT INTO api_blogpost_fts(api_blogpost_fts) VALUES ('rebuild')",
+    ]
+
+
+def _drop_sqlite_index(schema_editor):
+    for name in OLD_TRIGGERS:
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    schema_editor.execute("DROP TABLE IF EXISTS api_blogpost_fts")
+
+
+def backfill_search_text(apps, schema_editor):
+    BlogPost = apps.get_model("api", "BlogPost")
+    posts = BlogPost.objects.only("id", "generated_content").order_by("id")
+    batch = []
+    for post in posts.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        text = html.unescape(strip_tags(post.generated_content.replace(">", "> ")))
+        post.search_text = " ".join(text.split())
+        batch.append(post)
+        if len(batch) == BACKFILL_BATCH_SIZE:
+            BlogPost.objects.bulk_update(batch, ["search_text"])
+            batch = []
+    if batch:
+        BlogPost.objects.bulk_update(batch, ["search_text"])
+
+
+def index_search_text(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    _drop_sqlite_index(schema_editor)
+    for statement in _sqlite_index("search_text"):
+        schema_editor.execute(statement)
+
+
+def index_generated_content(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    _drop_sqlite_index(schema_editor)
+    for statement in _sqlite_index("generated_content"):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0010_blogpost_content_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpost",
+            name="search_text",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(index_search_text, index_generated_content),
+    ]
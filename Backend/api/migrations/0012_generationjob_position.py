@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:00
+
+from django.db import migrations, models
+
+
+def backfill_positions(apps, schema_editor):
+    # Best effort for existing batches: their creation order, ties by id.
+    GenerationJob = apps.get_model("api", "GenerationJob")
+    batch_ids = (
+        GenerationJob.objects.exclude(batch=None)
+        .values_list("batch_id", flat=True)
+        .distinct()
+    )
+    for batch_id in batch_ids:
+        jobs = list(
+            GenerationJob.objects.filter(batch_id=batch_id).order_by("created_at", "id")
+        )
+        for position, job in enumerate(jobs):
+            job.position = position
+        GenerationJob.objects.bulk_update(jobs, ["position"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_blogpost_search_text"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="generationjob",
+            name="position",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_positions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:30
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_started_at(apps, schema_editor):
+    # Jobs running now were claimed no later than their last update.
+    GenerationJob = apps.get_model("api", "GenerationJob")
+    GenerationJob.objects.filter(status="running").update(started_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0012_generationjob_position"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="generationjob",
+            name="started_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_started_at, migrations.RunPython.noop),
+    ]
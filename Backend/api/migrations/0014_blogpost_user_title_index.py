@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0013_generationjob_started_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                fields=["user", "youtube_title"], name="api_blogpost_user_title"
+            ),
+        ),
+    ]
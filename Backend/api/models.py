@@ -1,3 +1,6 @@
+import uuid
+import zlib
+
 from django.contrib.auth.models import User
 from django.db import models
 
@@ -7,13 +10,119 @@ class BlogPost(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     youtube_title = models.CharField(max_length=300)
     youtube_link = models.URLField()
+    # Rendered HTML; ``content_markdown`` is its source when known (empty for
+    # posts saved as HTML). Both are written by ``api.utils.content``.
     generated_content = models.TextField()
+    content_markdown = models.TextField(blank=True, default="")
+    # Precomputed from the content on save so lists never read the body.
+    excerpt = models.CharField(max_length=300, blank=True, default="")
+    word_count = models.PositiveIntegerField(default=0)
+    reading_time = models.PositiveSmallIntegerField(default=0)
+    # The article without markup; what the SQLite full-text index covers.
+    search_text = models.TextField(blank=True, default="")
     tone = models.CharField(max_length=50, default="professional")
     length = models.CharField(max_length=20, default="medium")
     created_at = models.DateTimeField(auto_now_add=True)
+    # Validator for conditional GETs; queryset.update() callers must set it.
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ["user", "youtube_link", "tone", "length"]
+        indexes = [
+            # Backs the newest-first, cursor-paginated blog list.
+            models.Index(fields=["user", "-id"], name="api_blogpost_user_id_desc"),
+            # Backs the title sorts, which page by offset.
+            models.Index(
+                fields=["user", "youtube_title"], name="api_blogpost_user_title"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.youtube_title} ({self.tone}, {self.length})"
+
+
+class GenerationBatch(models.Model):
+    """Videos submitted together; each one is a ``GenerationJob`` in ``jobs``."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Playlist URL the videos were expanded from, if any.
+    source = models.URLField(blank=True, default="")
+    tone = models.CharField(max_length=50, default="professional")
+    length = models.CharField(max_length=20, default="medium")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Batch {self.id} ({self.user})"
+
+
+class GenerationJob(models.Model):
+    class Status(models.TextChoices):
+        # Batch jobs wait here until a slot in their batch frees up.
+        PENDING = "pending"
+        QUEUED = "queued"
+        RUNNING = "running"
+        SUCCEEDED = "succeeded"
+        FAILED = "failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    batch = models.ForeignKey(
+        GenerationBatch,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    # Order within the batch; created_at can tie for bulk-created jobs.
+    position = models.PositiveIntegerField(default=0)
+    youtube_link = models.URLField()
+    video_id = models.CharField(max_length=32)
+    tone = models.CharField(max_length=50, default="professional")
+    length = models.CharField(max_length=20, default="medium")
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.QUEUED
+    )
+    stage = models.CharField(max_length=30, blank=True, default="")
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Set when a worker claims the job; see api.services.jobs.recover_stale_jobs.
+    started_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"{self.video_id} [{self.status}]"
+
+
+class Transcript(models.Model):
+    """Durable, zlib-compressed copy of a video's transcript."""
+
+    video_id = models.CharField(max_length=32, unique=True)
+    youtube_link = models.URLField()
+    # Name of the TranscriptSource that produced it ("captions", "assemblyai").
+    source = models.CharField(max_length=30, default="assemblyai")
+    compressed_text = models.BinaryField()
+    char_count = models.PositiveIntegerField(default=0)
+    # Tone-independent outline that each tone/length variant is written from
+    # (BLOG_GENERATION_MODE="outline"); outline_version names the model and
+    # outline prompt that produced it.
+    outline = models.TextField(blank=True, default="")
+    outline_version = models.CharField(max_length=100, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def text(self) -> str:
+        return zlib.decompress(bytes(self.compressed_text)).decode("utf-8")
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self.compressed_text = zlib.compress(value.encode("utf-8"), 6)
+        self.char_count = len(value)
+
+    def __str__(self):
+        return f"{self.video_id} ({self.source}, {self.char_count} chars)"
@@ -0,0 +1,61 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class BlogCursorPagination(CursorPagination):
+    """Newest first (an index range scan on (user, -id)), or oldest first.
+
+    Sorting happens here rather than in the client, which only ever holds
+    the pages loaded so far. A cursor only encodes the first ordering field,
+    so it serves the id sorts; titles repeat and use BlogTitlePagination.
+    """
+
+    ordering = "-id"
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    sort_query_param = "sort"
+    SORTS = {"newest": "-id", "oldest": "id"}
+
+    def get_ordering(self, request, queryset, view):
+        sort = request.query_params.get(self.sort_query_param)
+        return (self.SORTS.get(sort, self.ordering),)
+
+
+class BlogTitlePagination(PageNumberPagination):
+    """Title order by page, on the (user, youtube_title) index.
+
+    A cursor on the title alone would skip or repeat posts with equal titles
+    at page boundaries; id breaks the ties here.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    sort_query_param = "sort"
+    SORTS = {
+        "title": ("youtube_title", "id"),
+        "title-desc": ("-youtube_title", "-id"),
+    }
+
+    def paginate_queryset(self, queryset, request, view=None):
+        sort = request.query_params.get(self.sort_query_param)
+        queryset = queryset.order_by(*self.SORTS[sort])
+        return super().paginate_queryset(queryset, request, view=view)
+
+
+class BlogSearchPagination(PageNumberPagination):
+    """Search results keep their rank order, which a cursor on id cannot."""
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+def blog_list_pagination(request, query: str):
+    """The paginator for a blog list request: search, title or id order."""
+    if query:
+        return BlogSearchPagination()
+    sort = request.query_params.get(BlogTitlePagination.sort_query_param)
+    if sort in BlogTitlePagination.SORTS:
+        return BlogTitlePagination()
+    return BlogCursorPagination()
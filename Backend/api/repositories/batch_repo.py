@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Optional
+from uuid import UUID
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from api.models import GenerationBatch, GenerationJob
+
+
+class GenerationBatchRepository:
+    def create(
+        self,
+        *,
+        user: User,
+        videos: list[tuple[str, str]],
+        tone: str,
+        length: str,
+        source: str = "",
+        parallelism: int,
+    ) -> tuple[GenerationBatch, list[GenerationJob]]:
+        """Creates the batch and one job per ``(link, video_id)``, in order.
+
+        The first ``parallelism`` jobs are queued; the rest stay pending until
+        ``release_next`` frees them one by one.
+        """
+        with transaction.atomic():
+            batch = GenerationBatch.objects.create(
+                user=user, source=source, tone=tone, length=length
+            )
+            jobs = GenerationJob.objects.bulk_create(
+                GenerationJob(
+                    user=user,
+                    batch=batch,
+                    position=index,
+                    youtube_link=link,
+                    video_id=video_id,
+                    tone=tone,
+                    length=length,
+                    status=(
+                        GenerationJob.Status.QUEUED
+                        if index < parallelism
+                        else GenerationJob.Status.PENDING
+                    ),
+                )
+                for index, (link, video_id) in enumerate(videos)
+            )
+        return batch, jobs
+
+    def get_for_user(self, *, user: User, pk: UUID) -> Optional[GenerationBatch]:
+        return (
+            GenerationBatch.objects.filter(user=user, id=pk)
+            .prefetch_related(
+                Prefetch("jobs", queryset=GenerationJob.objects.order_by("position"))
+            )
+            .first()
+        )
+
+    def release_next(self, *, batch_id: UUID) -> Optional[UUID]:
+        """Moves the batch's first pending job to queued and returns its id.
+
+        Concurrent callers each get a different job (or None when none is left).
+        """
+        pending = GenerationJob.objects.filter(
+            batch_id=batch_id, status=GenerationJob.Status.PENDING
+        ).order_by("position")
+        while True:
+            candidates = list(pending.values_list("id", flat=True)[:5])
+            if not candidates:
+                return None
+            for job_id in candidates:
+                # Losing this update means another caller took the job.
+                released = GenerationJob.objects.filter(
+                    id=job_id, status=GenerationJob.Status.PENDING
+                ).update(status=GenerationJob.Status.QUEUED, updated_at=timezone.now())
+                if released:
+                    return job_id
@@ -1,11 +1,40 @@
 from __future__ import annotations
 
+import re
 from typing import Optional
 
 from django.contrib.auth.models import User
-from django.db.models import QuerySet
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, FloatField, Q, QuerySet, Sum
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from api.models import BlogPost
+from api.services.blog_versions import bump_on_commit
+from api.utils.content import render_content
+
+# The unique_together key of BlogPost, minus the user.
+POST_KEY_FIELDS = ("youtube_link", "tone", "length")
+BULK_BATCH_SIZE = 200
+# Written together whenever a post's body changes (see api.utils.content).
+CONTENT_FIELDS = (
+    "generated_content",
+    "content_markdown",
+    "search_text",
+    "excerpt",
+    "word_count",
+    "reading_time",
+)
+
+
+def _fts5_query(query: str) -> str:
+    """User input as an FTS5 query: every word must match, as a prefix.
+
+    Quoting each word keeps FTS5 syntax (AND, NEAR, quotes, *) inert.
+    """
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", query))
 
 
 class BlogRepository:
@@ -18,24 +47,91 @@ class BlogRepository:
         generated_content: str,
         tone: str,
         length: str,
+        content_markdown: str = "",
     ) -> BlogPost:
         post = BlogPost.objects.create(
             user=user,
             youtube_title=youtube_title,
             youtube_link=youtube_link,
-            generated_content=generated_content,
             tone=tone,
             length=length,
+            **render_content(
+                markdown_text=content_markdown, html=generated_content
+            ).as_fields(),
         )
         return post
 
     def list_for_user(
         self, user: User, query: Optional[str] = None
     ) -> QuerySet[BlogPost]:
+        if query and query.strip():
+            return self.search(user, query)
+        return BlogPost.objects.filter(user=user).order_by("-id")
+
+    LIST_FIELDS = (
+        "id",
+        "youtube_title",
+        "tone",
+        "length",
+        "created_at",
+        "excerpt",
+        "word_count",
+        "reading_time",
+    )
+
+    def slim(self, qs: QuerySet[BlogPost]) -> QuerySet[BlogPost]:
+        """Loads only the list columns, not the article body."""
+        return qs.only(*self.LIST_FIELDS)
+
+    def library_stats(self, user: User) -> dict:
+        """Totals over all of the user's posts, in one aggregate query."""
+        return BlogPost.objects.filter(user=user).aggregate(
+            count=Count("id"),
+            videos=Count("youtube_link", distinct=True),
+            reading_time=Coalesce(Sum("reading_time"), 0),
+        )
+
+    def search(self, user: User, query: str) -> QuerySet[BlogPost]:
+        """The user's posts matching ``query`` in title or content, best first.
+
+        Uses the full-text index (api.utils.search_index: SQLite FTS5 with
+        bm25, or PostgreSQL tsvector/GIN with ts_rank) over the title and the
+        article's plain text; title matches rank higher.
+        """
         qs = BlogPost.objects.filter(user=user)
-        if query:
-            qs = qs.filter(youtube_title__icontains=query)
-        return qs.order_by("-id")
+        if connection.vendor == "sqlite":
+            match = _fts5_query(query)
+            if not match:
+                return qs.none()
+            rank = RawSQL(
+                "SELECT bm25(api_blogpost_fts, 10.0, 1.0) FROM api_blogpost_fts "
+                "WHERE api_blogpost_fts MATCH %s AND rowid = api_blogpost.id",
+                [match],
+                output_field=FloatField(),
+            )
+            matching = RawSQL(
+                "SELECT rowid FROM api_blogpost_fts WHERE api_blogpost_fts MATCH %s",
+                [match],
+            )
+            # bm25 is lower for better matches.
+            return (
+                qs.filter(id__in=matching).annotate(rank=rank).order_by("rank", "-id")
+            )
+        if connection.vendor == "postgresql":
+            # The generated column from migration 0006; not a model field.
+            document = RawSQL(
+                "api_blogpost.search_vector", [], output_field=SearchVectorField()
+            )
+            tsquery = SearchQuery(query, config="english", search_type="websearch")
+            return (
+                qs.alias(document=document)
+                .filter(document=tsquery)
+                .annotate(rank=SearchRank(document, tsquery))
+                .order_by("-rank", "-id")
+            )
+        return qs.filter(
+            Q(youtube_title__icontains=query) | Q(search_text__icontains=query)
+        ).order_by("-id")
 
     def get(self, *, pk: int) -> BlogPost:
         return BlogPost.objects.get(id=pk)
@@ -56,8 +152,191 @@ class BlogRepository:
         except BlogPost.DoesNotExist:
             return None
 
-    def update_content(self, blog_post: BlogPost, new_content: str) -> BlogPost:
+    def update_content(
+        self, blog_post: BlogPost, new_content: str, content_markdown: str = ""
+    ) -> BlogPost:
         """Updates the content of an existing blog post."""
-        blog_post.generated_content = new_content
-        blog_post.save(update_fields=["generated_content"])
+        fields = render_content(
+            markdown_text=content_markdown, html=new_content
+        ).as_fields()
+        for field, value in fields.items():
+            setattr(blog_post, field, value)
+        blog_post.save(update_fields=[*fields, "updated_at"])
         return blog_post
+
+    def save_or_update(
+        self,
+        *,
+        user: User,
+        youtube_link: str,
+        tone: str,
+        length: str,
+        youtube_title: str,
+        generated_content: str,
+        overwrite: bool = False,
+        content_markdown: str = "",
+    ) -> tuple[BlogPost, str]:
+        """Saves a post unless one exists for (user, link, tone, length).
+
+        Relies on the unique constraint instead of a separate existence check,
+        so concurrent saves of the same post cannot both insert. Returns the
+        post and "created", "updated" (``overwrite``) or "exists". Given
+        ``content_markdown``, the HTML is rendered from it.
+        """
+        content = render_content(
+            markdown_text=content_markdown, html=generated_content
+        ).as_fields()
+        lookup = {
+            "user": user,
+            "youtube_link": youtube_link,
+            "tone": tone,
+            "length": length,
+        }
+        try:
+            # get_or_create inserts inside a savepoint and re-reads the row
+            # if a concurrent insert wins the constraint.
+            post, created = BlogPost.objects.get_or_create(
+                **lookup,
+                defaults={"youtube_title": youtube_title, **content},
+            )
+        except IntegrityError:
+            post, created = BlogPost.objects.get(**lookup), False
+        if created:
+            return post, "created"
+        if not overwrite:
+            return post, "exists"
+        # update() skips auto_now and post_save, so set both validators here.
+        updated_at = timezone.now()
+        with transaction.atomic():
+            BlogPost.objects.filter(pk=post.pk).update(**content, updated_at=updated_at)
+            bump_on_commit(user.pk)
+        for field, value in content.items():
+            setattr(post, field, value)
+        post.updated_at = updated_at
+        return post, "updated"
+
+    def _ids_by_key(
+        self, user: User, links: set[str]
+    ) -> dict[tuple[str, str, str], int]:
+        rows = BlogPost.objects.filter(user=user, youtube_link__in=links).values_list(
+            *POST_KEY_FIELDS, "id"
+        )
+        return {tuple(row[:3]): row[3] for row in rows}
+
+    def bulk_save(
+        self, *, user: User, items: list[dict], overwrite: bool = False
+    ) -> list[dict]:
+        """``save_or_update`` for many posts in a few queries.
+
+        ``items`` hold youtube_link, tone, length, youtube_title,
+        generated_content and optionally content_markdown; a repeated key keeps
+        its last item. Conflicts on the
+        unique key are resolved by the database (updating the content with
+        ``overwrite``, else leaving the row alone). Returns one
+        ``{"id", "youtube_link", "tone", "length", "status"}`` per distinct key,
+        with status "created", "updated" or "exists"; a post inserted
+        concurrently by another request may be reported as "created".
+        """
+        posts: dict[tuple[str, str, str], BlogPost] = {}
+        for item in items:
+            key = tuple(item[field] for field in POST_KEY_FIELDS)
+            posts[key] = BlogPost(user=user, **self._with_content(item))
+        links = {key[0] for key in posts}
+        existing = self._ids_by_key(user, links)
+
+        # bulk_create sends no post_save, so bump the list version here.
+        with transaction.atomic():
+            if overwrite:
+                BlogPost.objects.bulk_create(
+                    posts.values(),
+                    batch_size=BULK_BATCH_SIZE,
+                    update_conflicts=True,
+                    unique_fields=["user", *POST_KEY_FIELDS],
+                    update_fields=[*CONTENT_FIELDS, "updated_at"],
+                )
+            else:
+                BlogPost.objects.bulk_create(
+                    posts.values(), batch_size=BULK_BATCH_SIZE, ignore_conflicts=True
+                )
+            if overwrite or len(existing) < len(posts):
+                bump_on_commit(user.pk)
+        ids = self._ids_by_key(user, links)
+
+        results = []
+        for key in posts:
+            if key not in existing:
+                outcome = "created"
+            else:
+                outcome = "updated" if overwrite else "exists"
+            results.append(
+                {
+                    "id": ids.get(key),
+                    **dict(zip(POST_KEY_FIELDS, key)),
+                    "status": outcome,
+                }
+            )
+        return results
+
+    def bulk_update(
+        self, *, user: User, items: list[dict]
+    ) -> tuple[list[int], list[int]]:
+        """Applies ``{"id", <field>: <value>, ...}`` changes to the user's posts.
+
+        Items changing the same fields share one UPDATE (per batch), so posts
+        are never loaded. A new generated_content or content_markdown rewrites
+        all of ``CONTENT_FIELDS``. Returns the updated ids and the ids that do not
+        exist or belong to someone else.
+        """
+        wanted = {item["id"] for item in items}
+        owned = set(
+            BlogPost.objects.filter(user=user, id__in=wanted).values_list(
+                "id", flat=True
+            )
+        )
+        groups: dict[tuple[str, ...], list[BlogPost]] = {}
+        # update() and bulk_update() skip auto_now; set the validator here.
+        updated_at = timezone.now()
+        for item in items:
+            if item["id"] not in owned:
+                continue
+            changes = self._with_content(
+                {key: value for key, value in item.items() if key != "id"}
+            )
+            fields = tuple(sorted(changes))
+            groups.setdefault(fields, []).append(
+                BlogPost(id=item["id"], user=user, updated_at=updated_at, **changes)
+            )
+
+        with transaction.atomic():
+            for fields, posts in groups.items():
+                BlogPost.objects.bulk_update(
+                    posts, [*fields, "updated_at"], batch_size=BULK_BATCH_SIZE
+                )
+            if groups:
+                bump_on_commit(user.pk)
+        return sorted(owned), sorted(wanted - owned)
+
+    @staticmethod
+    def _with_content(item: dict) -> dict:
+        """``item`` with its content fields derived, if it has content."""
+        if "generated_content" not in item and "content_markdown" not in item:
+            return item
+        item = dict(item)
+        content = render_content(
+            markdown_text=item.pop("content_markdown", ""),
+            html=item.pop("generated_content", ""),
+        )
+        return {**item, **content.as_fields()}
+
+    def bulk_delete(self, *, user: User, ids: list[int]) -> int:
+        """Deletes the user's posts among ``ids`` with one filtered DELETE.
+
+        Nothing references BlogPost, so the collector (a SELECT, then a DELETE
+        by pk, plus a post_delete signal per row) is skipped and the list
+        version is bumped once here instead.
+        """
+        posts = BlogPost.objects.filter(user=user, id__in=ids)
+        deleted = posts._raw_delete(posts.db)
+        if deleted:
+            bump_on_commit(user.pk)
+        return deleted
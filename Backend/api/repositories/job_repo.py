@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from api.models import GenerationJob
+
+
+class GenerationJobRepository:
+    def create(
+        self, *, user: User, youtube_link: str, video_id: str, tone: str, length: str
+    ) -> GenerationJob:
+        return GenerationJob.objects.create(
+            user=user,
+            youtube_link=youtube_link,
+            video_id=video_id,
+            tone=tone,
+            length=length,
+        )
+
+    def get(self, *, pk: UUID) -> GenerationJob:
+        return GenerationJob.objects.get(id=pk)
+
+    def get_for_user(self, *, user: User, pk: UUID) -> Optional[GenerationJob]:
+        return GenerationJob.objects.filter(user=user, id=pk).first()
+
+    def claim(self, *, pk: UUID) -> Optional[datetime]:
+        """Atomically moves a queued job to running.
+
+        Returns the claim's ``started_at``, which the worker hands back when
+        it finishes the job, or None if another worker won.
+        """
+        started_at = timezone.now()
+        updated = GenerationJob.objects.filter(
+            id=pk, status=GenerationJob.Status.QUEUED
+        ).update(
+            status=GenerationJob.Status.RUNNING,
+            started_at=started_at,
+            updated_at=started_at,
+        )
+        return started_at if updated == 1 else None
+
+    def stale_running(self, *, started_before: datetime) -> list[GenerationJob]:
+        return list(
+            GenerationJob.objects.filter(
+                status=GenerationJob.Status.RUNNING, started_at__lt=started_before
+            ).only("id", "batch_id")
+        )
+
+    def fail_if_stale(self, *, pk: UUID, started_before: datetime, error: str) -> bool:
+        """Fails a running job claimed before ``started_before``.
+
+        False if it finished or was failed elsewhere in the meantime.
+        """
+        updated = GenerationJob.objects.filter(
+            id=pk,
+            status=GenerationJob.Status.RUNNING,
+            started_at__lt=started_before,
+        ).update(
+            status=GenerationJob.Status.FAILED, error=error, updated_at=timezone.now()
+        )
+        return updated == 1
+
+    def next_queued_ids(self, *, limit: int, exclude=()) -> list[UUID]:
+        return list(
+            GenerationJob.objects.filter(status=GenerationJob.Status.QUEUED)
+            .exclude(id__in=list(exclude))
+            .order_by("created_at")
+            .values_list("id", flat=True)[:limit]
+        )
+
+    def set_stage(self, *, pk: UUID, stage: str) -> None:
+        self._update(pk, stage=stage)
+
+    def mark_succeeded(self, *, pk: UUID, started_at: datetime, result: dict) -> bool:
+        return self._finish(
+            pk,
+            started_at,
+            status=GenerationJob.Status.SUCCEEDED,
+            stage="done",
+            result=result,
+        )
+
+    def mark_failed(self, *, pk: UUID, started_at: datetime, error: str) -> bool:
+        return self._finish(
+            pk, started_at, status=GenerationJob.Status.FAILED, error=error
+        )
+
+    def _finish(self, pk: UUID, started_at: datetime, **fields) -> bool:
+        """Ends the run claimed at ``started_at``.
+
+        False if the job is no longer that run, e.g. recover_stale_jobs has
+        failed it meanwhile, in which case nothing is written.
+        """
+        updated = GenerationJob.objects.filter(
+            id=pk, status=GenerationJob.Status.RUNNING, started_at=started_at
+        ).update(updated_at=timezone.now(), **fields)
+        return updated == 1
+
+    def _update(self, pk: UUID, **fields) -> None:
+        # QuerySet.update() skips auto_now, so bump updated_at explicitly.
+        GenerationJob.objects.filter(id=pk).update(updated_at=timezone.now(), **fields)
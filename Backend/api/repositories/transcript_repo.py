@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from django.utils import timezone
+
+from api.models import Transcript
+
+
+class TranscriptRepository:
+    def get_by_video_id(self, video_id: str) -> Optional[Transcript]:
+        return Transcript.objects.filter(video_id=video_id).first()
+
+    def get_text(self, video_id: str) -> Optional[str]:
+        transcript = self.get_by_video_id(video_id)
+        return transcript.text if transcript else None
+
+    def save(
+        self, *, video_id: str, youtube_link: str, text: str, source: str
+    ) -> Transcript:
+        """Creates or replaces the stored transcript for ``video_id``.
+
+        Safe when two processes store the same video at once: the loser of the
+        insert race updates the winner's row instead of raising IntegrityError.
+        """
+        transcript, _ = Transcript.objects.update_or_create(
+            video_id=video_id,
+            defaults={"youtube_link": youtube_link, "source": source, "text": text},
+        )
+        return transcript
+
+    def get_outline(self, video_id: str, version: str) -> Optional[str]:
+        return (
+            Transcript.objects.filter(video_id=video_id, outline_version=version)
+            .exclude(outline="")
+            .values_list("outline", flat=True)
+            .first()
+        )
+
+    def save_outline(self, video_id: str, outline: str, version: str) -> None:
+        Transcript.objects.filter(video_id=video_id).update(
+            outline=outline, outline_version=version, updated_at=timezone.now()
+        )
@@ -2,7 +2,8 @@
 from django.contrib.auth.models import User
 from rest_framework import serializers
 
-from api.models import BlogPost
+from api.models import BlogPost, GenerationBatch, GenerationJob
+from api.services.blog_generation import LENGTH_MAP, TONE_INSTRUCTIONS
 
 
 class SignupSerializer(serializers.ModelSerializer):
@@ -36,8 +37,134 @@ class BlogPostSerializer(serializers.ModelSerializer):
             "youtube_title",
             "youtube_link",
             "generated_content",
+            "content_markdown",
             "tone",
             "length",
             "created_at",
+            "word_count",
+            "reading_time",
         ]
-        read_only_fields = ["id", "tone", "length", "youtube_link", "created_at"]
+        read_only_fields = [
+            "id",
+            "tone",
+            "length",
+            "youtube_link",
+            "created_at",
+            "word_count",
+            "reading_time",
+        ]
+
+
+class BlogBulkSaveItemSerializer(serializers.Serializer):
+    """One item of POST /api/blogs/bulk/; same fields as /api/save-blog/."""
+
+    title = serializers.CharField(max_length=300)
+    content = serializers.CharField(required=False)
+    markdown = serializers.CharField(required=False)
+    link = serializers.URLField()
+    tone = serializers.ChoiceField(
+        choices=list(TONE_INSTRUCTIONS), default="professional"
+    )
+    length = serializers.ChoiceField(choices=list(LENGTH_MAP), default="medium")
+
+    def to_internal_value(self, data):
+        item = super().to_internal_value(data)
+        if not item.get("content") and not item.get("markdown"):
+            raise serializers.ValidationError(
+                {"content": "Provide content or markdown."}
+            )
+        return {
+            "youtube_link": item["link"],
+            "tone": item["tone"],
+            "length": item["length"],
+            "youtube_title": item["title"],
+            "generated_content": item.get("content", ""),
+            "content_markdown": item.get("markdown", ""),
+        }
+
+
+class BlogBulkUpdateItemSerializer(serializers.Serializer):
+    """One item of PATCH /api/blogs/bulk/; the fields PATCH /blogs/<id>/ allows."""
+
+    id = serializers.IntegerField()
+    youtube_title = serializers.CharField(max_length=300, required=False)
+    generated_content = serializers.CharField(required=False)
+    content_markdown = serializers.CharField(required=False)
+
+    def validate(self, data):
+        if len(data) == 1:
+            raise serializers.ValidationError("Nothing to update.")
+        return data
+
+
+class BlogPostListSerializer(serializers.ModelSerializer):
+    """List item without the article body; excerpt and counts are stored."""
+
+    class Meta:
+        model = BlogPost
+        fields = [
+            "id",
+            "youtube_title",
+            "tone",
+            "length",
+            "created_at",
+            "excerpt",
+            "word_count",
+            "reading_time",
+        ]
+        read_only_fields = fields
+
+
+class GenerationJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = GenerationJob
+        fields = [
+            "id",
+            "status",
+            "stage",
+            "youtube_link",
+            "tone",
+            "length",
+            "result",
+            "error",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class GenerationBatchSerializer(serializers.ModelSerializer):
+    status = serializers.SerializerMethodField()
+    counts = serializers.SerializerMethodField()
+    jobs = GenerationJobSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = GenerationBatch
+        fields = [
+            "id",
+            "status",
+            "counts",
+            "source",
+            "tone",
+            "length",
+            "created_at",
+            "jobs",
+        ]
+        read_only_fields = fields
+
+    def get_counts(self, batch):
+        counts = {choice: 0 for choice in GenerationJob.Status.values}
+        for job in batch.jobs.all():
+            counts[job.status] += 1
+        return counts
+
+    def get_status(self, batch):
+        """ "running" until every job has finished, then "succeeded" or "failed"
+        (or "partial" when only some videos failed)."""
+        counts = self.get_counts(batch)
+        done = counts["succeeded"] + counts["failed"]
+        if done < sum(counts.values()):
+            return "running"
+        if not counts["failed"]:
+            return "succeeded"
+        return "failed" if not counts["succeeded"] else "partial"
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from api.models import GenerationBatch, GenerationJob
+from api.repositories.batch_repo import GenerationBatchRepository
+
+from .jobs import get_job_queue
+from .youtube import YouTubePlaylist, YouTubeUrl
+
+
+class BatchError(RuntimeError):
+    """The submitted links or playlist cannot be turned into a batch."""
+
+
+class BatchSubmitter:
+    """Turns a list of links or a playlist URL into a ``GenerationBatch``.
+
+    Duplicate videos are submitted once. Jobs run through the normal job
+    queue, at most ``GENERATION_BATCH_PARALLELISM`` at a time per batch, and
+    share transcripts, outlines and articles with every other generation
+    through the usual stores and single-flight locks.
+    """
+
+    def __init__(
+        self,
+        repo: Optional[GenerationBatchRepository] = None,
+        playlist: Optional[YouTubePlaylist] = None,
+    ):
+        self.repo = repo or GenerationBatchRepository()
+        self.playlist = playlist or YouTubePlaylist()
+        self.max_items = settings.GENERATION_BATCH_MAX_ITEMS
+
+    def resolve(
+        self, *, links: Optional[list[str]] = None, playlist: str = ""
+    ) -> list[tuple[str, str]]:
+        """``(normalized link, video id)`` per distinct video, in submission order."""
+        if playlist:
+            if not YouTubePlaylist.playlist_id(playlist):
+                raise BatchError("Invalid YouTube playlist link.")
+            links = [
+                entry.link
+                for entry in self.playlist.entries(playlist, limit=self.max_items)
+            ]
+        elif len(links or []) > self.max_items:
+            raise BatchError(f"A batch can hold at most {self.max_items} videos.")
+
+        videos: dict[str, str] = {}
+        for link in links or []:
+            video_id = YouTubeUrl.video_id(link) if isinstance(link, str) else ""
+            if not video_id:
+                raise BatchError(f"Invalid YouTube link: {link}")
+            videos.setdefault(video_id, YouTubeUrl.normalize(link))
+        if not videos:
+            raise BatchError("The batch has no videos.")
+        return [(link, video_id) for video_id, link in videos.items()]
+
+    def submit(
+        self,
+        *,
+        user: User,
+        tone: str,
+        length: str,
+        links: Optional[list[str]] = None,
+        playlist: str = "",
+    ) -> tuple[GenerationBatch, list[GenerationJob]]:
+        videos = self.resolve(links=links, playlist=playlist)
+        batch, jobs = self.repo.create(
+            user=user,
+            videos=videos,
+            tone=tone,
+            length=length,
+            source=playlist,
+            parallelism=settings.GENERATION_BATCH_PARALLELISM,
+        )
+        queued = [job.id for job in jobs if job.status == GenerationJob.Status.QUEUED]
+
+        def enqueue():
+            queue = get_job_queue()
+            for job_id in queued:
+                queue.enqueue(job_id)
+
+        # Only hand jobs to workers once the rows are visible to other connections.
+        transaction.on_commit(enqueue)
+        return batch, jobs
@@ -1,53 +1,324 @@
 from __future__ import annotations
 
-import os
-from typing import Optional
+import hashlib
+from typing import Any, AsyncIterator, Iterator, Optional
 
-import google.generativeai as genai
-import markdown
+from django.conf import settings
 from dotenv import load_dotenv
 
+from api.utils.content import render_markdown
+
+from .clients import gemini_model
+from .metrics import record_bytes, timed
+from .summarizer import SUMMARY_PROMPT_TEMPLATE, TranscriptSummarizer
+
 load_dotenv()
 
 
+LENGTH_MAP = {
+    "short": "approximately 300 words",
+    "medium": "approximately 600 words",
+    "long": "over 1000 words",
+}
+
+TONE_INSTRUCTIONS = {
+    "professional": "a formal, professional, and informative tone. Use clear and structured language.",
+    "casual": "a casual, friendly, and engaging tone. Feel free to use contractions and a conversational style.",
+    "witty": "a witty, humorous, and clever tone. Use clever wordplay and lighthearted humor where appropriate.",
+    "technical": "a technical, detailed, and precise tone. Focus on accuracy and provide in-depth explanations.",
+}
+
+PROMPT_TEMPLATE = (
+    "You are an expert blog writer.\n\n"
+    "Based on the following transcript from a YouTube video, generate a polished blog article. "
+    "It should not read like a transcript or a YouTube script, but like a structured article. "
+    "The blog should have:\n"
+    "- An engaging introduction\n"
+    "- Well-structured sections with headers\n"
+    "- A concise conclusion\n\n"
+    "Please write the article in {target_length}, and {target_tone}\n\n"
+    "Transcript:\n{transcription}\n\n"
+    "Blog Article:"
+)
+
+# Reduce step for transcripts over the prompt budget: the article is written
+# from per-part notes (see api.services.summarizer) instead of the transcript.
+COMPOSE_PROMPT_TEMPLATE = (
+    "You are an expert blog writer.\n\n"
+    "Below are notes taken from consecutive parts of a YouTube video's transcript. "
+    "Using them, generate a polished blog article covering the whole video. "
+    "It should not read like a list of notes or a YouTube script, but like a structured article. "
+    "The blog should have:\n"
+    "- An engaging introduction\n"
+    "- Well-structured sections with headers\n"
+    "- A concise conclusion\n\n"
+    "Please write the article in {target_length}, and {target_tone}\n\n"
+    "Notes:\n{notes}\n\n"
+    "Blog Article:"
+)
+
+# Outline mode, stage one: a tone-independent outline built once per
+# transcript (from the part notes when the transcript is over budget).
+OUTLINE_PROMPT_TEMPLATE = (
+    "You are preparing material for a blog article about a YouTube video.\n\n"
+    "From the {source_label} below, write a detailed, neutral outline of the video "
+    "as markdown: a working title, then the main sections in order, each with "
+    "bullet points covering its key ideas, arguments, examples, names and numbers. "
+    "Keep every fact needed to write the article, but do not write prose, "
+    "do not add an introduction or conclusion, and do not invent anything.\n\n"
+    "{source_label_title}:\n{source}\n\n"
+    "Outline:"
+)
+
+# Outline mode, stage two: each tone/length variant is written from the
+# outline, a much smaller prompt than the transcript.
+VARIANT_PROMPT_TEMPLATE = (
+    "You are an expert blog writer.\n\n"
+    "Using the following outline of a YouTube video, generate a polished blog article. "
+    "It should not read like an outline or a YouTube script, but like a structured article. "
+    "The blog should have:\n"
+    "- An engaging introduction\n"
+    "- Well-structured sections with headers\n"
+    "- A concise conclusion\n\n"
+    "Please write the article in {target_length}, and {target_tone}\n\n"
+    "Outline:\n{outline}\n\n"
+    "Blog Article:"
+)
+
+# Stored next to each outline; a stored outline with another version is rebuilt.
+OUTLINE_PROMPT_VERSION = hashlib.sha256(
+    repr((OUTLINE_PROMPT_TEMPLATE, SUMMARY_PROMPT_TEMPLATE)).encode("utf-8")
+).hexdigest()[:12]
+
+# Part of every generation cache key: editing the prompts (or the tone/length
+# wording) changes the version and retires previously cached articles.
+PROMPT_TEMPLATE_VERSION = hashlib.sha256(
+    repr(
+        (
+            PROMPT_TEMPLATE,
+            COMPOSE_PROMPT_TEMPLATE,
+            SUMMARY_PROMPT_TEMPLATE,
+            OUTLINE_PROMPT_TEMPLATE,
+            VARIANT_PROMPT_TEMPLATE,
+            LENGTH_MAP,
+            TONE_INSTRUCTIONS,
+        )
+    ).encode("utf-8")
+).hexdigest()[:12]
+
+
+class GenerationMode:
+    """``settings.BLOG_GENERATION_MODE`` values."""
+
+    # One pass over the transcript per tone/length.
+    DIRECT = "direct"
+    # Outline once per transcript, then each variant from the outline.
+    OUTLINE = "outline"
+
+
 class BlogGenerator:
+    """Writes a blog article from a transcript with Gemini.
+
+    Transcripts longer than ``BLOG_PROMPT_CHAR_BUDGET`` characters are
+    map-reduced: sentence-aligned parts are summarized in parallel and the
+    article is composed from those notes in one final call. When an
+    ``outline`` (see ``build_outline``) is passed, the article is written from
+    it instead of the transcript.
+    """
+
+    DEFAULT_MODEL_NAME = "gemini-2.5-flash"
+
     def __init__(
-        self, api_key: Optional[str] = None, model_name: str = "gemini-2.5-flash"
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        model: Optional[Any] = None,
+        prompt_char_budget: Optional[int] = None,
     ):
-        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
-        if not self.api_key:
-            raise RuntimeError("GEMINI_API_KEY is not configured.")
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(model_name)
-
-    def from_transcript(self, transcription: str, tone: str, length: str) -> str:
-        length_map = {
-            "short": "approximately 300 words",
-            "medium": "approximately 600 words",
-            "long": "over 1000 words",
-        }
-        target_length = length_map.get(length, "approximately 600 words")
-        tone_instructions = {
-            "professional": "a formal, professional, and informative tone. Use clear and structured language.",
-            "casual": "a casual, friendly, and engaging tone. Feel free to use contractions and a conversational style.",
-            "witty": "a witty, humorous, and clever tone. Use clever wordplay and lighthearted humor where appropriate.",
-            "technical": "a technical, detailed, and precise tone. Focus on accuracy and provide in-depth explanations.",
-        }
-        target_tone = tone_instructions.get(tone, "a professional tone")
-        prompt = (
-            "You are an expert blog writer.\n\n"
-            "Based on the following transcript from a YouTube video, generate a polished blog article. "
-            "It should not read like a transcript or a YouTube script, but like a structured article. "
-            "The blog should have:\n"
-            "- An engaging introduction\n"
-            "- Well-structured sections with headers\n"
-            "- A concise conclusion\n\n"
-            f"Please write the article in {target_length}, and {target_tone}\n\n"
-            f"Transcript:\n{transcription}\n\n"
-            "Blog Article:"
-        )
-        response = self.model.generate_content(prompt)
-        html = markdown.markdown(response.text or "")
+        """``model`` replaces the Gemini client (anything with ``generate_content``)."""
+        self.model_name = model_name
+        self.prompt_char_budget = (
+            settings.BLOG_PROMPT_CHAR_BUDGET
+            if prompt_char_budget is None
+            else prompt_char_budget
+        )
+        # Shared per model name (api.services.clients) unless one is injected.
+        self.model = model if model is not None else gemini_model(model_name)
+
+    @staticmethod
+    def build_prompt(transcription: str, tone: str, length: str) -> str:
+        target_length = LENGTH_MAP.get(length, "approximately 600 words")
+        target_tone = TONE_INSTRUCTIONS.get(tone, "a professional tone")
+        return PROMPT_TEMPLATE.format(
+            target_length=target_length,
+            target_tone=target_tone,
+            transcription=transcription,
+        )
+
+    @staticmethod
+    def build_compose_prompt(notes: str, tone: str, length: str) -> str:
+        target_length = LENGTH_MAP.get(length, "approximately 600 words")
+        target_tone = TONE_INSTRUCTIONS.get(tone, "a professional tone")
+        return COMPOSE_PROMPT_TEMPLATE.format(
+            target_length=target_length, target_tone=target_tone, notes=notes
+        )
+
+    @staticmethod
+    def build_variant_prompt(outline: str, tone: str, length: str) -> str:
+        target_length = LENGTH_MAP.get(length, "approximately 600 words")
+        target_tone = TONE_INSTRUCTIONS.get(tone, "a professional tone")
+        return VARIANT_PROMPT_TEMPLATE.format(
+            target_length=target_length, target_tone=target_tone, outline=outline
+        )
+
+    @staticmethod
+    def build_outline_prompt(source: str, from_notes: bool = False) -> str:
+        source_label = (
+            "notes on consecutive parts of the transcript"
+            if from_notes
+            else "transcript"
+        )
+        return OUTLINE_PROMPT_TEMPLATE.format(
+            source_label=source_label,
+            source_label_title="Notes" if from_notes else "Transcript",
+            source=source,
+        )
+
+    @staticmethod
+    def _outline_text(response: Any) -> str:
+        outline = getattr(response, "text", "")
+        if not outline:
+            raise RuntimeError("Failed to build an outline from the transcript.")
+        return outline
+
+    @timed("outline")
+    def build_outline(self, transcription: str) -> str:
+        """Tone-independent markdown outline of the transcript."""
+        if self.needs_map_reduce(transcription):
+            notes = self.summarizer().summarize(transcription)
+            prompt = self.build_outline_prompt(notes, from_notes=True)
+        else:
+            prompt = self.build_outline_prompt(transcription)
+        return self._outline_text(self.model.generate_content(prompt))
+
+    @timed("outline")
+    async def abuild_outline(self, transcription: str) -> str:
+        if self.needs_map_reduce(transcription):
+            notes = await self.summarizer().asummarize(transcription)
+            prompt = self.build_outline_prompt(notes, from_notes=True)
+        else:
+            prompt = self.build_outline_prompt(transcription)
+        return self._outline_text(await self.model.generate_content_async(prompt))
+
+    def needs_map_reduce(self, transcription: str) -> bool:
+        return bool(self.prompt_char_budget) and (
+            len(transcription) > self.prompt_char_budget
+        )
+
+    def summarizer(self) -> TranscriptSummarizer:
+        return TranscriptSummarizer(self.model, self.model_name)
+
+    def prompt_for(
+        self, transcription: str, tone: str, length: str, outline: Optional[str] = None
+    ) -> str:
+        if outline:
+            return self.build_variant_prompt(outline, tone, length)
+        if self.needs_map_reduce(transcription):
+            notes = self.summarizer().summarize(transcription)
+            return self.build_compose_prompt(notes, tone, length)
+        return self.build_prompt(transcription, tone, length)
+
+    async def aprompt_for(
+        self, transcription: str, tone: str, length: str, outline: Optional[str] = None
+    ) -> str:
+        if outline:
+            return self.build_variant_prompt(outline, tone, length)
+        if self.needs_map_reduce(transcription):
+            notes = await self.summarizer().asummarize(transcription)
+            return self.build_compose_prompt(notes, tone, length)
+        return self.build_prompt(transcription, tone, length)
+
+    @staticmethod
+    def render(markdown_text: str) -> str:
+        html = render_markdown(markdown_text)
         if not html:
             raise RuntimeError("Failed to generate blog content from transcript.")
         return html
+
+    def markdown_from_transcript(
+        self, transcription: str, tone: str, length: str, outline: Optional[str] = None
+    ) -> str:
+        """The article as markdown, unrendered."""
+        prompt = self.prompt_for(transcription, tone, length, outline)
+        record_bytes("prompt", prompt)
+        with timed("generate", model=self.model_name):
+            response = self.model.generate_content(prompt)
+        record_bytes("generated", response.text or "")
+        return response.text or ""
+
+    def from_transcript(
+        self, transcription: str, tone: str, length: str, outline: Optional[str] = None
+    ) -> str:
+        return self.render(
+            self.markdown_from_transcript(transcription, tone, length, outline)
+        )
+
+    @staticmethod
+    def _chunk_text(chunk) -> str:
+        """A streamed chunk's text, "" for a chunk without parts.
+
+        The last chunk can carry only the finish reason, and ``chunk.text``
+        raises ValueError for it. A blocked prompt (no candidates) still
+        raises.
+        """
+        return "".join(getattr(part, "text", "") for part in chunk.parts)
+
+    def stream_from_transcript(
+        self,
+        transcription: str,
+        tone: str,
+        length: str,
+        outline: Optional[str] = None,
+    ) -> Iterator[str]:
+        """Yields the article as raw markdown chunks while the model produces it."""
+        prompt = self.prompt_for(transcription, tone, length, outline)
+        record_bytes("prompt", prompt)
+        with timed("generate_stream", model=self.model_name):
+            for chunk in self.model.generate_content(prompt, stream=True):
+                text = self._chunk_text(chunk)
+                if text:
+                    record_bytes("generated", text)
+                    yield text
+
+    async def amarkdown_from_transcript(
+        self, transcription: str, tone: str, length: str, outline: Optional[str] = None
+    ) -> str:
+        prompt = await self.aprompt_for(transcription, tone, length, outline)
+        record_bytes("prompt", prompt)
+        with timed("generate", model=self.model_name):
+            response = await self.model.generate_content_async(prompt)
+        record_bytes("generated", response.text or "")
+        return response.text or ""
+
+    async def afrom_transcript(
+        self, transcription: str, tone: str, length: str, outline: Optional[str] = None
+    ) -> str:
+        return self.render(
+            await self.amarkdown_from_transcript(transcription, tone, length, outline)
+        )
+
+    async def astream_from_transcript(
+        self,
+        transcription: str,
+        tone: str,
+        length: str,
+        outline: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        prompt = await self.aprompt_for(transcription, tone, length, outline)
+        record_bytes("prompt", prompt)
+        with timed("generate_stream", model=self.model_name):
+            response = await self.model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                text = self._chunk_text(chunk)
+                if text:
+                    record_bytes("generated", text)
+                    yield text
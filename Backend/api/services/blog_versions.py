@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+
+from api.models import BlogPost
+
+CACHE_TIMEOUT = 60 * 60 * 24 * 30
+
+
+@dataclass
+class BlogListVersion:
+    token: str
+    modified: Optional[datetime]
+
+
+class BlogVersions:
+    """Per-user version of the blog list, kept in the cache.
+
+    Any change to a user's posts calls ``bump``, which stores a new random
+    token. A missing entry (expired or evicted) is recreated with a fresh
+    token too, so an old ETag can never match again by accident; only its
+    ``modified`` time is recomputed from the database.
+    """
+
+    @staticmethod
+    def cache_key(user_id: int) -> str:
+        return f"blog_list_version:{user_id}"
+
+    @staticmethod
+    def _token() -> str:
+        return f"{time.time_ns():x}"
+
+    def get(self, user_id: int) -> BlogListVersion:
+        version = cache.get(self.cache_key(user_id))
+        if version is None:
+            modified = BlogPost.objects.filter(user_id=user_id).aggregate(
+                modified=Max("updated_at")
+            )["modified"]
+            version = {"token": self._token(), "modified": modified}
+            # add() keeps a token a concurrent request stored first.
+            if not cache.add(self.cache_key(user_id), version, CACHE_TIMEOUT):
+                version = cache.get(self.cache_key(user_id), version)
+        return BlogListVersion(**version)
+
+    def bump(self, user_id: int) -> None:
+        cache.set(
+            self.cache_key(user_id),
+            {"token": self._token(), "modified": datetime.now(timezone.utc)},
+            CACHE_TIMEOUT,
+        )
+
+
+def bump_on_commit(user_id: int) -> None:
+    """Bumps the user's list version once the current transaction commits."""
+    # After commit, so a reader cannot cache the old list under the new token.
+    transaction.on_commit(lambda: BlogVersions().bump(user_id))
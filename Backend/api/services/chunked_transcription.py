@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import astuple, dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import record_cache, timed
+from .transcription import TranscriptionService, TranscriptSegment
+
+logger = logging.getLogger(__name__)
+
+CHUNK_CACHE_TIMEOUT = 60 * 60 * 24
+
+_SILENCE_START = re.compile(r"silence_start: (-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end: (-?[\d.]+)")
+
+
+def ffmpeg_tool(name: str) -> str:
+    """Path to ffmpeg/ffprobe inside FFMPEG_LOCATION, or the bare name for PATH."""
+    location = settings.FFMPEG_LOCATION
+    if location and os.path.isdir(location):
+        return os.path.join(location, name)
+    return name
+
+
+@dataclass
+class AudioChunk:
+    index: int
+    start: float
+    end: float
+    path: str
+
+
+@dataclass
+class ChunkedTranscript:
+    # Sentences in order, timed from the start of the whole audio.
+    segments: list[TranscriptSegment]
+
+    @property
+    def text(self) -> str:
+        return " ".join(segment.text for segment in self.segments if segment.text)
+
+
+class AudioSplitter:
+    """Cuts an audio file into ~``chunk_seconds`` pieces at silences (ffmpeg).
+
+    Each cut is moved to the middle of the silence closest to the target
+    boundary (within ``search_window`` seconds), so words are not split.
+    The same file always yields the same boundaries, which keeps per-chunk
+    cache keys stable across retries.
+    """
+
+    def __init__(
+        self,
+        chunk_seconds: Optional[int] = None,
+        search_window: int = 60,
+        noise: str = "-30dB",
+        min_silence: float = 0.5,
+    ):
+        self.chunk_seconds = chunk_seconds or settings.TRANSCRIPTION_CHUNK_SECONDS
+        self.search_window = search_window
+        self.noise = noise
+        self.min_silence = min_silence
+
+    def duration(self, audio_path: str) -> float:
+        result = subprocess.run(
+            [
+                ffmpeg_tool("ffprobe"),
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                audio_path,
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        return float(result.stdout.strip())
+
+    def silences(self, audio_path: str) -> list[float]:
+        """Midpoints of detected silences, in seconds."""
+        result = subprocess.run(
+            [
+                ffmpeg_tool("ffmpeg"),
+                "-hide_banner",
+                "-nostats",
+                "-i",
+                audio_path,
+                "-af",
+                f"silencedetect=noise={self.noise}:d={self.min_silence}",
+                "-f",
+                "null",
+                "-",
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        starts = [float(m) for m in _SILENCE_START.findall(result.stderr)]
+        ends = [float(m) for m in _SILENCE_END.findall(result.stderr)]
+        return [(start + end) / 2 for start, end in zip(starts, ends)]
+
+    def boundaries(self, duration: float, silences: list[float]) -> list[float]:
+        cuts = [0.0]
+        while duration - cuts[-1] > self.chunk_seconds:
+            target = cuts[-1] + self.chunk_seconds
+            nearby = [
+                s
+                for s in silences
+                if abs(s - target) <= self.search_window and s > cuts[-1]
+            ]
+            cuts.append(
+                min(nearby, key=lambda s: abs(s - target)) if nearby else target
+            )
+        cuts.append(duration)
+        return cuts
+
+    def split(self, audio_path: str, output_dir: str) -> list[AudioChunk]:
+        cuts = self.boundaries(self.duration(audio_path), self.silences(audio_path))
+        ext = os.path.splitext(audio_path)[1]
+        chunks = []
+        for index, (start, end) in enumerate(zip(cuts, cuts[1:])):
+            path = os.path.join(output_dir, f"chunk-{index:04d}{ext}")
+            subprocess.run(
+                [
+                    ffmpeg_tool("ffmpeg"),
+                    "-hide_banner",
+                    "-loglevel",
+                    "error",
+                    "-y",
+                    "-ss",
+                    f"{start:.3f}",
+                    "-to",
+                    f"{end:.3f}",
+                    "-i",
+                    audio_path,
+                    "-c",
+                    "copy",
+                    path,
+                ],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            chunks.append(AudioChunk(index=index, start=start, end=end, path=path))
+        return chunks
+
+
+class ChunkedTranscriptionService:
+    """Transcribes long audio as silence-aligned chunks on a bounded thread pool.
+
+    Each chunk's sentences are shifted by the chunk's start, so the stitched
+    segments are timed against the whole audio. Finished chunks are cached
+    under ``transcript_chunk_segments:<cache_id>:...``, so when one chunk
+    fails only the missing chunks are sent again on retry.
+    """
+
+    def __init__(
+        self,
+        transcriber: Optional[TranscriptionService] = None,
+        splitter: Optional[AudioSplitter] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.transcriber = transcriber or TranscriptionService()
+        self.splitter = splitter or AudioSplitter()
+        self.max_workers = max_workers or settings.TRANSCRIPTION_MAX_WORKERS
+
+    def should_chunk(self, audio_path: str) -> bool:
+        threshold = settings.TRANSCRIPTION_CHUNK_THRESHOLD
+        if not threshold:
+            return False
+        try:
+            return self.splitter.duration(audio_path) > threshold
+        except (OSError, subprocess.CalledProcessError, ValueError) as e:
+            logger.info("Could not probe %s, transcribing whole: %s", audio_path, e)
+            return False
+
+    @staticmethod
+    def chunk_cache_key(cache_id: str, chunk: AudioChunk) -> str:
+        return f"transcript_chunk_segments:{cache_id}:{chunk.start:.3f}:{chunk.end:.3f}"
+
+    def _transcribe_chunk(
+        self, cache_id: str, chunk: AudioChunk
+    ) -> list[TranscriptSegment]:
+        key = self.chunk_cache_key(cache_id, chunk)
+        # (start, end, text) tuples, timed from the start of the chunk.
+        cached = cache.get(key)
+        record_cache(
+            "transcript_chunk",
+            cached is not None,
+            cached and " ".join(text for _, _, text in cached),
+        )
+        if cached is None:
+            segments = self.transcriber.transcribe_segments(chunk.path)
+            cached = [astuple(segment) for segment in segments]
+            cache.set(key, cached, timeout=CHUNK_CACHE_TIMEOUT)
+        return [
+            TranscriptSegment(
+                start=chunk.start + start,
+                end=min(chunk.start + end, chunk.end),
+                text=text,
+            )
+            for start, end, text in cached
+        ]
+
+    @timed("transcribe_chunked")
+    def transcribe_file(self, audio_path: str, cache_id: str) -> ChunkedTranscript:
+        output_dir = tempfile.mkdtemp(prefix="chunks-")
+        try:
+            with timed("split_audio"):
+                chunks = self.splitter.split(audio_path, output_dir)
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="transcribe-chunk"
+            ) as pool:
+                futures = [
+                    pool.submit(self._transcribe_chunk, cache_id, chunk)
+                    for chunk in chunks
+                ]
+                # Let every chunk finish (and be cached) before reporting a failure.
+                wait(futures)
+            return ChunkedTranscript(
+                segments=[segment for f in futures for segment in f.result()]
+            )
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
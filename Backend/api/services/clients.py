@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+import assemblyai as aai
+import google.generativeai as genai
+import httpx
+import requests
+from django.conf import settings
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+load_dotenv()
+
+
+class ClientRegistry:
+    """Process-wide clients, created lazily on first use and then shared.
+
+    ``get`` builds each client at most once, even when threads race for it.
+    ``override`` swaps in a fake (tests, benchmarks) for the duration of a
+    ``with`` block.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clients: dict[str, Any] = {}
+
+    def get(self, name: str, factory: Callable[[], Any]) -> Any:
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    client = self._clients[name] = factory()
+        return client
+
+    def peek(self, name: str) -> Optional[Any]:
+        return self._clients.get(name)
+
+    def set(self, name: str, client: Any) -> None:
+        with self._lock:
+            self._clients[name] = client
+
+    @contextmanager
+    def override(self, name: str, client: Any) -> Iterator[Any]:
+        with self._lock:
+            previous = self._clients.get(name)
+            self._clients[name] = client
+        try:
+            yield client
+        finally:
+            with self._lock:
+                if previous is None:
+                    self._clients.pop(name, None)
+                else:
+                    self._clients[name] = previous
+
+    def reset(self) -> None:
+        """Drops every client, closing HTTP sessions."""
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for client in clients.values():
+            if isinstance(client, requests.Session):
+                client.close()
+
+
+registry = ClientRegistry()
+
+
+def http_timeout() -> tuple[float, float]:
+    """(connect, read) timeout for outbound HTTP calls."""
+    return (settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT)
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def http_session() -> requests.Session:
+    """Keep-alive, connection-pooled session shared by all threads."""
+    return registry.get("http", _build_session)
+
+
+# An httpx pool is tied to the event loop that opened its connections, so
+# each loop gets its own client; it goes away with the loop.
+_async_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]"
+) = weakref.WeakKeyDictionary()
+_async_lock = threading.Lock()
+
+
+def async_http_client() -> httpx.AsyncClient:
+    """Pooled ``httpx.AsyncClient`` for the running event loop."""
+    override = registry.peek("httpx")
+    if override is not None:
+        return override
+    loop = asyncio.get_running_loop()
+    with _async_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            connect, read = http_timeout()
+            client = _async_clients[loop] = httpx.AsyncClient(
+                timeout=httpx.Timeout(read, connect=connect),
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_POOL_MAXSIZE,
+                    max_keepalive_connections=settings.HTTP_POOL_MAXSIZE,
+                ),
+            )
+    return client
+
+
+def gemini_model(model_name: str) -> Any:
+    """Shared ``GenerativeModel`` per model name.
+
+    ``genai.configure`` is process-global, so every model uses GEMINI_API_KEY.
+    """
+
+    def build():
+        key = os.getenv("GEMINI_API_KEY")
+        if not key:
+            raise RuntimeError("GEMINI_API_KEY is not configured.")
+        genai.configure(api_key=key)
+        return genai.GenerativeModel(model_name)
+
+    return registry.get(f"gemini:{model_name}", build)
+
+
+def assemblyai_transcriber(api_key: Optional[str] = None) -> Any:
+    """Shared ``aai.Transcriber``; the SDK's global settings are set once."""
+
+    def build():
+        key = api_key or os.getenv("ASSEMBLY_API_KEY")
+        if not key:
+            raise RuntimeError("ASSEMBLY_API_KEY is not configured.")
+        aai.settings.api_key = key
+        return aai.Transcriber()
+
+    return registry.get("assemblyai", build)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from .blog_generation import PROMPT_TEMPLATE_VERSION
+from .metrics import record_cache
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class GenerationCache:
+    """Generated article cache shared by all users.
+
+    Entries are keyed on a hash of everything that determines the model output
+    (transcript, tone, length, model name and prompt template version), so two
+    users generating the same video with the same settings share one Gemini
+    call. Articles are ``{"markdown", "html"}`` dicts, so a hit is never
+    re-rendered. ``invalidate()`` retires every entry at once by bumping a
+    namespace counter; each entry records the namespace it was written under
+    and is read together with the counter in one ``get_many``.
+    """
+
+    NAMESPACE_KEY = "generation_cache:namespace"
+    HITS_KEY = "generation_cache:hits"
+    MISSES_KEY = "generation_cache:misses"
+
+    def __init__(self, prompt_version: str = PROMPT_TEMPLATE_VERSION):
+        self.prompt_version = prompt_version
+
+    @staticmethod
+    def fingerprint(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def key(self, *, transcript: str, tone: str, length: str, model_name: str) -> str:
+        fingerprint = self.fingerprint(
+            transcript, tone, length, model_name, self.prompt_version
+        )
+        # "generated_article" replaced "generated_content" (HTML-only values).
+        return f"generated_article:{fingerprint}"
+
+    def get(
+        self, *, transcript: str, tone: str, length: str, model_name: str
+    ) -> Optional[dict]:
+        key = self.key(
+            transcript=transcript, tone=tone, length=length, model_name=model_name
+        )
+        values = cache.get_many([self.NAMESPACE_KEY, key])
+        entry = values.get(key)
+        article = None
+        if entry and entry["namespace"] == values.get(self.NAMESPACE_KEY, 1):
+            article = entry["article"]
+        if settings.GENERATION_CACHE_STATS:
+            self._incr(self.HITS_KEY if article else self.MISSES_KEY)
+        record_cache("generated_content", bool(article), article and article["html"])
+        return article
+
+    def set(
+        self, *, transcript: str, tone: str, length: str, model_name: str, article: dict
+    ) -> None:
+        cache.set(
+            self.key(
+                transcript=transcript, tone=tone, length=length, model_name=model_name
+            ),
+            {"namespace": cache.get(self.NAMESPACE_KEY, 1), "article": article},
+            timeout=CACHE_TIMEOUT,
+        )
+
+    async def aget(self, **kwargs) -> Optional[dict]:
+        return await sync_to_async(self.get, thread_sensitive=False)(**kwargs)
+
+    async def aset(self, **kwargs) -> None:
+        await sync_to_async(self.set, thread_sensitive=False)(**kwargs)
+
+    def invalidate(self) -> None:
+        """Drops every cached article (entries age out of the backend on their own)."""
+        cache.add(self.NAMESPACE_KEY, 1, timeout=None)
+        cache.incr(self.NAMESPACE_KEY)
+
+    def stats(self) -> dict:
+        hits = cache.get(self.HITS_KEY, 0)
+        misses = cache.get(self.MISSES_KEY, 0)
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+            "prompt_version": self.prompt_version,
+        }
+
+    def reset_stats(self) -> None:
+        cache.delete_many([self.HITS_KEY, self.MISSES_KEY])
+
+    @staticmethod
+    def _incr(key: str) -> None:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # First sample (or evicted). A concurrent add() may win and this
+            # sample is lost, which is fine for a hit ratio.
+            cache.add(key, 1, timeout=None)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+from uuid import UUID
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from api.repositories.batch_repo import GenerationBatchRepository
+from api.repositories.job_repo import GenerationJobRepository
+
+from .pipeline import BlogGenerationPipeline
+
+logger = logging.getLogger(__name__)
+
+
+def run_job(job_id: UUID) -> None:
+    """Claims a queued job and runs the generation pipeline for it.
+
+    Safe to call from any worker: if the job was already claimed elsewhere it
+    returns without doing anything. The batch only advances when this run
+    ended the job, so a run that recover_stale_jobs already failed (and
+    advanced) cannot free its slot twice.
+    """
+    repo = GenerationJobRepository()
+    close_old_connections()
+    try:
+        started_at = repo.claim(pk=job_id)
+        if started_at is None:
+            return
+        job = repo.get(pk=job_id)
+        pipeline = BlogGenerationPipeline(
+            on_stage=lambda stage: repo.set_stage(pk=job_id, stage=stage)
+        )
+        try:
+            payload = pipeline.run(
+                link=job.youtube_link,
+                video_id=job.video_id,
+                tone=job.tone,
+                length=job.length,
+            )
+        except Exception as e:
+            logger.exception("Generation job %s failed", job_id)
+            finished = repo.mark_failed(
+                pk=job_id, started_at=started_at, error=f"Generation failed: {str(e)}"
+            )
+        else:
+            finished = repo.mark_succeeded(
+                pk=job_id, started_at=started_at, result=payload
+            )
+        if not finished:
+            logger.warning("Generation job %s was recovered before it finished", job_id)
+        elif job.batch_id:
+            advance_batch(job.batch_id)
+    finally:
+        close_old_connections()
+
+
+def advance_batch(batch_id: UUID) -> None:
+    """Hands the batch's next pending job to the queue once one has finished.
+
+    This keeps at most ``GENERATION_BATCH_PARALLELISM`` jobs of a batch queued
+    or running, so one large batch cannot take every worker.
+    """
+    job_id = GenerationBatchRepository().release_next(batch_id=batch_id)
+    if job_id is not None:
+        get_job_queue().enqueue(job_id)
+
+
+def recover_stale_jobs() -> int:
+    """Fails running jobs whose worker has gone away; returns how many.
+
+    Nothing watches a job once it is claimed, so a job still running
+    ``GENERATION_JOB_TIMEOUT`` seconds later is taken as lost. Failing it lets
+    the user retry and hands its batch slot to the next pending job.
+    """
+    repo = GenerationJobRepository()
+    started_before = timezone.now() - timedelta(seconds=settings.GENERATION_JOB_TIMEOUT)
+    failed = 0
+    for job in repo.stale_running(started_before=started_before):
+        if not repo.fail_if_stale(
+            pk=job.id,
+            started_before=started_before,
+            error="Generation was interrupted before it finished.",
+        ):
+            continue
+        logger.warning("Generation job %s was lost; marked as failed", job.id)
+        failed += 1
+        if job.batch_id:
+            advance_batch(job.batch_id)
+    return failed
+
+
+class JobQueue:
+    """Interface for generation job queues.
+
+    Jobs are persisted as ``GenerationJob`` rows before they are enqueued, so a
+    backend only has to arrange for ``run_job`` to be called with the id.
+    """
+
+    def enqueue(self, job_id: UUID) -> None:
+        raise NotImplementedError
+
+
+class InProcessJobQueue(JobQueue):
+    """Runs jobs on a bounded thread pool inside the web process.
+
+    Queued jobs live only in that pool, so a restart leaves them queued in the
+    database. Web processes cannot tell those apart from jobs a live sibling
+    still holds, so they don't recover anything themselves:
+    ``manage.py run_generation_worker --once`` fails lost running jobs and
+    drains the queued ones.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.GENERATION_JOB_WORKERS,
+            thread_name_prefix="generation-job",
+        )
+
+    def enqueue(self, job_id: UUID) -> None:
+        self._executor.submit(run_job, job_id)
+
+
+class DatabaseJobQueue(JobQueue):
+    """Leaves jobs in the database for ``manage.py run_generation_worker``.
+
+    The worker polls for queued rows and claims them atomically, so several
+    worker processes can share one database (SQLite or otherwise).
+    """
+
+    def enqueue(self, job_id: UUID) -> None:
+        pass
+
+
+class SynchronousJobQueue(JobQueue):
+    """Runs the job inline; useful for tests and local debugging."""
+
+    def enqueue(self, job_id: UUID) -> None:
+        run_job(job_id)
+
+
+_queue_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _build_job_queue(path: str) -> JobQueue:
+    return import_string(path)()
+
+
+def get_job_queue() -> JobQueue:
+    with _queue_lock:
+        return _build_job_queue(settings.GENERATION_JOB_QUEUE)
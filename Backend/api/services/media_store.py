@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-use files are only known within a process.
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# yt-dlp's in-progress download files.
+PARTIAL_SUFFIXES = (".part", ".ytdl")
+
+# Paths inside a MediaStore.in_use block in this process, with their holders.
+_in_use: dict[str, int] = {}
+_in_use_lock = threading.Lock()
+
+
+@dataclass
+class SweepResult:
+    removed: list[str] = field(default_factory=list)
+    freed_bytes: int = 0
+    remaining_bytes: int = 0
+
+
+class MediaStore:
+    """Downloaded audio in MEDIA_ROOT, stored as ``<video_id>.<mode>.<ext>``.
+
+    Naming files by video id lets a retried transcription reuse the earlier
+    download; ``find`` and ``remove`` take the video id, optionally with the
+    mode. A file's mtime is its last use (``find`` touches it), and
+    ``sweep`` evicts by age and then least-recently-used until the directory
+    fits in ``max_bytes``, skipping files held with ``in_use``.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[int] = None,
+    ):
+        self.root = root or settings.MEDIA_ROOT
+        self.max_bytes = settings.MEDIA_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_age = settings.MEDIA_MAX_AGE if max_age is None else max_age
+
+    def stem(self, name: str) -> str:
+        """Path without extension; yt-dlp chooses the extension."""
+        os.makedirs(self.root, exist_ok=True)
+        return os.path.join(self.root, name)
+
+    def _files_for(self, video_id: str) -> list[str]:
+        return [
+            path
+            for path in glob.glob(os.path.join(glob.escape(self.root), f"{video_id}.*"))
+            if not path.endswith(PARTIAL_SUFFIXES)
+        ]
+
+    def find(self, video_id: str) -> Optional[str]:
+        for path in self._files_for(video_id):
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                continue
+            return path
+        return None
+
+    @contextmanager
+    def in_use(self, path: str) -> Iterator[str]:
+        """Keeps ``sweep``, in this or any other process, away from ``path``.
+
+        Holds a shared ``flock`` on the file for the block; sweeps only remove
+        files they can lock exclusively.
+        """
+        path = os.path.abspath(path)
+        with _in_use_lock:
+            _in_use[path] = _in_use.get(path, 0) + 1
+        handle = None
+        try:
+            if fcntl is not None:
+                handle = open(path, "rb")
+                fcntl.flock(handle, fcntl.LOCK_SH)
+            yield path
+        finally:
+            if handle is not None:
+                handle.close()
+            with _in_use_lock:
+                _in_use[path] -= 1
+                if not _in_use[path]:
+                    del _in_use[path]
+
+    @staticmethod
+    def _evict(path: str, dry_run: bool) -> bool:
+        """Removes ``path`` unless it is in use; False if it was skipped."""
+        if os.path.abspath(path) in _in_use:
+            return False
+        try:
+            with open(path, "rb") as handle:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        return False
+                if not dry_run:
+                    os.remove(path)
+        except FileNotFoundError:
+            pass
+        return True
+
+    def remove(self, video_id: str) -> None:
+        for path in self._files_for(video_id):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def sweep(
+        self,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[int] = None,
+        dry_run: bool = False,
+        keep: Iterable[str] = (),
+    ) -> SweepResult:
+        """Evicts expired files, then LRU files until under ``max_bytes``.
+
+        Paths in ``keep`` (e.g. a file about to be transcribed) and files held
+        with ``in_use`` are never removed.
+        """
+        keep = {os.path.abspath(path) for path in keep}
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age = self.max_age if max_age is None else max_age
+        result = SweepResult()
+        if not os.path.isdir(self.root):
+            return result
+
+        entries = []
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()  # least recently used first
+
+        total = sum(size for _, size, _ in entries)
+        cutoff = time.time() - max_age if max_age else None
+        for mtime, size, path in entries:
+            expired = cutoff is not None and mtime < cutoff
+            # An in-progress download only goes once it is stale.
+            over_budget = (
+                bool(max_bytes)
+                and total > max_bytes
+                and not path.endswith(PARTIAL_SUFFIXES)
+            )
+            if not (expired or over_budget) or os.path.abspath(path) in keep:
+                continue
+            if not self._evict(path, dry_run):
+                continue
+            result.removed.append(path)
+            result.freed_bytes += size
+            total -= size
+
+        result.remaining_bytes = total
+        if result.removed and not dry_run:
+            logger.info(
+                "Media sweep removed %d files (%d bytes)",
+                len(result.removed),
+                result.freed_bytes,
+            )
+        return result
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import os
+import time
+from typing import Any, Callable, Optional, Union
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    Metric,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+# Seconds; spans a cache lookup up to a chunked hour-long transcription.
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+    1800.0,
+)
+
+# With PROMETHEUS_MULTIPROC_DIR set in the environment (before the process
+# starts; prometheus_client reads it on import), every process writes its
+# values to files in that directory and /metrics adds them up, so any gunicorn
+# worker can answer a scrape. Clear the directory when the server restarts.
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get(
+    "prometheus_multiproc_dir"
+)
+
+
+class _Families:
+    """Collected metric families in the shape ``generate_latest`` expects."""
+
+    def __init__(self, families: list[Metric]):
+        self.families = families
+
+    def collect(self) -> list[Metric]:
+        return self.families
+
+
+class MetricsRegistry:
+    """Generation metrics, rendered in the Prometheus text format.
+
+    Values are kept by ``prometheus_client``: per process, or shared by every
+    process when ``PROMETHEUS_MULTIPROC_DIR`` is set (see above).
+    """
+
+    def __init__(self):
+        self._registry = CollectorRegistry(auto_describe=True)
+        self._metrics: list[Union[Counter, Histogram]] = []
+
+    def counter(
+        self, name: str, help: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        metric = Counter(name, help, labelnames, registry=self._registry)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(
+            name, help, labelnames, buckets=buckets, registry=self._registry
+        )
+        self._metrics.append(metric)
+        return metric
+
+    def collect(self) -> list[Metric]:
+        if not MULTIPROC_DIR:
+            return list(self._registry.collect())
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=MULTIPROC_DIR)
+        return list(registry.collect())
+
+    def render(self) -> bytes:
+        families = self.collect()
+        return generate_latest(_Families(families + _hit_ratio(families)))
+
+    def reset(self) -> None:
+        """Drops this process's values (multi-process files are kept)."""
+        for metric in self._metrics:
+            metric.clear()
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "intelliblogger_stage_duration_seconds",
+    "Time spent in each generation stage or external call.",
+    ("stage", "outcome"),
+)
+CACHE_LOOKUPS = registry.counter(
+    "intelliblogger_cache_lookups_total",
+    "Cache lookups by cache and result (hit, db_hit or miss).",
+    ("cache", "result"),
+)
+CACHE_BYTES = registry.counter(
+    "intelliblogger_cache_bytes_total",
+    "Bytes of values served from each cache instead of being recomputed.",
+    ("cache",),
+)
+PAYLOAD_BYTES = registry.counter(
+    "intelliblogger_bytes_total",
+    "Bytes moved by the pipeline (audio, prompts, model output).",
+    ("kind",),
+)
+
+
+def _samples(families: list[Metric], name: str):
+    for family in families:
+        for sample in family.samples:
+            if sample.name == name:
+                yield sample
+
+
+def _hit_ratio(families: list[Metric]) -> list[Metric]:
+    totals: dict[str, list[float]] = {}
+    for sample in _samples(families, "intelliblogger_cache_lookups_total"):
+        hits_total = totals.setdefault(sample.labels["cache"], [0.0, 0.0])
+        if sample.labels["result"] != "miss":
+            hits_total[0] += sample.value
+        hits_total[1] += sample.value
+    if not totals:
+        return []
+    gauge = GaugeMetricFamily(
+        "intelliblogger_cache_hit_ratio",
+        "Share of lookups answered by the cache since start-up.",
+        labels=["cache"],
+    )
+    for cache_name, (hits, total) in sorted(totals.items()):
+        gauge.add_metric([cache_name], round(hits / total, 4))
+    return [gauge]
+
+
+def stage_totals() -> dict[tuple[str, str], tuple[float, float]]:
+    """``(stage, outcome)`` -> (seconds, count) from ``STAGE_SECONDS``."""
+    families = registry.collect()
+    totals: dict[tuple[str, str], list[float]] = {}
+    for index, suffix in enumerate(("_sum", "_count")):
+        name = f"intelliblogger_stage_duration_seconds{suffix}"
+        for sample in _samples(families, name):
+            key = (sample.labels["stage"], sample.labels["outcome"])
+            totals.setdefault(key, [0.0, 0.0])[index] += sample.value
+    return {key: (total, count) for key, (total, count) in totals.items()}
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return 0
+
+
+def record_cache(cache_name: str, result: Union[bool, str], value: Any = None) -> None:
+    """Counts one lookup; ``result`` is a hit flag or "hit"/"db_hit"/"miss"."""
+    if isinstance(result, bool):
+        result = "hit" if result else "miss"
+    CACHE_LOOKUPS.labels(cache=cache_name, result=result).inc()
+    if result != "miss" and value is not None:
+        CACHE_BYTES.labels(cache=cache_name).inc(_size(value))
+
+
+def record_bytes(kind: str, value: Union[int, str, bytes]) -> None:
+    amount = value if isinstance(value, int) else _size(value)
+    PAYLOAD_BYTES.labels(kind=kind).inc(amount)
+
+
+class timed:
+    """Times a block or a function as ``stage`` and logs the result at DEBUG.
+
+    Works as ``with timed("oembed"):`` and as a decorator on plain or async
+    functions. The duration goes to ``intelliblogger_stage_duration_seconds``
+    with outcome "ok" or "error"; ``fields`` only go to the log record.
+    """
+
+    def __init__(self, stage: str, **fields: Any):
+        self.stage = stage
+        self.fields = fields
+        self._started: Optional[float] = None
+
+    def __enter__(self) -> "timed":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        elapsed = time.perf_counter() - self._started
+        outcome = "ok" if exc_type is None else "error"
+        STAGE_SECONDS.labels(stage=self.stage, outcome=outcome).observe(elapsed)
+        logger.debug(
+            "%s %s in %.1f ms",
+            self.stage,
+            outcome,
+            elapsed * 1000,
+            extra={
+                "stage": self.stage,
+                "outcome": outcome,
+                "duration_ms": round(elapsed * 1000, 1),
+                **self.fields,
+            },
+        )
+
+    def __call__(self, func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timed(self.stage, **self.fields):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(self.stage, **self.fields):
+                return func(*args, **kwargs)
+
+        return wrapper
@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+from django.conf import settings
+from django.db import connections
+
+from .blog_generation import (
+    OUTLINE_PROMPT_VERSION,
+    PROMPT_TEMPLATE_VERSION,
+    BlogGenerator,
+    GenerationMode,
+)
+from .generation_cache import GenerationCache
+from .metrics import timed
+from .singleflight import SingleFlight
+from .transcript_sources import TranscriptSourceChain
+from .transcript_store import TranscriptStore
+from .youtube import YouTubeMetadataFetcher, YouTubeUrl
+
+StageCallback = Callable[[str], None]
+
+# Shared by every pipeline in the process so concurrent requests for the same
+# video download and transcribe it only once.
+transcript_flight = SingleFlight("transcript")
+outline_flight = SingleFlight("outline")
+
+# oEmbed lookups run here while the calling thread acquires the transcript.
+_metadata_executor = ThreadPoolExecutor(
+    max_workers=8, thread_name_prefix="youtube-metadata"
+)
+
+
+class BlogGenerationPipeline:
+    """Runs the download -> transcribe -> generate stages for one video.
+
+    ``on_stage`` is called with the name of each stage as it starts so callers
+    (job workers, streaming views) can report progress. In outline mode the
+    article is written from the video's stored outline, which is built (stage
+    ``outlining``) only the first time any variant of the video is generated.
+    """
+
+    def __init__(
+        self,
+        on_stage: Optional[StageCallback] = None,
+        model_name: str = BlogGenerator.DEFAULT_MODEL_NAME,
+        generator: Optional[BlogGenerator] = None,
+        mode: Optional[str] = None,
+    ):
+        self.on_stage = on_stage
+        self._current_stage: Optional[str] = None
+        self.model_name = model_name
+        self.mode = mode or settings.BLOG_GENERATION_MODE
+        self._generator = generator
+        # Both modes produce different articles for the same inputs.
+        self.generation_cache = GenerationCache(
+            prompt_version=f"{PROMPT_TEMPLATE_VERSION}:{self.mode}"
+        )
+        self.transcript_store = TranscriptStore()
+
+    def generator(self) -> BlogGenerator:
+        if self._generator is None:
+            self._generator = BlogGenerator(model_name=self.model_name)
+        return self._generator
+
+    def _stage(self, name: str) -> None:
+        # "generating" is re-announced after an "outlining" detour only.
+        if self.on_stage and name != self._current_stage:
+            self.on_stage(name)
+        self._current_stage = name
+
+    def cached_result(
+        self, *, link: str, video_id: str, tone: str, length: str
+    ) -> Optional[dict]:
+        """Returns the payload if no download or Gemini call is needed, else None."""
+        transcription = self.transcript_store.get(video_id)
+        if not transcription:
+            return None
+        article = self.generation_cache.get(
+            transcript=transcription,
+            tone=tone,
+            length=length,
+            model_name=self.model_name,
+        )
+        if not article:
+            return None
+        title = YouTubeMetadataFetcher().get_title(link).title
+        return self._payload(article=article, title=title, tone=tone, length=length)
+
+    def get_transcript(self, *, link: str, video_id: str) -> str:
+        transcription = self.transcript_store.get(video_id)
+        if not transcription:
+            transcription = transcript_flight.do(
+                video_id,
+                compute=lambda: self._transcribe(link, video_id),
+                lookup=lambda: self.transcript_store.get(video_id),
+            )
+        return transcription
+
+    def _transcribe(self, link: str, video_id: str) -> str:
+        result = TranscriptSourceChain(on_stage=self._stage).fetch(link)
+        self.transcript_store.put(
+            video_id=video_id,
+            youtube_link=YouTubeUrl.normalize(link),
+            text=result.text,
+            source=result.source,
+        )
+        return result.text
+
+    @property
+    def outline_version(self) -> str:
+        return f"{self.model_name}:{OUTLINE_PROMPT_VERSION}"
+
+    def get_outline(self, *, video_id: str, transcription: str) -> Optional[str]:
+        """The video's outline in outline mode (built once, then stored), else None."""
+        if self.mode != GenerationMode.OUTLINE:
+            return None
+        version = self.outline_version
+        outline = self.transcript_store.get_outline(video_id, version)
+        if not outline:
+            outline = outline_flight.do(
+                f"{video_id}:{version}",
+                compute=lambda: self._build_outline(video_id, transcription),
+                lookup=lambda: self.transcript_store.get_outline(video_id, version),
+            )
+        return outline
+
+    def _build_outline(self, video_id: str, transcription: str) -> str:
+        self._stage("outlining")
+        outline = self.generator().build_outline(transcription)
+        self.transcript_store.put_outline(
+            video_id=video_id, outline=outline, version=self.outline_version
+        )
+        return outline
+
+    @timed("pipeline")
+    def run(
+        self,
+        *,
+        link: str,
+        video_id: str,
+        tone: str,
+        length: str,
+        on_chunk: Optional[Callable[[str], None]] = None,
+    ) -> dict:
+        """Returns the final payload.
+
+        The title is fetched alongside transcript acquisition since neither
+        depends on the other. With ``on_chunk`` the article is streamed from
+        Gemini and each raw markdown chunk is passed to the callback.
+        """
+        title_future = _metadata_executor.submit(
+            YouTubeMetadataFetcher().get_title, link
+        )
+        transcription = self.get_transcript(link=link, video_id=video_id)
+        title = title_future.result().title
+
+        self._stage("generating")
+        cache_params = {
+            "transcript": transcription,
+            "tone": tone,
+            "length": length,
+            "model_name": self.model_name,
+        }
+        article = self.generation_cache.get(**cache_params)
+        if not article:
+            outline = self.get_outline(video_id=video_id, transcription=transcription)
+            self._stage("generating")
+            if on_chunk is None:
+                markdown_text = self.generator().markdown_from_transcript(
+                    transcription=transcription,
+                    tone=tone,
+                    length=length,
+                    outline=outline,
+                )
+            else:
+                parts = []
+                for text in self.generator().stream_from_transcript(
+                    transcription=transcription,
+                    tone=tone,
+                    length=length,
+                    outline=outline,
+                ):
+                    parts.append(text)
+                    on_chunk(text)
+                markdown_text = "".join(parts)
+            article = self._article(markdown_text)
+            self.generation_cache.set(article=article, **cache_params)
+        return self._payload(article=article, title=title, tone=tone, length=length)
+
+    async def aget_transcript(self, *, link: str, video_id: str) -> str:
+        transcription = await self.transcript_store.aget(video_id)
+        if not transcription:
+            transcription = await transcript_flight.ado(
+                video_id,
+                compute=lambda: self._atranscribe(link, video_id),
+                lookup=lambda: self.transcript_store.aget(video_id),
+            )
+        return transcription
+
+    async def _atranscribe(self, link: str, video_id: str) -> str:
+        result = await TranscriptSourceChain(on_stage=self._stage).afetch(link)
+        await self.transcript_store.aput(
+            video_id=video_id,
+            youtube_link=YouTubeUrl.normalize(link),
+            text=result.text,
+            source=result.source,
+        )
+        return result.text
+
+    async def aget_outline(self, *, video_id: str, transcription: str) -> Optional[str]:
+        if self.mode != GenerationMode.OUTLINE:
+            return None
+        version = self.outline_version
+        outline = await self.transcript_store.aget_outline(video_id, version)
+        if not outline:
+            outline = await outline_flight.ado(
+                f"{video_id}:{version}",
+                compute=lambda: self._abuild_outline(video_id, transcription),
+                lookup=lambda: self.transcript_store.aget_outline(video_id, version),
+            )
+        return outline
+
+    async def _abuild_outline(self, video_id: str, transcription: str) -> str:
+        self._stage("outlining")
+        outline = await self.generator().abuild_outline(transcription)
+        await self.transcript_store.aput_outline(
+            video_id=video_id, outline=outline, version=self.outline_version
+        )
+        return outline
+
+    @timed("pipeline")
+    async def arun(
+        self,
+        *,
+        link: str,
+        video_id: str,
+        tone: str,
+        length: str,
+        on_chunk: Optional[Callable[[str], None]] = None,
+    ) -> dict:
+        """Async counterpart of ``run`` built on the services' native async APIs."""
+        transcription, metadata = await asyncio.gather(
+            self.aget_transcript(link=link, video_id=video_id),
+            YouTubeMetadataFetcher().aget_title(link),
+        )
+        title = metadata.title
+
+        self._stage("generating")
+        cache_params = {
+            "transcript": transcription,
+            "tone": tone,
+            "length": length,
+            "model_name": self.model_name,
+        }
+        article = await self.generation_cache.aget(**cache_params)
+        if not article:
+            outline = await self.aget_outline(
+                video_id=video_id, transcription=transcription
+            )
+            self._stage("generating")
+            if on_chunk is None:
+                markdown_text = await self.generator().amarkdown_from_transcript(
+                    transcription=transcription,
+                    tone=tone,
+                    length=length,
+                    outline=outline,
+                )
+            else:
+                parts = []
+                async for text in self.generator().astream_from_transcript(
+                    transcription=transcription,
+                    tone=tone,
+                    length=length,
+                    outline=outline,
+                ):
+                    parts.append(text)
+                    on_chunk(text)
+                markdown_text = "".join(parts)
+            article = self._article(markdown_text)
+            await self.generation_cache.aset(article=article, **cache_params)
+        return self._payload(article=article, title=title, tone=tone, length=length)
+
+    async def astream(
+        self, *, link: str, video_id: str, tone: str, length: str
+    ) -> AsyncIterator[tuple[str, dict]]:
+        """Runs ``arun`` and yields ``(event, data)`` pairs as it goes.
+
+        Events are ``stage`` (progress), ``chunk`` (raw markdown as Gemini
+        writes it), then a final ``done`` with the rendered payload or
+        ``error``.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        self.on_stage = lambda stage: events.put_nowait(("stage", {"stage": stage}))
+
+        async def produce():
+            try:
+                payload = await self.arun(
+                    link=link,
+                    video_id=video_id,
+                    tone=tone,
+                    length=length,
+                    on_chunk=lambda text: events.put_nowait(("chunk", {"text": text})),
+                )
+                events.put_nowait(("done", payload))
+            except Exception as e:
+                events.put_nowait(("error", {"detail": f"Generation failed: {str(e)}"}))
+            finally:
+                events.put_nowait(None)
+
+        # Not cancelled if the client disconnects: other requests may be waiting
+        # on the same single-flight transcript, and the caches still get filled.
+        task = asyncio.ensure_future(produce())
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            yield event
+        await task
+
+    def stream(
+        self, *, link: str, video_id: str, tone: str, length: str
+    ) -> Iterator[tuple[str, dict]]:
+        """Blocking counterpart of ``astream`` for WSGI servers.
+
+        ``run`` works on a separate thread so events can be yielded (and sent)
+        while it is still going.
+        """
+        events: queue.Queue = queue.Queue()
+        self.on_stage = lambda stage: events.put(("stage", {"stage": stage}))
+
+        def produce():
+            try:
+                payload = self.run(
+                    link=link,
+                    video_id=video_id,
+                    tone=tone,
+                    length=length,
+                    on_chunk=lambda text: events.put(("chunk", {"text": text})),
+                )
+                events.put(("done", payload))
+            except Exception as e:
+                events.put(("error", {"detail": f"Generation failed: {str(e)}"}))
+            finally:
+                connections.close_all()
+                events.put(None)
+
+        # Runs to completion even if the client goes away, as in ``astream``.
+        threading.Thread(target=produce, name="generation-stream", daemon=True).start()
+        while (event := events.get()) is not None:
+            yield event
+
+    @staticmethod
+    def _article(markdown_text: str) -> dict:
+        """Rendered once here; the cache and the saved post reuse the HTML."""
+        return {"markdown": markdown_text, "html": BlogGenerator.render(markdown_text)}
+
+    @staticmethod
+    def _payload(*, article: dict, title: str, tone: str, length: str) -> dict:
+        return {
+            "content": article["html"],
+            "markdown": article["markdown"],
+            "title": title,
+            "tone": tone,
+            "length": length,
+        }
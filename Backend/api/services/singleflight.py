@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Collapses concurrent calls for the same key into a single execution.
+
+    Inside one process, callers that arrive while a key is in flight wait on
+    the leader's result instead of running ``compute`` themselves. Across
+    processes the leader also holds a Redis lock (when the cache backend
+    provides ``cache.lock``); whoever gets the lock next runs ``lookup`` first
+    and only computes if the previous holder left nothing behind.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        lock_timeout: Optional[int] = None,
+        wait_timeout: Optional[int] = None,
+    ):
+        self.namespace = namespace
+        self.lock_timeout = lock_timeout or settings.SINGLE_FLIGHT_LOCK_TIMEOUT
+        self.wait_timeout = wait_timeout or settings.SINGLE_FLIGHT_WAIT_TIMEOUT
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+
+    def do(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        lookup: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        future, leader = self._join(key)
+        if not leader:
+            return future.result(timeout=self.wait_timeout)
+
+        try:
+            lock, acquired = self._acquire(key)
+            try:
+                cached = lookup() if acquired and lookup is not None else None
+                result = cached or compute()
+            finally:
+                self._release(key, lock, acquired)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._leave(key)
+
+    async def ado(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        lookup: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        """Async counterpart of ``do``; shares in-flight work with sync callers."""
+        future, leader = self._join(key)
+        if not leader:
+            # shield() so a disconnecting follower does not cancel the shared future.
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), self.wait_timeout
+            )
+
+        try:
+            lock, acquired = await sync_to_async(self._acquire, thread_sensitive=False)(
+                key
+            )
+            try:
+                cached = await lookup() if acquired and lookup is not None else None
+                result = cached or await compute()
+            finally:
+                await sync_to_async(self._release, thread_sensitive=False)(
+                    key, lock, acquired
+                )
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._leave(key)
+
+    def _join(self, key: str) -> tuple[Future, bool]:
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _leave(self, key: str) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def _acquire(self, key: str) -> tuple[Any, bool]:
+        if not hasattr(cache, "lock"):
+            return None, False
+
+        # thread_local=False: async callers may release from another thread.
+        lock = cache.lock(
+            f"singleflight:{self.namespace}:{key}",
+            timeout=self.lock_timeout,
+            blocking_timeout=self.wait_timeout,
+            thread_local=False,
+        )
+        try:
+            return lock, lock.acquire()
+        except Exception as e:
+            # Redis being unavailable must not block generation; fall back to
+            # the in-process deduplication only.
+            logger.warning("Single-flight lock for %s unavailable: %s", key, e)
+            return lock, False
+
+    def _release(self, key: str, lock: Any, acquired: bool) -> None:
+        if not acquired:
+            return
+        try:
+            lock.release()
+        except Exception as e:
+            logger.warning("Single-flight lock for %s not released: %s", key, e)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ..utils.text import iter_sentences
+from .metrics import record_cache, timed
+
+SUMMARY_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+SUMMARY_PROMPT_TEMPLATE = (
+    "You are helping to write a blog article from a long YouTube video.\n\n"
+    "Below is part {index} of {total} of the video's transcript. Write dense, "
+    "factual notes on this part as a markdown bullet list: the main points, "
+    "arguments, examples, names and numbers, in the order they appear. "
+    "Do not add an introduction or a conclusion and do not invent anything.\n\n"
+    "Transcript part:\n{chunk}\n\n"
+    "Notes:"
+)
+
+SUMMARY_PROMPT_VERSION = hashlib.sha256(
+    SUMMARY_PROMPT_TEMPLATE.encode("utf-8")
+).hexdigest()[:12]
+
+
+def chunk_transcript(transcription: str, max_chars: int) -> list[str]:
+    """Groups whole sentences into chunks of at most ``max_chars`` characters.
+
+    Sentences longer than ``max_chars`` (unpunctuated captions) are cut at
+    whitespace first.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for sentence in iter_sentences(transcription, max_length=max_chars):
+        if current and size + len(sentence) + 1 > max_chars:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        current.append(sentence)
+        size += len(sentence) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+class TranscriptSummarizer:
+    """Map step of map-reduce generation: per-chunk notes for a long transcript.
+
+    Chunks are summarized in parallel (``BLOG_SUMMARY_WORKERS`` at a time) and
+    each summary is cached by transcript hash, chunk index and model, so
+    generating the same video in another tone or length only pays for the
+    final compose call.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        model_name: str,
+        chunk_chars: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.model = model
+        self.model_name = model_name
+        self.chunk_chars = chunk_chars or settings.BLOG_SUMMARY_CHUNK_CHARS
+        self.max_workers = max_workers or settings.BLOG_SUMMARY_WORKERS
+
+    @staticmethod
+    def transcript_hash(transcription: str) -> str:
+        return hashlib.sha256(transcription.encode("utf-8")).hexdigest()
+
+    def cache_key(self, transcript_hash: str, index: int) -> str:
+        return (
+            f"transcript_summary:{SUMMARY_PROMPT_VERSION}:{self.model_name}:"
+            f"{self.chunk_chars}:{transcript_hash}:{index}"
+        )
+
+    @staticmethod
+    def build_prompt(chunk: str, index: int, total: int) -> str:
+        return SUMMARY_PROMPT_TEMPLATE.format(index=index + 1, total=total, chunk=chunk)
+
+    @staticmethod
+    def join(summaries: list[str]) -> str:
+        return "\n\n".join(
+            f"Part {index}:\n{summary.strip()}"
+            for index, summary in enumerate(summaries, start=1)
+        )
+
+    def _summarize_chunk(self, key: str, chunk: str, index: int, total: int) -> str:
+        summary = cache.get(key)
+        record_cache("transcript_summary", summary is not None, summary)
+        if summary is None:
+            response = self.model.generate_content(
+                self.build_prompt(chunk, index, total)
+            )
+            summary = response.text
+            if not summary:
+                raise RuntimeError(f"Failed to summarize transcript part {index + 1}.")
+            cache.set(key, summary, timeout=SUMMARY_CACHE_TIMEOUT)
+        return summary
+
+    @timed("summarize")
+    def summarize(self, transcription: str) -> str:
+        """Returns the notes for every chunk, in transcript order."""
+        digest = self.transcript_hash(transcription)
+        chunks = chunk_transcript(transcription, self.chunk_chars)
+        total = len(chunks)
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="summarize"
+        ) as pool:
+            futures = [
+                pool.submit(
+                    self._summarize_chunk,
+                    self.cache_key(digest, index),
+                    chunk,
+                    index,
+                    total,
+                )
+                for index, chunk in enumerate(chunks)
+            ]
+            return self.join([future.result() for future in futures])
+
+    @timed("summarize")
+    async def asummarize(self, transcription: str) -> str:
+        digest = self.transcript_hash(transcription)
+        chunks = chunk_transcript(transcription, self.chunk_chars)
+        total = len(chunks)
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def summarize_chunk(index: int, chunk: str) -> str:
+            key = self.cache_key(digest, index)
+            summary = await cache.aget(key)
+            record_cache("transcript_summary", summary is not None, summary)
+            if summary is not None:
+                return summary
+            async with semaphore:
+                response = await self.model.generate_content_async(
+                    self.build_prompt(chunk, index, total)
+                )
+            summary = response.text
+            if not summary:
+                raise RuntimeError(f"Failed to summarize transcript part {index + 1}.")
+            await cache.aset(key, summary, timeout=SUMMARY_CACHE_TIMEOUT)
+            return summary
+
+        summaries = await asyncio.gather(
+            *(summarize_chunk(index, chunk) for index, chunk in enumerate(chunks))
+        )
+        return self.join(list(summaries))
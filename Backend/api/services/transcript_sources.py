@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import asyncio
+import glob
+import logging
+import os
+import re
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from django.conf import settings
+
+from .chunked_transcription import ChunkedTranscriptionService
+from .media_store import MediaStore
+from .metrics import timed
+from .transcription import TranscriptionService
+from .youtube import AudioMode, YouTubeAudioDownloader, YouTubeUrl
+
+logger = logging.getLogger(__name__)
+
+StageCallback = Callable[[str], None]
+
+
+@dataclass
+class TranscriptResult:
+    text: str
+    source: str
+
+
+class TranscriptUnavailable(RuntimeError):
+    """Raised by a source that cannot produce a transcript for this video."""
+
+
+class TranscriptSource:
+    """One way of obtaining a transcript; ``name`` is stored as its source."""
+
+    name = ""
+
+    def fetch(self, link: str, on_stage: StageCallback) -> str:
+        raise NotImplementedError
+
+    async def afetch(self, link: str, on_stage: StageCallback) -> str:
+        raise NotImplementedError
+
+
+_VTT_TIMING = re.compile(r"^\d{2}:\d{2}(:\d{2})?\.\d{3} --> ")
+_VTT_TAG = re.compile(r"<[^>]+>")
+
+
+def vtt_to_text(vtt: str) -> str:
+    """Flattens WebVTT captions to plain text.
+
+    Auto-generated captions repeat each line while it scrolls, so consecutive
+    duplicates are collapsed.
+    """
+    lines: list[str] = []
+    in_header = True
+    for raw in vtt.splitlines():
+        line = raw.strip()
+        if in_header:
+            # Header block (WEBVTT, Kind:, Language:) ends at the first blank line.
+            in_header = bool(line)
+            continue
+        if not line or _VTT_TIMING.match(line) or line.isdigit():
+            continue
+        if line.startswith(("NOTE", "STYLE", "REGION")):
+            continue
+        text = _VTT_TAG.sub("", line).strip()
+        if text and (not lines or lines[-1] != text):
+            lines.append(text)
+    return " ".join(lines)
+
+
+class CaptionTranscriptSource(TranscriptSource):
+    """Uses the video's uploaded subtitles or auto-captions (no audio download)."""
+
+    name = "captions"
+
+    def __init__(self, languages: Optional[str] = None):
+        self.languages = languages or settings.TRANSCRIPT_CAPTION_LANGUAGES
+
+    def _command(self, link: str, output_dir: str) -> list[str]:
+        return [
+            "yt-dlp",
+            "--skip-download",
+            "--write-subs",
+            "--write-auto-subs",
+            "--sub-langs",
+            self.languages,
+            "--sub-format",
+            "vtt",
+            "-o",
+            os.path.join(output_dir, "%(id)s.%(ext)s"),
+            YouTubeUrl.normalize(link),
+        ]
+
+    @staticmethod
+    def _read_captions(output_dir: str) -> str:
+        # yt-dlp only writes auto-captions for a language without uploaded
+        # subtitles, so any file found is the best one for its language.
+        files = sorted(glob.glob(os.path.join(output_dir, "*.vtt")))
+        if not files:
+            raise TranscriptUnavailable("Video has no captions.")
+        with open(files[0], encoding="utf-8") as f:
+            text = vtt_to_text(f.read())
+        if not text:
+            raise TranscriptUnavailable("Captions are empty.")
+        return text
+
+    @timed("fetch_captions")
+    def fetch(self, link: str, on_stage: StageCallback) -> str:
+        on_stage("fetching_captions")
+        with tempfile.TemporaryDirectory(prefix="captions-") as output_dir:
+            result = subprocess.run(
+                self._command(link, output_dir),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            if result.returncode != 0:
+                raise TranscriptUnavailable(
+                    f"yt-dlp failed (code {result.returncode}): {result.stderr[:400]}"
+                )
+            return self._read_captions(output_dir)
+
+    @timed("fetch_captions")
+    async def afetch(self, link: str, on_stage: StageCallback) -> str:
+        on_stage("fetching_captions")
+        with tempfile.TemporaryDirectory(prefix="captions-") as output_dir:
+            process = await asyncio.create_subprocess_exec(
+                *self._command(link, output_dir),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, stderr = await process.communicate()
+            if process.returncode != 0:
+                raise TranscriptUnavailable(
+                    f"yt-dlp failed (code {process.returncode}): "
+                    f"{stderr.decode(errors='replace')[:400]}"
+                )
+            return self._read_captions(output_dir)
+
+
+class AudioTranscriptSource(TranscriptSource):
+    """Downloads the audio track and transcribes it with AssemblyAI.
+
+    ``settings.AUDIO_DOWNLOAD_MODE`` picks the container and whether yt-dlp's
+    output is piped straight into the upload instead of going through a file.
+    Downloaded files longer than ``TRANSCRIPTION_CHUNK_THRESHOLD`` seconds are
+    transcribed in parallel chunks; piped audio is always sent whole.
+    """
+
+    name = "assemblyai"
+
+    def __init__(self, mode: Optional[str] = None):
+        self.mode = mode or settings.AUDIO_DOWNLOAD_MODE
+
+    def fetch(self, link: str, on_stage: StageCallback) -> str:
+        if self.mode == AudioMode.PIPE:
+            on_stage("transcribing")
+            with YouTubeAudioDownloader().stream_audio(link) as audio:
+                text, _ = TranscriptionService().transcribe_stream(audio)
+            return text
+        on_stage("downloading")
+        audio_path = YouTubeAudioDownloader().download_audio(link, mode=self.mode)
+        on_stage("transcribing")
+        service = TranscriptionService()
+        chunked = ChunkedTranscriptionService(transcriber=service)
+        # Other requests' downloads sweep the media directory.
+        with MediaStore().in_use(audio_path):
+            if chunked.should_chunk(audio_path):
+                text = chunked.transcribe_file(
+                    audio_path, self._cache_id(audio_path)
+                ).text
+            else:
+                text = service.transcribe_file(audio_path)
+        self._discard(link)
+        return text
+
+    async def afetch(self, link: str, on_stage: StageCallback) -> str:
+        if self.mode == AudioMode.PIPE:
+            # Popen + a chunked upload are both blocking; keep them off the loop.
+            # Stages reported from the worker thread are handed back to the
+            # loop: callers' callbacks (e.g. asyncio.Queue.put_nowait in
+            # BlogGenerationPipeline.astream) are not thread-safe.
+            loop = asyncio.get_running_loop()
+            return await asyncio.to_thread(
+                self.fetch,
+                link,
+                lambda stage: loop.call_soon_threadsafe(on_stage, stage),
+            )
+        on_stage("downloading")
+        audio_path = await YouTubeAudioDownloader().adownload_audio(
+            link, mode=self.mode
+        )
+        on_stage("transcribing")
+        service = TranscriptionService()
+        chunked = ChunkedTranscriptionService(transcriber=service)
+        with MediaStore().in_use(audio_path):
+            if await asyncio.to_thread(chunked.should_chunk, audio_path):
+                result = await asyncio.to_thread(
+                    chunked.transcribe_file, audio_path, self._cache_id(audio_path)
+                )
+                text = result.text
+            else:
+                text = await service.atranscribe_file(audio_path)
+        self._discard(link)
+        return text
+
+    @staticmethod
+    def _cache_id(audio_path: str) -> str:
+        # Media files are named by video id and mode (see MediaStore).
+        return os.path.splitext(os.path.basename(audio_path))[0]
+
+    @staticmethod
+    def _discard(link: str) -> None:
+        # Only after success: a failed transcription keeps the file for a retry.
+        if settings.MEDIA_DELETE_AFTER_TRANSCRIPTION:
+            MediaStore().remove(YouTubeUrl.video_id(link))
+
+
+def default_sources() -> list[TranscriptSource]:
+    sources: list[TranscriptSource] = []
+    if settings.TRANSCRIPT_CAPTIONS_ENABLED:
+        sources.append(CaptionTranscriptSource())
+    sources.append(AudioTranscriptSource())
+    return sources
+
+
+class TranscriptSourceChain:
+    """Tries each source in order and returns the first transcript produced.
+
+    A source that raises ``TranscriptUnavailable`` (or fails outright, for any
+    source but the last) hands over to the next one.
+    """
+
+    def __init__(
+        self,
+        sources: Optional[list[TranscriptSource]] = None,
+        on_stage: Optional[StageCallback] = None,
+    ):
+        self.sources = sources if sources is not None else default_sources()
+        self.on_stage = on_stage or (lambda stage: None)
+
+    def fetch(self, link: str) -> TranscriptResult:
+        for index, source in enumerate(self.sources):
+            try:
+                return TranscriptResult(
+                    text=source.fetch(link, self.on_stage), source=source.name
+                )
+            except Exception as e:
+                self._fall_through(source, index, e)
+        raise TranscriptUnavailable("No transcript source is configured.")
+
+    async def afetch(self, link: str) -> TranscriptResult:
+        for index, source in enumerate(self.sources):
+            try:
+                return TranscriptResult(
+                    text=await source.afetch(link, self.on_stage), source=source.name
+                )
+            except Exception as e:
+                self._fall_through(source, index, e)
+        raise TranscriptUnavailable("No transcript source is configured.")
+
+    def _fall_through(self, source: TranscriptSource, index: int, error: Exception):
+        if index == len(self.sources) - 1:
+            raise error
+        logger.info("Transcript source %s skipped: %s", source.name, error)
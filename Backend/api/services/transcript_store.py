@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
+from api.repositories.transcript_repo import TranscriptRepository
+
+from .metrics import record_cache
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class TranscriptStore:
+    """Tiered transcript lookup: Redis, then the database, then a recompute.
+
+    Database hits are written back to the cache so the next lookup stays in
+    Redis. Callers only recompute (download + transcribe) when ``get`` returns
+    None, and then hand the result to ``put``. Outlines are stored the same
+    way, per ``version``.
+    """
+
+    def __init__(self, repo: Optional[TranscriptRepository] = None):
+        self.repo = repo or TranscriptRepository()
+
+    @staticmethod
+    def cache_key(video_id: str) -> str:
+        return f"youtube_transcript:{video_id}"
+
+    def get_cached(self, video_id: str) -> Optional[str]:
+        return cache.get(self.cache_key(video_id))
+
+    def get(self, video_id: str) -> Optional[str]:
+        text = self.get_cached(video_id)
+        if text:
+            record_cache("transcript", "hit", text)
+            return text
+        text = self.repo.get_text(video_id)
+        record_cache("transcript", "db_hit" if text else "miss", text)
+        if text:
+            cache.set(self.cache_key(video_id), text, timeout=CACHE_TIMEOUT)
+        return text
+
+    def put(self, *, video_id: str, youtube_link: str, text: str, source: str) -> None:
+        self.repo.save(
+            video_id=video_id, youtube_link=youtube_link, text=text, source=source
+        )
+        cache.set(self.cache_key(video_id), text, timeout=CACHE_TIMEOUT)
+
+    async def aget(self, video_id: str) -> Optional[str]:
+        return await sync_to_async(self.get)(video_id)
+
+    async def aput(
+        self, *, video_id: str, youtube_link: str, text: str, source: str
+    ) -> None:
+        await sync_to_async(self.put)(
+            video_id=video_id, youtube_link=youtube_link, text=text, source=source
+        )
+
+    @staticmethod
+    def outline_cache_key(video_id: str, version: str) -> str:
+        return f"youtube_outline:{video_id}:{version}"
+
+    def get_outline(self, video_id: str, version: str) -> Optional[str]:
+        key = self.outline_cache_key(video_id, version)
+        outline = cache.get(key)
+        if outline:
+            record_cache("outline", "hit", outline)
+            return outline
+        outline = self.repo.get_outline(video_id, version)
+        record_cache("outline", "db_hit" if outline else "miss", outline)
+        if outline:
+            cache.set(key, outline, timeout=CACHE_TIMEOUT)
+        return outline
+
+    def put_outline(self, *, video_id: str, outline: str, version: str) -> None:
+        self.repo.save_outline(video_id, outline, version)
+        cache.set(
+            self.outline_cache_key(video_id, version), outline, timeout=CACHE_TIMEOUT
+        )
+
+    async def aget_outline(self, video_id: str, version: str) -> Optional[str]:
+        return await sync_to_async(self.get_outline)(video_id, version)
+
+    async def aput_outline(self, *, video_id: str, outline: str, version: str) -> None:
+        await sync_to_async(self.put_outline)(
+            video_id=video_id, outline=outline, version=version
+        )
@@ -1,24 +1,108 @@
 from __future__ import annotations
 
+import asyncio
 import os
-from typing import Optional
+from dataclasses import dataclass
+from typing import IO, Optional
 
-import assemblyai as aai
 from dotenv import load_dotenv
 
+from .clients import assemblyai_transcriber, http_session, http_timeout
+from .metrics import record_bytes, timed
+
 load_dotenv()
 
+# Words ending with one of these close a sentence segment.
+_SENTENCE_ENDINGS = (".", "?", "!")
+
+
+@dataclass
+class TranscriptSegment:
+    start: float
+    end: float
+    text: str
+
+
+def sentence_segments(words) -> list[TranscriptSegment]:
+    """Groups the SDK's timed words (milliseconds) into sentences (seconds)."""
+    segments, current = [], []
+    for word in words:
+        current.append(word)
+        if word.text.endswith(_SENTENCE_ENDINGS):
+            segments.append(current)
+            current = []
+    if current:
+        segments.append(current)
+    return [
+        TranscriptSegment(
+            start=group[0].start / 1000,
+            end=group[-1].end / 1000,
+            text=" ".join(word.text for word in group),
+        )
+        for group in segments
+    ]
+
 
 class TranscriptionService:
+    UPLOAD_URL = "https://api.assemblyai.com/v2/upload"
+    UPLOAD_CHUNK_SIZE = 256 * 1024
+
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv("ASSEMBLY_API_KEY")
-        if not self.api_key:
-            raise RuntimeError("ASSEMBLY_API_KEY is not configured.")
-        aai.settings.api_key = self.api_key
-        self._transcriber = aai.Transcriber()
+        # Process-wide transcriber; raises if no API key is configured.
+        self._transcriber = assemblyai_transcriber(self.api_key)
 
+    @timed("transcribe")
     def transcribe_file(self, audio_path: str) -> str:
         transcript = self._transcriber.transcribe(audio_path)
         if not transcript or not getattr(transcript, "text", None):
             raise RuntimeError("Failed to transcribe audio.")
         return transcript.text
+
+    @timed("transcribe")
+    def transcribe_segments(self, audio_path: str) -> list[TranscriptSegment]:
+        """Sentences with their start/end offsets into the audio, in seconds."""
+        transcript = self._transcriber.transcribe(audio_path)
+        if not transcript or not getattr(transcript, "text", None):
+            raise RuntimeError("Failed to transcribe audio.")
+        if not transcript.words:
+            duration = float(transcript.audio_duration or 0)
+            return [TranscriptSegment(start=0.0, end=duration, text=transcript.text)]
+        return sentence_segments(transcript.words)
+
+    @timed("transcribe")
+    async def atranscribe_file(self, audio_path: str) -> str:
+        # The SDK runs the upload + polling on its own executor; awaiting the
+        # future keeps the event loop free meanwhile.
+        transcript = await asyncio.wrap_future(
+            self._transcriber.transcribe_async(audio_path)
+        )
+        if not transcript or not getattr(transcript, "text", None):
+            raise RuntimeError("Failed to transcribe audio.")
+        return transcript.text
+
+    def transcribe_stream(self, stream: IO[bytes]) -> tuple[str, int]:
+        """Uploads audio straight from ``stream`` (chunked) and transcribes it.
+
+        Returns the transcript text and the number of bytes uploaded.
+        """
+        if not self.api_key:
+            raise RuntimeError("ASSEMBLY_API_KEY is not configured.")
+        uploaded = 0
+
+        def chunks():
+            nonlocal uploaded
+            while chunk := stream.read(self.UPLOAD_CHUNK_SIZE):
+                uploaded += len(chunk)
+                yield chunk
+
+        with timed("upload_audio"):
+            resp = http_session().post(
+                self.UPLOAD_URL,
+                headers={"authorization": self.api_key},
+                data=chunks(),
+                timeout=http_timeout(),
+            )
+            resp.raise_for_status()
+        record_bytes("audio_uploaded", uploaded)
+        return self.transcribe_file(resp.json()["upload_url"]), uploaded
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+import glob
+import json
+import logging
 import os
 import subprocess
+import tempfile
 
 # import sys
 import uuid
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Optional
+from typing import IO, Iterator, Optional
 from urllib.parse import parse_qs, urlparse
 
-import requests
 from django.conf import settings
+from django.core.cache import cache
+
+from .clients import async_http_client, http_session, http_timeout
+from .media_store import PARTIAL_SUFFIXES, MediaStore
+from .metrics import record_bytes, record_cache, timed
+
+logger = logging.getLogger(__name__)
 
 
 class YouTubeUrl:
@@ -32,6 +44,12 @@ class YouTubeUrl:
 
         return link
 
+    @staticmethod
+    def video_id(link: str) -> str:
+        """Returns the ``v`` parameter of the normalized link, or "" if absent."""
+        query = parse_qs(urlparse(YouTubeUrl.normalize(link)).query)
+        return query.get("v", [""])[0]
+
 
 @dataclass
 class YouTubeMetadata:
@@ -39,58 +57,312 @@ class YouTubeMetadata:
 
 
 class YouTubeMetadataFetcher:
-    """Fetches video metadata via YouTube oEmbed (no API key required)."""
+    """Fetches video metadata via YouTube oEmbed (no API key required).
+
+    Titles are cached per video id, so repeat generations skip the round trip.
+    """
 
     OEMBED_URL = "https://www.youtube.com/oembed"
+    CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+    @staticmethod
+    def cache_key(link: str) -> str:
+        return f"youtube_title:{YouTubeUrl.video_id(link)}"
 
     def get_title(self, link: str) -> YouTubeMetadata:
-        url = YouTubeUrl.normalize(link)
-        resp = requests.get(
-            self.OEMBED_URL, params={"url": url, "format": "json"}, timeout=20
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        return YouTubeMetadata(title=data.get("title", "Unknown Title"))
+        title = cache.get(self.cache_key(link))
+        record_cache("youtube_title", title is not None, title)
+        if title is None:
+            url = YouTubeUrl.normalize(link)
+            with timed("oembed"):
+                resp = http_session().get(
+                    self.OEMBED_URL,
+                    params={"url": url, "format": "json"},
+                    timeout=http_timeout(),
+                )
+                resp.raise_for_status()
+            data = resp.json()
+            title = data.get("title", "Unknown Title")
+            cache.set(self.cache_key(link), title, timeout=self.CACHE_TIMEOUT)
+        return YouTubeMetadata(title=title)
+
+    async def aget_title(self, link: str) -> YouTubeMetadata:
+        title = await cache.aget(self.cache_key(link))
+        record_cache("youtube_title", title is not None, title)
+        if title is None:
+            url = YouTubeUrl.normalize(link)
+            with timed("oembed"):
+                resp = await async_http_client().get(
+                    self.OEMBED_URL, params={"url": url, "format": "json"}
+                )
+                resp.raise_for_status()
+            data = resp.json()
+            title = data.get("title", "Unknown Title")
+            await cache.aset(self.cache_key(link), title, timeout=self.CACHE_TIMEOUT)
+        return YouTubeMetadata(title=title)
+
+
+class PlaylistError(RuntimeError):
+    pass
+
+
+@dataclass
+class PlaylistEntry:
+    video_id: str
+    link: str
+    title: Optional[str]
+
+
+# Placeholders yt-dlp lists for entries that cannot be played.
+UNAVAILABLE_TITLES = ("[Private video]", "[Deleted video]")
+
+
+class YouTubePlaylist:
+    """Lists a playlist's videos with ``yt-dlp --flat-playlist`` (no downloads).
+
+    Entry titles are written to the oEmbed title cache, so generating the
+    videos afterwards skips that lookup.
+    """
+
+    @staticmethod
+    def playlist_id(link: str) -> str:
+        return parse_qs(urlparse(link).query).get("list", [""])[0]
+
+    @staticmethod
+    def _command(link: str, limit: Optional[int] = None) -> list[str]:
+        command = ["yt-dlp", "--flat-playlist", "-J"]
+        if limit:
+            command += ["--playlist-end", str(limit)]
+        return command + [link]
+
+    def entries(self, link: str, limit: Optional[int] = None) -> list[PlaylistEntry]:
+        try:
+            with timed("expand_playlist"):
+                result = subprocess.run(
+                    self._command(link, limit),
+                    check=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                )
+        except subprocess.CalledProcessError as e:
+            logger.warning(
+                "yt-dlp failed (code %s): %s",
+                e.returncode,
+                e.stderr,
+                extra={"returncode": e.returncode, "link": link},
+            )
+            raise PlaylistError(
+                f"yt-dlp failed (code {e.returncode}): {e.stderr[:400]}"
+            )
+        try:
+            data = json.loads(result.stdout)
+        except ValueError:
+            raise PlaylistError("yt-dlp returned no playlist data.")
+
+        entries = []
+        for item in data.get("entries") or []:
+            video_id = item.get("id")
+            if not video_id or item.get("ie_key", "Youtube") != "Youtube":
+                continue
+            if item.get("title") in UNAVAILABLE_TITLES:
+                continue
+            entry = PlaylistEntry(
+                video_id=video_id,
+                link=f"https://www.youtube.com/watch?v={video_id}",
+                title=item.get("title"),
+            )
+            if entry.title:
+                cache.set(
+                    YouTubeMetadataFetcher.cache_key(entry.link),
+                    entry.title,
+                    timeout=YouTubeMetadataFetcher.CACHE_TIMEOUT,
+                )
+            entries.append(entry)
+        return entries
 
 
 class AudioDownloadError(RuntimeError):
     pass
 
 
+class AudioMode:
+    """How yt-dlp hands audio to the transcriber (``settings.AUDIO_DOWNLOAD_MODE``).
+
+    MP3     re-encode to MP3 with ffmpeg (the original behaviour)
+    NATIVE  keep the source container (opus/webm or m4a); no re-encode
+    MONO    re-encode to 32 kbit/s mono opus: more CPU, smallest upload
+    PIPE    stream the native container from yt-dlp's stdout; no temp file
+    """
+
+    MP3 = "mp3"
+    NATIVE = "native"
+    MONO = "mono"
+    PIPE = "pipe"
+
+    FILE_MODES = (MP3, NATIVE, MONO)
+
+
 class YouTubeAudioDownloader:
-    """Downloads audio with yt-dlp as MP3 into MEDIA_ROOT and returns the file path."""
+    """Downloads audio with yt-dlp into MEDIA_ROOT and returns the file path.
+
+    Files are named by video id and mode through ``MediaStore``, so an audio
+    file left behind by a failed transcription is reused instead of downloaded
+    again, but only for the same mode.
+    """
+
+    NATIVE_FORMAT = "bestaudio[ext=webm]/bestaudio[ext=m4a]/bestaudio"
 
     def __init__(self, media_root: Optional[str] = None):
         self.media_root = media_root or settings.MEDIA_ROOT
+        self.store = MediaStore(self.media_root)
 
-    def download_mp3(self, link: str) -> str:
-        os.makedirs(self.media_root, exist_ok=True)
-        output_file = os.path.join(self.media_root, f"{uuid.uuid4().hex}.mp3")
-        try:
+    def _output_stem(self, link: str, mode: str) -> str:
+        video_id = YouTubeUrl.video_id(link) or uuid.uuid4().hex
+        return self.store.stem(f"{video_id}.{mode}")
+
+    def _finish(self, stem: str) -> str:
+        path = self._find_output(stem)
+        record_bytes("audio_downloaded", os.path.getsize(path))
+        self.store.sweep(keep=[path])
+        return path
+
+    def _reuse(self, link: str, mode: str) -> Optional[str]:
+        # Keyed by mode too: a MONO or MP3 request must not get a NATIVE file.
+        video_id = YouTubeUrl.video_id(link)
+        existing = self.store.find(f"{video_id}.{mode}") if video_id else None
+        record_cache("media", existing is not None)
+        return existing
+
+    @classmethod
+    def _command(cls, link: str, output: str, mode: str) -> list[str]:
+        command = ["yt-dlp", "-f", cls.NATIVE_FORMAT]
+        if mode == AudioMode.MP3:
             # -x extract audio; --audio-format mp3 ensures MP3 output
-            # -o <path> to write exactly to output_file
-            subprocess.run(
-                [
-                    "yt-dlp",
-                    "-x",
-                    "--audio-format",
-                    "mp3",
-                    "--ffmpeg-location",
-                    "C:/ffmpeg/bin",
-                    "-o",
-                    output_file,
-                    YouTubeUrl.normalize(link),
-                ],
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
+            command += ["-x", "--audio-format", "mp3"]
+        elif mode == AudioMode.MONO:
+            command += [
+                "-x",
+                "--audio-format",
+                "opus",
+                "--audio-quality",
+                "32K",
+                "--postprocessor-args",
+                "ExtractAudio+ffmpeg_o:-ac 1",
+            ]
+        elif mode not in (AudioMode.NATIVE, AudioMode.PIPE):
+            raise ValueError(f"Unknown audio mode: {mode}")
+        location = settings.FFMPEG_LOCATION
+        re_encodes = mode in (AudioMode.MP3, AudioMode.MONO)
+        # Like chunked_transcription.ffmpeg_tool: otherwise yt-dlp uses PATH.
+        if re_encodes and location and os.path.isdir(location):
+            command += ["--ffmpeg-location", location]
+        # -o <path> writes to output ("-" is stdout for PIPE)
+        return command + ["-o", output, YouTubeUrl.normalize(link)]
+
+    @staticmethod
+    def _find_output(stem: str) -> str:
+        # yt-dlp picks the extension (webm, m4a, opus, mp3...) from the format.
+        matches = [
+            p
+            for p in glob.glob(f"{glob.escape(stem)}.*")
+            if not p.endswith(PARTIAL_SUFFIXES)
+        ]
+        if not matches:
+            raise AudioDownloadError("Audio file was not created by yt-dlp.")
+        return matches[0]
+
+    def download_audio(self, link: str, mode: Optional[str] = None) -> str:
+        mode = mode or settings.AUDIO_DOWNLOAD_MODE
+        if mode not in AudioMode.FILE_MODES:
+            raise ValueError(f"Audio mode {mode!r} does not produce a file.")
+        existing = self._reuse(link, mode)
+        if existing:
+            return existing
+        stem = self._output_stem(link, mode)
+        try:
+            with timed("download_audio", mode=mode):
+                subprocess.run(
+                    self._command(link, f"{stem}.%(ext)s", mode),
+                    check=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                )
         except subprocess.CalledProcessError as e:
-            print(f"yt-dlp error: {e.stderr}")
+            logger.warning(
+                "yt-dlp failed (code %s): %s",
+                e.returncode,
+                e.stderr,
+                extra={"returncode": e.returncode, "link": link},
+            )
             raise AudioDownloadError(
                 f"yt-dlp failed (code {e.returncode}): {e.stderr[:400]}"
             )
+        return self._finish(stem)
 
-        if not os.path.exists(output_file):
-            raise AudioDownloadError("Audio file was not created by yt-dlp.")
-        return output_file
+    async def adownload_audio(self, link: str, mode: Optional[str] = None) -> str:
+        mode = mode or settings.AUDIO_DOWNLOAD_MODE
+        if mode not in AudioMode.FILE_MODES:
+            raise ValueError(f"Audio mode {mode!r} does not produce a file.")
+        # The store lookup and the sweep in _finish scan the media directory.
+        existing = await asyncio.to_thread(self._reuse, link, mode)
+        if existing:
+            return existing
+        stem = self._output_stem(link, mode)
+        with timed("download_audio", mode=mode):
+            process = await asyncio.create_subprocess_exec(
+                *self._command(link, f"{stem}.%(ext)s", mode),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, stderr = await process.communicate()
+            if process.returncode != 0:
+                error = stderr.decode(errors="replace")
+                logger.warning(
+                    "yt-dlp failed (code %s): %s",
+                    process.returncode,
+                    error,
+                    extra={"returncode": process.returncode, "link": link},
+                )
+                raise AudioDownloadError(
+                    f"yt-dlp failed (code {process.returncode}): {error[:400]}"
+                )
+        return await asyncio.to_thread(self._finish, stem)
+
+    def download_mp3(self, link: str) -> str:
+        return self.download_audio(link, mode=AudioMode.MP3)
+
+    async def adownload_mp3(self, link: str) -> str:
+        return await self.adownload_audio(link, mode=AudioMode.MP3)
+
+    @contextmanager
+    def stream_audio(self, link: str) -> Iterator[IO[bytes]]:
+        """Yields yt-dlp's stdout carrying the native audio container."""
+        # stderr goes to a file so a chatty yt-dlp cannot fill the pipe and stall.
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(
+                self._command(link, "-", AudioMode.PIPE),
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+            )
+            try:
+                yield process.stdout
+            except BaseException:
+                process.kill()
+                raise
+            finally:
+                process.stdout.close()
+                returncode = process.wait()
+            if returncode != 0:
+                stderr_file.seek(0)
+                error = stderr_file.read().decode(errors="replace")
+                logger.warning(
+                    "yt-dlp failed (code %s): %s",
+                    returncode,
+                    error,
+                    extra={"returncode": returncode, "link": link},
+                )
+                raise AudioDownloadError(
+                    f"yt-dlp failed (code {returncode}): {error[:400]}"
+                )
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.models import BlogPost
+from api.services.blog_versions import bump_on_commit
+
+
+@receiver(post_save, sender=BlogPost, dispatch_uid="api.blogpost_saved")
+@receiver(post_delete, sender=BlogPost, dispatch_uid="api.blogpost_deleted")
+def bump_blog_list_version(sender, instance, **kwargs):
+    bump_on_commit(instance.user_id)
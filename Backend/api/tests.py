@@ -1,3 +1,1077 @@
-from django.test import TestCase
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import BlogPost, GenerationJob, Transcript
+from api.repositories.batch_repo import GenerationBatchRepository
+from api.repositories.blog_repo import BlogRepository
+from api.repositories.job_repo import GenerationJobRepository
+from api.repositories.transcript_repo import TranscriptRepository
+from api.services.blog_generation import BlogGenerator
+from api.services.blog_versions import BlogVersions
+from api.services.chunked_transcription import (
+    AudioChunk,
+    AudioSplitter,
+    ChunkedTranscriptionService,
+)
+from api.services.clients import registry
+from api.services.generation_cache import GenerationCache
+from api.services.jobs import recover_stale_jobs, run_job
+from api.services.singleflight import SingleFlight
+from api.services.transcript_store import TranscriptStore
+from api.services.transcription import TranscriptSegment, sentence_segments
+from api.services.youtube import (
+    AudioMode,
+    YouTubeAudioDownloader,
+    YouTubeMetadataFetcher,
+)
+
+locmem_cache = override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+
+
+def run_in_threads(count, target):
+    """Starts ``target(index)`` on ``count`` threads at once; returns errors."""
+    barrier = threading.Barrier(count)
+    errors = []
+    lock = threading.Lock()
+
+    def run(index):
+        try:
+            barrier.wait()
+            target(index)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+class StubChunk:
+    """A streamed response chunk; like the SDK's, ``text`` needs a part."""
+
+    def __init__(self, text=None):
+        self.parts = [] if text is None else [SimpleNamespace(text=text)]
+
+    @property
+    def text(self):
+        if not self.parts:
+            raise ValueError("The `response.text` quick accessor needs a Part.")
+        return self.parts[0].text
+
+
+class StubGeminiModel:
+    """Stands in for ``genai.GenerativeModel``; writes ``chunks`` one by one.
+
+    Streams end with a chunk without parts, as Gemini's can. With ``hold``
+    set, streaming waits for it before the second chunk.
+    """
+
+    def __init__(
+        self, chunks=("# Stub\n\n", "First part. ", "Second part."), hold=None
+    ):
+        self.chunks = list(chunks)
+        self.hold = hold
+        self.prompts = []
+
+    def generate_content(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        if not stream:
+            return SimpleNamespace(text="".join(self.chunks))
+        return self._stream()
+
+    def _stream(self):
+        for index, text in enumerate(self.chunks):
+            if index == 1 and self.hold is not None:
+                self.hold.wait(timeout=5)
+            yield StubChunk(text)
+        yield StubChunk()
+
+    async def generate_content_async(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        if not stream:
+            return SimpleNamespace(text="".join(self.chunks))
+
+        async def chunks():
+            for text in self.chunks:
+                yield StubChunk(text)
+            yield StubChunk()
+
+        return chunks()
+
+
+def parse_sse(body):
+    """``[(event, data), ...]`` from a text/event-stream body."""
+    events = []
+    for message in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@locmem_cache
+class SaveOrUpdateConcurrencyTests(TransactionTestCase):
+    THREADS = 16
+    SAVES_PER_THREAD = 5
+
+    def test_colliding_saves_insert_one_row(self):
+        user = User.objects.create_user("concurrent")
+        barrier = threading.Barrier(self.THREADS)
+        outcomes, errors = [], []
+        lock = threading.Lock()
+
+        def save(index):
+            try:
+                barrier.wait()
+                for attempt in range(self.SAVES_PER_THREAD):
+                    _, outcome = BlogRepository().save_or_update(
+                        user=user,
+                        youtube_link="https://youtu.be/collide",
+                        tone="casual",
+                        length="short",
+                        youtube_title="Collide",
+                        generated_content=f"<p>{index}-{attempt}</p>",
+                        overwrite=attempt % 2 == 1,
+                    )
+                    with lock:
+                        outcomes.append(outcome)
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=save, args=(i,)) for i in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(outcomes), self.THREADS * self.SAVES_PER_THREAD)
+        self.assertEqual(outcomes.count("created"), 1)
+        self.assertEqual(
+            BlogPost.objects.filter(
+                user=user, youtube_link="https://youtu.be/collide"
+            ).count(),
+            1,
+        )
+
+
+@locmem_cache
+class GenerateBlogStreamTests(TestCase):
+    LINK = "https://youtu.be/stream01"
+    VIDEO_ID = "stream01"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("streamer")
+
+    def setUp(self):
+        cache.clear()
+        # Transcript and title are already known, so only the model is called.
+        TranscriptStore().put(
+            video_id=self.VIDEO_ID,
+            youtube_link=self.LINK,
+            text="A transcript about streaming.",
+            source="captions",
+        )
+        cache.set(YouTubeMetadataFetcher.cache_key(self.LINK), "Stub title")
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+
+    def override_model(self, model):
+        return registry.override(f"gemini:{BlogGenerator.DEFAULT_MODEL_NAME}", model)
+
+    async def test_asgi_stream_sends_stages_chunks_then_done(self):
+        model = StubGeminiModel()
+        with self.override_model(model):
+            response = await AsyncClient().post(
+                "/api/generate-blog/stream/",
+                {"link": self.LINK, "tone": "casual", "length": "short"},
+                content_type="application/json",
+                headers={"authorization": f"Bearer {self.token}"},
+            )
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            body = b"".join([chunk async for chunk in response.streaming_content])
+
+        events = parse_sse(body.decode())
+        self.assertEqual(
+            [event for event, _ in events], ["stage", "chunk", "chunk", "chunk", "done"]
+        )
+        self.assertEqual(events[0][1], {"stage": "generating"})
+        self.assertEqual([data["text"] for _, data in events[1:4]], model.chunks)
+        done = events[-1][1]
+        self.assertEqual(done["markdown"], "".join(model.chunks))
+        self.assertEqual(done["title"], "Stub title")
+        self.assertIn("<h1>Stub</h1>", done["content"])
+
+    def test_wsgi_stream_sends_events_before_generation_finishes(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        hold = threading.Event()
+        model = StubGeminiModel(hold=hold)
+        with self.override_model(model):
+            response = client.post(
+                "/api/generate-blog/stream/",
+                {"link": self.LINK, "tone": "casual", "length": "short"},
+                format="json",
+            )
+            chunks = iter(response.streaming_content)
+            # The model is still blocked on its second chunk here.
+            first = parse_sse(next(chunks).decode() + next(chunks).decode())
+            hold.set()
+            rest = parse_sse(b"".join(chunks).decode())
+
+        self.assertEqual(
+            first,
+            [("stage", {"stage": "generating"}), ("chunk", {"text": "# Stub\n\n"})],
+        )
+        self.assertEqual([event for event, _ in rest], ["chunk", "chunk", "done"])
+        self.assertEqual(rest[-1][1]["markdown"], "".join(model.chunks))
+
+    def test_stream_reports_generation_errors_as_an_event(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.override_model(StubGeminiModel(chunks=[])):
+            response = client.post(
+                "/api/generate-blog/stream/",
+                {"link": self.LINK},
+                format="json",
+            )
+            events = parse_sse(b"".join(response.streaming_content).decode())
+
+        self.assertEqual(events[-1][0], "error")
+        self.assertIn("Generation failed", events[-1][1]["detail"])
+
+
+class StubPipeline:
+    """Stands in for ``BlogGenerationPipeline`` in job tests.
+
+    Videos whose id starts with "fail" raise; ``during_run`` (if set) is
+    called mid-run with the video id.
+    """
+
+    runs = []
+    during_run = None
+
+    def __init__(self, on_stage=None, **kwargs):
+        self.on_stage = on_stage
+
+    def run(self, *, link, video_id, tone, length):
+        StubPipeline.runs.append(video_id)
+        self.on_stage("generating")
+        if StubPipeline.during_run:
+            StubPipeline.during_run(video_id)
+        if video_id.startswith("fail"):
+            raise RuntimeError("model unavailable")
+        return {"content": f"<p>{video_id}</p>", "title": video_id}
+
+
+@locmem_cache
+@override_settings(GENERATION_JOB_QUEUE="api.services.jobs.SynchronousJobQueue")
+@mock.patch("api.services.jobs.BlogGenerationPipeline", StubPipeline)
+class GenerationJobTests(TransactionTestCase):
+    # run_job closes old connections, which must not happen inside the
+    # transaction a TestCase wraps around each test.
+
+    def setUp(self):
+        cache.clear()
+        StubPipeline.runs = []
+        StubPipeline.during_run = None
+        self.user = User.objects.create_user("jobs")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_batch(self, count, parallelism):
+        return GenerationBatchRepository().create(
+            user=self.user,
+            videos=[
+                (f"https://youtu.be/video{i:04}", f"video{i:04}") for i in range(count)
+            ],
+            tone="casual",
+            length="short",
+            parallelism=parallelism,
+        )
+
+    def backdate(self, job_id, hours=2):
+        GenerationJob.objects.filter(id=job_id).update(
+            started_at=timezone.now() - timedelta(hours=hours)
+        )
+
+    def test_enqueued_job_runs_and_succeeds(self):
+        response = self.client.post(
+            "/api/generate-blog/jobs/", {"link": "https://youtu.be/jobvid01"}
+        )
+        self.assertEqual(response.status_code, 202)
+
+        job = self.client.get(response.data["status_url"]).data
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["stage"], "done")
+        self.assertEqual(job["result"]["title"], "jobvid01")
+        self.assertEqual(StubPipeline.runs, ["jobvid01"])
+
+    def test_failing_pipeline_marks_job_failed(self):
+        response = self.client.post(
+            "/api/generate-blog/jobs/", {"link": "https://youtu.be/failvid01"}
+        )
+
+        job = self.client.get(response.data["status_url"]).data
+        self.assertEqual(job["status"], "failed")
+        self.assertIn("model unavailable", job["error"])
+
+    def test_claimed_job_is_not_run_twice(self):
+        job = GenerationJobRepository().create(
+            user=self.user,
+            youtube_link="https://youtu.be/jobvid02",
+            video_id="jobvid02",
+            tone="casual",
+            length="short",
+        )
+        run_job(job.id)
+        run_job(job.id)
+
+        self.assertEqual(StubPipeline.runs, ["jobvid02"])
+
+    def test_batch_releases_jobs_in_position_order(self):
+        video_ids = [f"batch{i:03}" for i in range(5)]
+        links = [f"https://youtu.be/{video_id}" for video_id in video_ids]
+        with override_settings(GENERATION_BATCH_PARALLELISM=1):
+            response = self.client.post(
+                "/api/generate-blog/batches/", {"links": links}, format="json"
+            )
+
+        batch = self.client.get(response.data["status_url"]).data
+        self.assertEqual(batch["status"], "succeeded")
+        self.assertEqual(StubPipeline.runs, video_ids)
+        self.assertEqual(
+            [job["youtube_link"].rsplit("=", 1)[-1] for job in batch["jobs"]],
+            video_ids,
+        )
+
+    @override_settings(GENERATION_JOB_QUEUE="api.services.jobs.DatabaseJobQueue")
+    def test_recovery_fails_lost_job_and_advances_its_batch(self):
+        _, jobs = self.create_batch(3, parallelism=1)
+        repo = GenerationJobRepository()
+        repo.claim(pk=jobs[0].id)
+        self.backdate(jobs[0].id)
+
+        self.assertEqual(recover_stale_jobs(), 1)
+        self.assertEqual(recover_stale_jobs(), 0)
+        statuses = [repo.get(pk=job.id).status for job in jobs]
+        self.assertEqual(statuses, ["failed", "queued", "pending"])
+
+    @override_settings(GENERATION_JOB_QUEUE="api.services.jobs.DatabaseJobQueue")
+    def test_recovery_leaves_recent_jobs_running(self):
+        _, jobs = self.create_batch(2, parallelism=1)
+        repo = GenerationJobRepository()
+        repo.claim(pk=jobs[0].id)
+        self.backdate(jobs[0].id, hours=0)
+
+        self.assertEqual(recover_stale_jobs(), 0)
+        self.assertEqual(repo.get(pk=jobs[0].id).status, "running")
+
+    @override_settings(GENERATION_JOB_QUEUE="api.services.jobs.DatabaseJobQueue")
+    def test_recovered_job_finishing_late_does_not_advance_batch_again(self):
+        _, jobs = self.create_batch(3, parallelism=1)
+
+        def lose_job(video_id):
+            self.backdate(jobs[0].id)
+            recover_stale_jobs()
+
+        StubPipeline.during_run = lose_job
+        run_job(jobs[0].id)
+
+        repo = GenerationJobRepository()
+        statuses = [repo.get(pk=job.id).status for job in jobs]
+        self.assertEqual(statuses, ["failed", "queued", "pending"])
+
+    @override_settings(GENERATION_JOB_QUEUE="api.services.jobs.DatabaseJobQueue")
+    def test_worker_recovers_lost_jobs_and_drains_the_queue(self):
+        _, jobs = self.create_batch(3, parallelism=2)
+        GenerationJobRepository().claim(pk=jobs[0].id)
+        self.backdate(jobs[0].id)
+
+        call_command(
+            "run_generation_worker", "--once", "--poll-interval", "0", stdout=StringIO()
+        )
+
+        repo = GenerationJobRepository()
+        statuses = [repo.get(pk=job.id).status for job in jobs]
+        self.assertEqual(statuses, ["failed", "succeeded", "succeeded"])
+
+
+class MetricsViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("ops", is_staff=True)
+        cls.user = User.objects.create_user("reader")
+
+    def get_metrics(self, user=None, **headers):
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        return client.get("/metrics", headers=headers)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_without_token_only_staff_can_read(self):
+        self.assertIn(self.get_metrics().status_code, (401, 403))
+        self.assertEqual(self.get_metrics(self.user).status_code, 403)
+        response = self.get_metrics(self.staff)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"intelliblogger_stage_duration_seconds", response.content)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_with_token_the_bearer_token_is_required(self):
+        self.assertEqual(self.get_metrics().status_code, 403)
+        self.assertEqual(
+            self.get_metrics(authorization="Bearer wrong").status_code, 403
+        )
+        response = self.get_metrics(authorization="Bearer scrape-secret")
+        self.assertEqual(response.status_code, 200)
+
+
+class TranscriptRepositoryConcurrencyTests(TransactionTestCase):
+    THREADS = 8
+
+    def test_colliding_saves_keep_one_row(self):
+        texts = [f"transcript {i}" for i in range(self.THREADS)]
+
+        def save(index):
+            TranscriptRepository().save(
+                video_id="racevideo01",
+                youtube_link="https://www.youtube.com/watch?v=racevideo01",
+                text=texts[index],
+                source="assemblyai",
+            )
+
+        self.assertEqual(run_in_threads(self.THREADS, save), [])
+        transcripts = Transcript.objects.filter(video_id="racevideo01")
+        self.assertEqual(transcripts.count(), 1)
+        self.assertIn(TranscriptRepository().get_text("racevideo01"), texts)
+
+
+@locmem_cache
+class BlogBulkTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("bulk")
+        self.other = User.objects.create_user("bulk-other")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def make_post(self, user, index):
+        return BlogPost.objects.create(
+            user=user,
+            youtube_title=f"Post {index}",
+            youtube_link=f"https://www.youtube.com/watch?v=bulk{index}",
+            generated_content=f"<p>{index}</p>",
+        )
+
+    def test_delete_removes_only_own_posts_and_bumps_version(self):
+        mine = [self.make_post(self.user, i) for i in range(3)]
+        theirs = self.make_post(self.other, 9)
+        before = BlogVersions().get(self.user.pk).token
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertNumQueries(1):
+                deleted = BlogRepository().bulk_delete(
+                    user=self.user, ids=[mine[0].pk, mine[1].pk, theirs.pk]
+                )
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(len(callbacks), 1)
+        self.assertNotEqual(BlogVersions().get(self.user.pk).token, before)
+        self.assertEqual(
+            list(BlogPost.objects.values_list("pk", flat=True).order_by("pk")),
+            [mine[2].pk, theirs.pk],
+        )
+
+    def save(self, items, **extra):
+        return self.client.post(
+            "/api/blogs/bulk/", {"items": items, **extra}, format="json"
+        )
+
+    def item(self, index, markdown="Some *text*"):
+        return {
+            "title": f"Bulk {index}",
+            "markdown": markdown,
+            "link": f"https://www.youtube.com/watch?v=bulk{index}",
+            "tone": "casual",
+            "length": "short",
+        }
+
+    def test_save_creates_new_posts_and_leaves_existing_ones(self):
+        self.save([self.item(1)])
+
+        response = self.save([self.item(1, "Changed"), self.item(2)])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["counts"], {"created": 1, "updated": 0, "exists": 1}
+        )
+        post = BlogPost.objects.get(youtube_title="Bulk 1")
+        self.assertEqual(post.content_markdown, "Some *text*")
+        self.assertIn("<em>text</em>", post.generated_content)
+
+    def test_save_with_force_update_overwrites_content(self):
+        self.save([self.item(1)])
+
+        response = self.save([self.item(1, "Fresh words here")], force_update=True)
+
+        self.assertEqual(response.json()["counts"]["updated"], 1)
+        post = BlogPost.objects.get(youtube_title="Bulk 1")
+        self.assertEqual(post.content_markdown, "Fresh words here")
+        self.assertEqual(post.word_count, 3)
+
+    def test_update_changes_only_own_posts(self):
+        mine = self.make_post(self.user, 1)
+        theirs = self.make_post(self.other, 2)
+
+        response = self.client.patch(
+            "/api/blogs/bulk/",
+            {
+                "items": [
+                    {"id": mine.pk, "youtube_title": "Renamed"},
+                    {"id": theirs.pk, "youtube_title": "Hijacked"},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            response.json(), {"updated": [mine.pk], "not_found": [theirs.pk]}
+        )
+        mine.refresh_from_db()
+        theirs.refresh_from_db()
+        self.assertEqual(mine.youtube_title, "Renamed")
+        self.assertEqual(theirs.youtube_title, "Post 2")
+
+    @override_settings(BLOG_BULK_MAX_ITEMS=2)
+    def test_empty_and_oversized_requests_are_rejected(self):
+        self.assertEqual(self.save([]).status_code, 400)
+        self.assertEqual(self.save([self.item(i) for i in range(3)]).status_code, 400)
+        self.assertFalse(BlogPost.objects.exists())
+
+    def test_delete_endpoint_reads_ids_from_query_string(self):
+        post = self.make_post(self.user, 1)
+
+        response = self.client.delete(f"/api/blogs/bulk/?ids={post.pk},999999")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"deleted": 1})
+        self.assertFalse(BlogPost.objects.filter(pk=post.pk).exists())
+
+
+@locmem_cache
+class BlogListPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("pager")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for index, title in enumerate(["B", "A", "B", "A", "B", "C", "A"]):
+            BlogPost.objects.create(
+                user=self.user,
+                youtube_title=title,
+                youtube_link=f"https://www.youtube.com/watch?v=page{index}",
+                generated_content=f"<p>{index}</p>",
+            )
+
+    def walk(self, sort, page_size=2):
+        """Follows ``next`` links from the first page; returns all the ids."""
+        url, ids = f"/api/blogs?sort={sort}&page_size={page_size}", []
+        for _ in range(50):
+            if not url:
+                break
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [item["id"] for item in response.json()["results"]]
+            url = response.json()["next"]
+        return ids
+
+    def expected(self, *ordering):
+        return list(BlogPost.objects.order_by(*ordering).values_list("id", flat=True))
+
+    def test_id_sorts_page_with_a_cursor(self):
+        self.assertEqual(self.walk("newest"), self.expected("-id"))
+        self.assertEqual(self.walk("oldest"), self.expected("id"))
+
+    def test_title_sorts_keep_every_duplicate_title_once(self):
+        self.assertEqual(self.walk("title"), self.expected("youtube_title", "id"))
+        self.assertEqual(
+            self.walk("title-desc"), self.expected("-youtube_title", "-id")
+        )
+
+    def test_title_sort_pages_past_a_thousand_equal_titles(self):
+        # A cursor on the title tells equal titles apart by an offset, which
+        # DRF caps at 1000.
+        BlogPost.objects.bulk_create(
+            BlogPost(
+                user=self.user,
+                youtube_title="A",
+                youtube_link=f"https://www.youtube.com/watch?v=same{index}",
+                generated_content="<p></p>",
+            )
+            for index in range(1200)
+        )
+
+        self.assertEqual(
+            self.walk("title", page_size=100),
+            self.expected("youtube_title", "id"),
+        )
+
+
+@locmem_cache
+class GenerationCacheTests(TestCase):
+    params = {
+        "transcript": "a transcript",
+        "tone": "casual",
+        "length": "short",
+        "model_name": "gemini-test",
+    }
+    article = {"markdown": "# Hi", "html": "<h1>Hi</h1>"}
+
+    def setUp(self):
+        cache.clear()
+
+    def test_hit_is_one_read_and_one_counter_update(self):
+        generation_cache = GenerationCache()
+        generation_cache.set(article=self.article, **self.params)
+
+        generation_cache.get(**self.params)  # creates the hits counter
+
+        with mock.patch.object(cache, "get_or_set") as get_or_set, mock.patch.object(
+            cache, "get_many", wraps=cache.get_many
+        ) as get_many, mock.patch.object(cache, "add") as add:
+            self.assertEqual(generation_cache.get(**self.params), self.article)
+
+        self.assertEqual(get_many.call_count, 1)
+        get_or_set.assert_not_called()
+        add.assert_not_called()
+        self.assertEqual(generation_cache.stats()["hits"], 2)
+
+    def test_invalidate_retires_existing_entries(self):
+        generation_cache = GenerationCache()
+        generation_cache.set(article=self.article, **self.params)
+
+        generation_cache.invalidate()
+
+        self.assertIsNone(generation_cache.get(**self.params))
+        generation_cache.set(article=self.article, **self.params)
+        self.assertEqual(generation_cache.get(**self.params), self.article)
+        self.assertEqual(generation_cache.stats()["misses"], 1)
+        self.assertEqual(generation_cache.stats()["hits"], 1)
+
+    @override_settings(GENERATION_CACHE_STATS=False)
+    def test_counters_can_be_turned_off(self):
+        generation_cache = GenerationCache()
+
+        with mock.patch.object(cache, "incr") as incr:
+            self.assertIsNone(generation_cache.get(**self.params))
+
+        incr.assert_not_called()
+
+
+class AudioSplitterTests(TestCase):
+    def test_cuts_move_to_the_nearest_silence(self):
+        splitter = AudioSplitter(chunk_seconds=100, search_window=20)
+
+        cuts = splitter.boundaries(250.0, silences=[30.0, 95.0, 112.0, 210.0])
+
+        self.assertEqual(cuts, [0.0, 95.0, 210.0, 250.0])
+
+    def test_cuts_fall_back_to_the_target_without_a_nearby_silence(self):
+        splitter = AudioSplitter(chunk_seconds=100, search_window=5)
+
+        self.assertEqual(
+            splitter.boundaries(230.0, silences=[150.0]), [0, 100, 200, 230]
+        )
+
+
+class StubSplitter:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def split(self, audio_path, output_dir):
+        return self.chunks
+
+
+class StubTranscriber:
+    """Two sentences per chunk, timed from the start of the chunk."""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe_segments(self, path):
+        self.calls.append(path)
+        return [
+            TranscriptSegment(start=1.0, end=4.0, text=f"{path} one."),
+            TranscriptSegment(start=5.0, end=9.5, text=f"{path} two."),
+        ]
+
+
+@locmem_cache
+class ChunkedTranscriptionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.chunks = [
+            AudioChunk(index=0, start=0.0, end=60.0, path="a"),
+            AudioChunk(index=1, start=60.0, end=120.0, path="b"),
+        ]
+
+    def transcribe(self, transcriber):
+        service = ChunkedTranscriptionService(
+            transcriber=transcriber, splitter=StubSplitter(self.chunks), max_workers=2
+        )
+        return service.transcribe_file("audio.opus", cache_id="video.native")
+
+    def test_segments_are_stitched_with_absolute_timestamps(self):
+        result = self.transcribe(StubTranscriber())
+
+        self.assertEqual(
+            [(s.start, s.end, s.text) for s in result.segments],
+            [
+                (1.0, 4.0, "a one."),
+                (5.0, 9.5, "a two."),
+                (61.0, 64.0, "b one."),
+                (65.0, 69.5, "b two."),
+            ],
+        )
+        self.assertEqual(result.text, "a one. a two. b one. b two.")
+
+    def test_cached_chunks_are_not_sent_again(self):
+        self.transcribe(StubTranscriber())
+        transcriber = StubTranscriber()
+
+        result = self.transcribe(transcriber)
+
+        self.assertEqual(transcriber.calls, [])
+        self.assertEqual(result.segments[2].start, 61.0)
+
+    def test_words_are_grouped_into_sentences(self):
+        words = [
+            SimpleNamespace(text=text, start=start, end=end)
+            for text, start, end in [
+                ("Hello", 0, 400),
+                ("there.", 450, 900),
+                ("Bye", 1500, 1800),
+            ]
+        ]
+
+        self.assertEqual(
+            sentence_segments(words),
+            [
+                TranscriptSegment(start=0.0, end=0.9, text="Hello there."),
+                TranscriptSegment(start=1.5, end=1.8, text="Bye"),
+            ],
+        )
+
+
+class AudioCommandTests(TestCase):
+    link = "https://www.youtube.com/watch?v=abc123"
+
+    def command(self, location, mode=AudioMode.MP3):
+        with override_settings(FFMPEG_LOCATION=location):
+            return YouTubeAudioDownloader._command(self.link, "out.%(ext)s", mode)
+
+    def test_ffmpeg_location_is_passed_only_when_it_exists(self):
+        with tempfile.TemporaryDirectory() as location:
+            self.assertIn(location, self.command(location))
+            self.assertNotIn("--ffmpeg-location", self.command(location, "native"))
+        self.assertNotIn("--ffmpeg-location", self.command(location))
+        self.assertNotIn("--ffmpeg-location", self.command(""))
+
+
+@locmem_cache
+class BlogSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("searcher")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create(self, title, html, user=None, video="s"):
+        return BlogRepository().create(
+            user=user or self.user,
+            youtube_title=title,
+            youtube_link=f"https://www.youtube.com/watch?v={video}{title[:3]}",
+            generated_content=html,
+            tone="casual",
+            length="short",
+        )
+
+    def search(self, query):
+        response = self.client.get("/api/blogs", {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return [item["youtube_title"] for item in response.json()["results"]]
+
+    def test_title_matches_rank_first_and_words_match_as_prefixes(self):
+        self.create(
+            "Gardening notes", "<p>Caching tomatoes in a <b>django</b> shed.</p>"
+        )
+        self.create("Django caching", "<p>Nothing else here.</p>")
+        self.create("Unrelated", "<p>Only <em>bread</em>.</p>")
+
+        self.assertEqual(
+            self.search("djan cach"), ["Django caching", "Gardening notes"]
+        )
+
+    def test_markup_is_not_indexed(self):
+        self.create("Styled", '<p class="highlight">Plain words</p>')
+
+        self.assertEqual(self.search("highlight"), [])
+        self.assertEqual(self.search("plain"), ["Styled"])
+
+    def test_results_are_per_user_and_query_syntax_is_inert(self):
+        other = User.objects.create_user("other-searcher")
+        self.create("Django mine", "<p>x</p>")
+        self.create("Django theirs", "<p>x</p>", user=other, video="o")
+
+        self.assertEqual(self.search("django"), ["Django mine"])
+        self.assertEqual(self.search('django" OR NEAR(*'), [])
+        self.assertEqual(self.search('"django"'), ["Django mine"])
+
+    def test_bulk_edits_and_deletes_update_the_index(self):
+        post = self.create("Before", "<p>old words</p>")
+
+        BlogRepository().bulk_update(
+            user=self.user,
+            items=[{"id": post.pk, "content_markdown": "Fresh **words**"}],
+        )
+        self.assertEqual(self.search("fresh"), ["Before"])
+        self.assertEqual(self.search("old"), [])
+
+        BlogRepository().bulk_delete(user=self.user, ids=[post.pk])
+        self.assertEqual(self.search("fresh"), [])
+
+
+@locmem_cache
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("conditional")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.post = BlogRepository().create(
+            user=self.user,
+            youtube_title="Cached",
+            youtube_link="https://www.youtube.com/watch?v=etag1",
+            generated_content="<p>Body</p>",
+            tone="casual",
+            length="short",
+        )
+
+    def test_unchanged_list_is_answered_304_without_queries(self):
+        etag = self.client.get("/api/blogs")["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/blogs", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertNotEqual(self.client.get("/api/blogs?sort=title")["ETag"], etag)
+
+    def test_list_etag_changes_once_a_post_is_saved(self):
+        etag = self.client.get("/api/blogs")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"/api/blogs/{self.post.pk}/", {"youtube_title": "Renamed"}
+            )
+        response = self.client.get("/api/blogs", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["results"][0]["youtube_title"], "Renamed")
+
+    def test_detail_revalidates_on_the_timestamp_alone(self):
+        url = f"/api/blogs/{self.post.pk}/"
+        first = self.client.get(url)
+        self.assertEqual(first["Cache-Control"], "private, no-cache")
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+        self.client.patch(url, {"content_markdown": "New *body*"})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+    def test_another_users_post_is_not_found_even_with_its_etag(self):
+        etag = self.client.get(f"/api/blogs/{self.post.pk}/")["ETag"]
+        self.client.force_authenticate(User.objects.create_user("stranger"))
+
+        response = self.client.get(
+            f"/api/blogs/{self.post.pk}/", HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+
+@locmem_cache
+class SingleFlightTests(TestCase):
+    FOLLOWERS = 4
+
+    def run_together(self, flight, compute):
+        """Runs ``flight.do`` from a leader and FOLLOWERS threads, holding
+        ``compute`` until all have joined. Returns the results and errors."""
+        callers = 1 + self.FOLLOWERS
+        release = threading.Event()
+        results, errors = [], []
+
+        def held():
+            release.wait(timeout=5)
+            return compute()
+
+        def call(index):
+            results.append(flight.do("video", compute=held))
+
+        with mock.patch.object(flight, "_join", wraps=flight._join) as join:
+            runner = threading.Thread(
+                target=lambda: errors.extend(run_in_threads(callers, call))
+            )
+            runner.start()
+            deadline = time.monotonic() + 5
+            while join.call_count < callers and time.monotonic() < deadline:
+                time.sleep(0.01)
+            release.set()
+            runner.join()
+        return results, errors
+
+    def test_concurrent_callers_share_one_computation(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return "transcript"
+
+        results, errors = self.run_together(flight, compute)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(results, ["transcript"] * (1 + self.FOLLOWERS))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight._inflight, {})
+
+    def test_a_failure_reaches_every_caller_and_frees_the_key(self):
+        flight = SingleFlight("test")
+
+        def compute():
+            raise RuntimeError("download failed")
+
+        results, errors = self.run_together(flight, compute)
+
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 1 + self.FOLLOWERS)
+        self.assertTrue(all(isinstance(e, RuntimeError) for e in errors))
+        self.assertEqual(flight.do("video", compute=lambda: "retried"), "retried")
+
+    def test_lock_holder_uses_what_the_previous_holder_stored(self):
+        flight = SingleFlight("test")
+        shared_cache = mock.Mock()
+        shared_cache.lock.return_value.acquire.return_value = True
+        compute = mock.Mock(return_value="computed")
+
+        with mock.patch("api.services.singleflight.cache", shared_cache):
+            result = flight.do("video", compute=compute, lookup=lambda: "stored")
+
+        self.assertEqual(result, "stored")
+        compute.assert_not_called()
+        shared_cache.lock.return_value.release.assert_called_once()
+
+    def test_unavailable_lock_falls_back_to_computing(self):
+        flight = SingleFlight("test")
+        shared_cache = mock.Mock()
+        shared_cache.lock.return_value.acquire.side_effect = ConnectionError("down")
+
+        with mock.patch("api.services.singleflight.cache", shared_cache):
+            with self.assertLogs("api.services.singleflight", "WARNING"):
+                result = flight.do(
+                    "video", compute=lambda: "computed", lookup=lambda: "stored"
+                )
+
+        self.assertEqual(result, "computed")
+        shared_cache.lock.return_value.release.assert_not_called()
+
+    async def test_async_callers_share_one_computation(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "transcript"
+
+        results = await asyncio.gather(
+            *(flight.ado("video", compute=compute) for _ in range(3))
+        )
+
+        self.assertEqual(results, ["transcript"] * 3)
+        self.assertEqual(len(calls), 1)
+
+
+@locmem_cache
+class TranscriptStoreTests(TestCase):
+    video_id = "tieredvid01"
+
+    def setUp(self):
+        cache.clear()
+        self.store = TranscriptStore()
+
+    def put(self, text="stored transcript"):
+        self.store.put(
+            video_id=self.video_id,
+            youtube_link=f"https://www.youtube.com/watch?v={self.video_id}",
+            text=text,
+            source="captions",
+        )
+
+    def test_put_serves_from_the_cache_without_queries(self):
+        self.put()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.store.get(self.video_id), "stored transcript")
+
+    def test_database_hit_is_written_back_to_the_cache(self):
+        self.put()
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.store.get(self.video_id), "stored transcript")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.store.get(self.video_id), "stored transcript")
+
+    def test_unknown_video_is_a_miss_that_caches_nothing(self):
+        self.assertIsNone(self.store.get("missingvid1"))
+        self.assertIsNone(self.store.get_cached("missingvid1"))
+
+    def test_outlines_are_kept_per_version(self):
+        self.put()
+        self.store.put_outline(video_id=self.video_id, outline="- a", version="v1")
+        cache.clear()
+
+        self.assertEqual(self.store.get_outline(self.video_id, "v1"), "- a")
+        self.assertIsNone(self.store.get_outline(self.video_id, "v2"))
@@ -2,10 +2,16 @@
 from django.urls import path
 
 from .views import (
+    BlogBulkAPIView,
     BlogDetailAPIView,
     BlogListAPIView,
     CurrentUserView,
+    GenerateBlogJobView,
+    GenerateBlogStreamView,
+    GenerateBatchView,
     GenerateBlogView,
+    GenerationBatchDetailAPIView,
+    GenerationJobDetailAPIView,
     LoginView,
     NoThrottleTokenBlacklistView,
     NoThrottleTokenRefreshView,
@@ -19,8 +25,34 @@ urlpatterns = [
     path("token/refresh/", NoThrottleTokenRefreshView.as_view(), name="token_refresh"),
     path("logout/", NoThrottleTokenBlacklistView.as_view(), name="token_blacklist"),
     path("generate-blog/", GenerateBlogView.as_view(), name="generate_blog"),
+    path(
+        "generate-blog/stream/",
+        GenerateBlogStreamView.as_view(),
+        name="generate-blog-stream",
+    ),
+    path(
+        "generate-blog/jobs/",
+        GenerateBlogJobView.as_view(),
+        name="generate-blog-job",
+    ),
+    path(
+        "generate-blog/jobs/<uuid:pk>/",
+        GenerationJobDetailAPIView.as_view(),
+        name="generation-job-detail",
+    ),
+    path(
+        "generate-blog/batches/",
+        GenerateBatchView.as_view(),
+        name="generate-blog-batch",
+    ),
+    path(
+        "generate-blog/batches/<uuid:pk>/",
+        GenerationBatchDetailAPIView.as_view(),
+        name="generation-batch-detail",
+    ),
     path("save-blog/", SaveBlogView.as_view(), name="save-blog"),
     path("me/", CurrentUserView.as_view(), name="current_user"),
     path("blogs", BlogListAPIView.as_view(), name="blog-list-api"),
+    path("blogs/bulk/", BlogBulkAPIView.as_view(), name="blog-bulk"),
     path("blogs/<int:pk>/", BlogDetailAPIView.as_view(), name="blog-detail"),
 ]
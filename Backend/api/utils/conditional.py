@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+
+def conditional_response(
+    request, *, etag: str, last_modified: Optional[datetime]
+) -> Optional[HttpResponseBase]:
+    """A 304 response if the client's ETag/Last-Modified is current, else None."""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(
+        getattr(request, "_request", request), etag=etag, last_modified=timestamp
+    )
+    if response is not None:
+        set_validators(response, etag=etag, last_modified=last_modified)
+    return response
+
+
+def set_validators(
+    response: HttpResponseBase, *, etag: str, last_modified: Optional[datetime]
+) -> HttpResponseBase:
+    """ETag/Last-Modified for per-user data.
+
+    Only the user's browser may store it, and it must revalidate first; Vary
+    keeps caches from mixing up responses for different tokens.
+    """
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    response["Cache-Control"] = "private, no-cache"
+    patch_vary_headers(response, ["Authorization"])
+    return response
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import html as html_lib
+import math
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import markdown
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+EXCERPT_WORDS = 25
+EXCERPT_MAX_CHARS = 300
+WORDS_PER_MINUTE = 200
+
+# Building a Markdown instance loads every processor; keep one per thread
+# (instances are not thread-safe) and reset it between documents.
+_local = threading.local()
+
+
+def _converter() -> markdown.Markdown:
+    converter = getattr(_local, "converter", None)
+    if converter is None:
+        converter = _local.converter = markdown.Markdown()
+    return converter.reset()
+
+
+def render_markdown(text: str) -> str:
+    """Same HTML as ``markdown.markdown(text)``, without the per-call setup."""
+    return _converter().convert(text or "")
+
+
+def plain_text(html: str) -> str:
+    # Spacing after each tag keeps "<h2>A</h2><p>B" from becoming "AB".
+    text = html_lib.unescape(strip_tags(html.replace(">", "> ")))
+    return " ".join(text.split())
+
+
+@dataclass(frozen=True)
+class RenderedContent:
+    """A post body as stored: source markdown, HTML, plain text and list metadata."""
+
+    html: str
+    markdown: str
+    text: str
+    excerpt: str
+    word_count: int
+    reading_time: int
+
+    def as_fields(self) -> dict:
+        """``BlogPost`` field values."""
+        return {
+            "generated_content": self.html,
+            "content_markdown": self.markdown,
+            "search_text": self.text,
+            "excerpt": self.excerpt,
+            "word_count": self.word_count,
+            "reading_time": self.reading_time,
+        }
+
+
+def render_content(
+    *, markdown_text: Optional[str] = None, html: Optional[str] = None
+) -> RenderedContent:
+    """Renders ``markdown_text`` (preferred) or takes ``html`` as is.
+
+    Posts saved from HTML alone (older clients, hand edits) keep an empty
+    ``markdown``. The HTML's text is stored for search, and excerpt, word
+    count and reading time come from it, once, so lists never parse article
+    bodies.
+    """
+    if markdown_text:
+        html = render_markdown(markdown_text)
+    html = html or ""
+    text = plain_text(html)
+    word_count = len(text.split())
+    return RenderedContent(
+        html=html,
+        markdown=markdown_text or "",
+        text=text,
+        excerpt=Truncator(Truncator(text).words(EXCERPT_WORDS)).chars(
+            EXCERPT_MAX_CHARS
+        ),
+        word_count=word_count,
+        reading_time=math.ceil(word_count / WORDS_PER_MINUTE),
+    )
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from django.conf import settings
+
+
+def configure_sqlite(sender, connection, **kwargs) -> None:
+    """``connection_created`` handler applying SQLITE_PRAGMAS to new connections.
+
+    WAL lets readers run alongside the single writer, and busy_timeout makes
+    a writer wait for the lock. That wait only happens when the lock is taken
+    at BEGIN, hence ``transaction_mode: IMMEDIATE`` in the database OPTIONS.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
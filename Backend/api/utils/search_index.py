@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+# Full-text index over BlogPost title and plain-text content, maintained by
+# the database itself so every write path (ORM save, queryset.update,
+# bulk_create) keeps it in sync. BlogRepository.search queries it.
+#
+# SQLite indexes the stored ``search_text`` column (the article with tags
+# stripped, see api.utils.content), installed by migration 0011. PostgreSQL
+# strips tags in its generated tsvector column from migration 0006.
+
+SQLITE_TABLE = "api_blogpost_fts"
+
+SQLITE_TRIGGERS = {
+    "api_blogpost_fts_insert": """
+        CREATE TRIGGER IF NOT EXISTS api_blogpost_fts_insert
+        AFTER INSERT ON api_blogpost BEGIN
+            INSERT INTO api_blogpost_fts(rowid, youtube_title, search_text)
+            VALUES (new.id, new.youtube_title, new.search_text);
+        END
+    """,
+    "api_blogpost_fts_delete": """
+        CREATE TRIGGER IF NOT EXISTS api_blogpost_fts_delete
+        AFTER DELETE ON api_blogpost BEGIN
+            INSERT INTO api_blogpost_fts(
+                api_blogpost_fts, rowid, youtube_title, search_text
+            )
+            VALUES ('delete', old.id, old.youtube_title, old.search_text);
+        END
+    """,
+    "api_blogpost_fts_update": """
+        CREATE TRIGGER IF NOT EXISTS api_blogpost_fts_update
+        AFTER UPDATE OF youtube_title, search_text ON api_blogpost BEGIN
+            INSERT INTO api_blogpost_fts(
+                api_blogpost_fts, rowid, youtube_title, search_text
+            )
+            VALUES ('delete', old.id, old.youtube_title, old.search_text);
+            INSERT INTO api_blogpost_fts(rowid, youtube_title, search_text)
+            VALUES (new.id, new.youtube_title, new.search_text);
+        END
+    """,
+}
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS api_blogpost_fts USING fts5(
+        youtube_title,
+        search_text,
+        content='api_blogpost',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    *SQLITE_TRIGGERS.values(),
+    "INSERT INTO api_blogpost_fts(api_blogpost_fts) VALUES ('rebuild')",
+]
+
+
+def repair_sqlite_triggers(sender, using="default", **kwargs) -> None:
+    """``post_migrate`` handler restoring the FTS triggers.
+
+    SQLite migrations that alter api_blogpost rebuild the table, which drops
+    its triggers; the index is recreated and rebuilt when that happened.
+    """
+    from django.db import connections
+
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name = %s OR type = 'trigger'",
+            [SQLITE_TABLE],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if SQLITE_TABLE not in existing or existing.issuperset(SQLITE_TRIGGERS):
+            return
+        # Migrated back before 0011: the old index belongs to that schema.
+        columns = {
+            column.name
+            for column in connection.introspection.get_table_description(
+                cursor, "api_blogpost"
+            )
+        }
+        if "search_text" not in columns:
+            return
+        for statement in SQLITE_FORWARD:
+            cursor.execute(statement)
@@ -1,16 +1,106 @@
 from __future__ import annotations
 
-import nltk
-from nltk.data import find
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Iterator, Optional
 
+# NLTK is imported on first use only. Nothing is downloaded at runtime: install
+# the model ahead of time (``python -m nltk.downloader punkt``) or the
+# rule-based splitter below is used.
 
-def ensure_punkt():
+_ABBREVIATIONS = frozenset(
+    {
+        "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "inc",
+        "ltd", "co", "corp", "no", "fig", "approx", "dept", "est", "e.g", "i.e",
+        "a.m", "p.m", "u.s", "u.k", "jan", "feb", "mar", "apr", "jun", "jul",
+        "aug", "sep", "sept", "oct", "nov", "dec",
+    }
+)  # fmt: skip
+
+# Terminal punctuation, optional closing quotes/brackets, whitespace, and an
+# upper-case letter, digit or opening quote starting the next sentence.
+_BOUNDARY = re.compile(r"[.!?…]+[\"'”’)\]]*\s+(?=[\"'“‘(\[]?[A-Z0-9])")
+
+_load_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _load_punkt(language: str) -> Optional[Any]:
+    """Punkt tokenizer for ``language`` if its model is installed, else None."""
     try:
-        find("tokenizers/punkt")
-    except LookupError:
-        nltk.download("punkt")
+        try:
+            from nltk.tokenize.punkt import PunktTokenizer  # nltk >= 3.8.2
+        except ImportError:
+            import nltk
+
+            return nltk.data.load(f"tokenizers/punkt/{language}.pickle")
+        return PunktTokenizer(language)
+    except (LookupError, OSError, ValueError):
+        return None
+
+
+def get_punkt(language: str = "english") -> Optional[Any]:
+    # lru_cache alone could load the model once per racing thread.
+    with _load_lock:
+        return _load_punkt(language)
+
+
+def _is_abbreviation(text: str, start: int, end: int) -> bool:
+    words = text[max(start, end - 24) : end].split()
+    if not words or text[end] != ".":
+        return False
+    word = words[-1].lstrip("\"'“‘([").lower()
+    # Single letters are initials ("J. Smith").
+    return word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+
+def _iter_rule_based(text: str) -> Iterator[tuple[int, int]]:
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        if _is_abbreviation(text, start, match.start()):
+            continue
+        yield start, match.end()
+        start = match.end()
+    yield start, len(text)
+
+
+def _iter_spans(text: str, language: str) -> Iterator[tuple[int, int]]:
+    tokenizer = get_punkt(language)
+    if tokenizer is None:
+        return _iter_rule_based(text)
+    return tokenizer.span_tokenize(text)
+
+
+def _split_long(sentence: str, max_length: int) -> Iterator[str]:
+    """Cuts an overlong sentence (e.g. unpunctuated captions) at whitespace."""
+    while len(sentence) > max_length:
+        cut = sentence.rfind(" ", 0, max_length + 1)
+        if cut <= 0:
+            cut = max_length
+        yield sentence[:cut].strip()
+        sentence = sentence[cut:].strip()
+    if sentence:
+        yield sentence
+
+
+def iter_sentences(
+    text: str, language: str = "english", max_length: Optional[int] = None
+) -> Iterator[str]:
+    """Yields the sentences of ``text`` lazily, without copying it into a list.
+
+    Uses NLTK punkt when installed and a rule-based splitter otherwise.
+    Sentences longer than ``max_length`` characters are cut at whitespace.
+    """
+    for start, end in _iter_spans(text, language):
+        sentence = text[start:end].strip()
+        if not sentence:
+            continue
+        if max_length and len(sentence) > max_length:
+            yield from _split_long(sentence, max_length)
+        else:
+            yield sentence
 
 
-def split_into_sentences(text: str):
-    ensure_punkt()
-    return nltk.sent_tokenize(text)
+def split_into_sentences(text: str, language: str = "english"):
+    return list(iter_sentences(text, language))
@@ -1,11 +1,17 @@
-# from django.contrib.auth import authenticate
-from urllib.parse import parse_qs, urlparse
+import hashlib
+import hmac
+import logging
 
-from django.core.cache import cache
+# from django.contrib.auth import authenticate
+from django.conf import settings
 from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework import generics, status
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, BasePermission, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.throttling import UserRateThrottle
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -17,11 +23,30 @@ from rest_framework_simplejwt.views import (
 
 from api.models import BlogPost
 
+from .pagination import blog_list_pagination
+from .repositories.batch_repo import GenerationBatchRepository
 from .repositories.blog_repo import BlogRepository
-from .serializers import BlogPostSerializer, SignupSerializer
-from .services.blog_generation import BlogGenerator
-from .services.transcription import TranscriptionService
-from .services.youtube import YouTubeAudioDownloader, YouTubeMetadataFetcher, YouTubeUrl
+from .repositories.job_repo import GenerationJobRepository
+from .serializers import (
+    BlogBulkSaveItemSerializer,
+    BlogBulkUpdateItemSerializer,
+    BlogPostListSerializer,
+    BlogPostSerializer,
+    GenerationBatchSerializer,
+    GenerationJobSerializer,
+    SignupSerializer,
+)
+from .services.batches import BatchError, BatchSubmitter
+from .services.blog_versions import BlogVersions
+from .services.jobs import get_job_queue
+from .services.metrics import registry as metrics_registry
+from .services.pipeline import BlogGenerationPipeline
+from .services.youtube import PlaylistError, YouTubeUrl
+from .utils.conditional import conditional_response, set_validators
+from .utils.content import render_content
+from .utils.sse import EventStreamRenderer, format_sse
+
+logger = logging.getLogger(__name__)
 
 
 class SignupThrottle(UserRateThrottle):
@@ -42,6 +67,12 @@ class GenerateBlogThrottle(UserRateThrottle):
     scope = "generate_blog"
 
 
+class GenerateBatchThrottle(UserRateThrottle):
+    """3 batches per hour per authenticated user, however many videos each holds."""
+
+    scope = "generate_batch"
+
+
 class SignupView(generics.CreateAPIView):
     serializer_class = SignupSerializer
     permission_classes = [AllowAny]
@@ -74,6 +105,17 @@ class LoginView(TokenObtainPairView):
     throttle_classes = [LoginThrottle]
 
 
+class MetricsPermission(BasePermission):
+    """The METRICS_TOKEN bearer token when one is set, otherwise a staff user."""
+
+    def has_permission(self, request, view):
+        token = settings.METRICS_TOKEN
+        if token:
+            supplied = request.META.get("HTTP_AUTHORIZATION", "")
+            return hmac.compare_digest(supplied, f"Bearer {token}")
+        return bool(request.user and request.user.is_staff)
+
+
 class NoThrottleTokenRefreshView(TokenRefreshView):
     throttle_classes: list = []
 
@@ -90,6 +132,36 @@ class CurrentUserView(APIView):
         return Response({"username": request.user.username})
 
 
+ALLOWED_TONES = ["professional", "casual", "witty", "technical"]
+ALLOWED_LENGTHS = ["short", "medium", "long"]
+
+
+def _parse_generation_request(data):
+    """
+    Validates a generate-blog body.
+    Returns (params, None) on success or (None, error_response) on failure.
+    """
+    link = data.get("link")
+    tone = data.get("tone", "professional")
+    length = data.get("length", "medium")
+    if not link:
+        return None, Response(
+            {"detail": "Missing 'link' field."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    if tone not in ALLOWED_TONES or length not in ALLOWED_LENGTHS:
+        return None, Response(
+            {"detail": "Invalid tone or length specified."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    video_id = YouTubeUrl.video_id(link)
+    if not video_id:
+        return None, Response(
+            {"detail": "Invalid YouTube link."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return {"link": link, "video_id": video_id, "tone": tone, "length": length}, None
+
+
 class GenerateBlogView(APIView):
     """
     POST /api/generate-blog/
@@ -100,134 +172,259 @@ class GenerateBlogView(APIView):
     throttle_classes = [GenerateBlogThrottle]
     permission_classes = [IsAuthenticated]
 
-    @transaction.atomic
+    # No transaction: generation makes no writes of its own and spends minutes
+    # on network I/O; the stores it uses commit their own short writes.
     def post(self, request, *args, **kwargs):
-        link = request.data.get("link")
-        tone = request.data.get("tone", "professional")
-        length = request.data.get("length", "medium")
-        if not link:
+        params, error = _parse_generation_request(request.data)
+        if error:
+            return error
+
+        pipeline = BlogGenerationPipeline()
+        try:
+            cached_blog = pipeline.cached_result(**params)
+            if cached_blog:
+                return Response(cached_blog, status=status.HTTP_200_OK)
+
+            payload = pipeline.run(**params)
+            return Response(payload, status=status.HTTP_201_CREATED)
+
+        except Exception as e:
+            # Log for debugging
             return Response(
-                {"detail": "Missing 'link' field."}, status=status.HTTP_400_BAD_REQUEST
+                {"detail": f"Generation failed: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
-        ALLOWED_TONES = ["professional", "casual", "witty", "technical"]
-        ALLOWED_LENGTHS = ["short", "medium", "long"]
 
-        if tone not in ALLOWED_TONES or length not in ALLOWED_LENGTHS:
+
+class GenerateBlogStreamView(APIView):
+    """
+    POST /api/generate-blog/stream/
+    Body: { "link": "https://youtube.com/...", "tone": "...", "length": "..." }
+    Requires: Authorization: Bearer <access_token>
+
+    Streams Server-Sent Events: "stage" events while fetching captions (or
+    downloading and transcribing) and generating, "chunk" events with raw
+    markdown as the article is written, then "done" with the same payload as
+    /api/generate-blog/ (or "error").
+
+    Under ASGI the events come from an async generator; WSGI servers read
+    the body synchronously, so they get a blocking iterator instead (an async
+    one would be drained in full before anything is sent).
+    """
+
+    throttle_classes = [GenerateBlogThrottle]
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    def post(self, request, *args, **kwargs):
+        params, error = _parse_generation_request(request.data)
+        if error:
+            return error
+
+        pipeline = BlogGenerationPipeline()
+        if isinstance(request._request, ASGIRequest):
+            body = _sse_stream(pipeline.astream(**params))
+        else:
+            body = (
+                format_sse(event, data) for event, data in pipeline.stream(**params)
+            )
+        response = StreamingHttpResponse(body, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        # Stop nginx from buffering the stream until it completes.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+async def _sse_stream(events):
+    async for event, data in events:
+        yield format_sse(event, data)
+
+
+class GenerateBlogJobView(APIView):
+    """
+    POST /api/generate-blog/jobs/
+    Body: { "link": "https://youtube.com/...", "tone": "...", "length": "..." }
+    Requires: Authorization: Bearer <access_token>
+
+    Enqueues the generation and returns a job id immediately (202). Poll
+    GET /api/generate-blog/jobs/<id>/ for status and the final payload.
+    """
+
+    throttle_classes = [GenerateBlogThrottle]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        params, error = _parse_generation_request(request.data)
+        if error:
+            return error
+
+        job = GenerationJobRepository().create(
+            user=request.user,
+            youtube_link=params["link"],
+            video_id=params["video_id"],
+            tone=params["tone"],
+            length=params["length"],
+        )
+        # Only hand the job to a worker once the row is visible to other connections.
+        transaction.on_commit(lambda: get_job_queue().enqueue(job.id))
+        return Response(
+            {
+                "job_id": str(job.id),
+                "status": job.status,
+                "status_url": reverse(
+                    "generation-job-detail", kwargs={"pk": job.id}, request=request
+                ),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class GenerationJobDetailAPIView(APIView):
+    """
+    GET /api/generate-blog/jobs/<id>/ -> Status of a generation job (owner only).
+    The generated payload is under "result" once status is "succeeded".
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_classes = []
+
+    def get(self, request, pk):
+        job = GenerationJobRepository().get_for_user(user=request.user, pk=pk)
+        if job is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(GenerationJobSerializer(job).data)
+
+
+class GenerateBatchView(APIView):
+    """
+    POST /api/generate-blog/batches/
+    Body: { "links": ["https://youtube.com/...", ...], "tone": "...", "length": "..." }
+       or { "playlist": "https://www.youtube.com/playlist?list=...", ... }
+    Requires: Authorization: Bearer <access_token>
+
+    Creates one generation job per distinct video and returns the batch (202).
+    Jobs run a few at a time; poll GET /api/generate-blog/batches/<id>/ for
+    per-video status and results. The whole batch counts once against the
+    "generate_batch" throttle.
+    """
+
+    throttle_classes = [GenerateBatchThrottle]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        links = request.data.get("links") or []
+        playlist = request.data.get("playlist") or ""
+        tone = request.data.get("tone", "professional")
+        length = request.data.get("length", "medium")
+        if bool(links) == bool(playlist) or not isinstance(links, list):
             return Response(
-                {"detail": "Invalid tone or length specified."},
+                {"detail": "Provide either a 'links' list or a 'playlist' link."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        normalized_link = YouTubeUrl.normalize(link)
-        parsed = urlparse(normalized_link)
-        query = parse_qs(parsed.query)
-        video_id = query.get("v", [""])[0]
-        if not video_id:
+        if tone not in ALLOWED_TONES or length not in ALLOWED_LENGTHS:
             return Response(
-                {"detail": "Invalid YouTube link."},
+                {"detail": "Invalid tone or length specified."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        blog_cache_key = f"generated_blog:{request.user.id}:{video_id}:{tone}:{length}"
-        cached_blog = cache.get(blog_cache_key)
-        if cached_blog:
-            return Response(cached_blog, status=status.HTTP_200_OK)
-
-        transcript_cache_key = f"youtube_transcript:{video_id}"
-        transcription = cache.get(transcript_cache_key)
 
         try:
-            if not transcription:
-                audio_path = YouTubeAudioDownloader().download_mp3(link)
-                transcription = TranscriptionService().transcribe_file(audio_path)
-                cache.set(transcript_cache_key, transcription, timeout=60 * 60 * 24)
-
-            title = YouTubeMetadataFetcher().get_title(link).title
-            blog_content = BlogGenerator().from_transcript(
-                transcription=transcription, tone=tone, length=length
+            batch, _ = BatchSubmitter().submit(
+                user=request.user,
+                links=links,
+                playlist=playlist,
+                tone=tone,
+                length=length,
             )
-            payload = {
-                "content": blog_content,
-                "title": title,
-                "tone": tone,
-                "length": length,
-            }
-            cache.set(blog_cache_key, payload, timeout=60 * 60 * 24)  # cache for 24h
-            return Response(payload, status=status.HTTP_201_CREATED)
-
-        except Exception as e:
-            # Log for debugging
+        except BatchError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except PlaylistError as e:
             return Response(
-                {"detail": f"Generation failed: {str(e)}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {"detail": f"Could not read the playlist: {str(e)}"},
+                status=status.HTTP_502_BAD_GATEWAY,
             )
 
+        data = GenerationBatchSerializer(batch).data
+        data["status_url"] = reverse(
+            "generation-batch-detail", kwargs={"pk": batch.id}, request=request
+        )
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+
+
+class GenerationBatchDetailAPIView(APIView):
+    """
+    GET /api/generate-blog/batches/<id>/ -> Batch status with every job (owner only).
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_classes = []
+
+    def get(self, request, pk):
+        batch = GenerationBatchRepository().get_for_user(user=request.user, pk=pk)
+        if batch is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(GenerationBatchSerializer(batch).data)
+
 
 class SaveBlogView(APIView):
     """
     POST /api/save-blog/
-    Body: { "title": "...", "content": "...", "link": "https://youtube.com/..." }
+    Body: { "title": "...", "content": "...", "markdown": "...", "link": "https://youtube.com/..." }
     Requires: Authorization: Bearer <access_token>
 
-    This endpoint saves a generated blog to the database.
+    This endpoint saves a generated blog to the database. When "markdown" (the
+    generate response's source) is sent, the HTML is rendered from it and
+    "content" may be omitted.
     """
 
     permission_classes = [IsAuthenticated]
     throttle_classes = []
 
-    @transaction.atomic
     def post(self, request, *args, **kwargs):
         title = request.data.get("title")
         content = request.data.get("content")
+        markdown_text = request.data.get("markdown")
         link = request.data.get("link")
         tone = request.data.get("tone", "professional")
         length = request.data.get("length", "medium")
         force_update = request.data.get("force_update", False)
 
-        if not all([title, content, link]):
+        if not all([title, content or markdown_text, link]):
             return Response(
                 {"detail": "Missing required fields: title, content, or link."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
         try:
-            # Check if this blog already exists for this user
-            repo = BlogRepository()
-            existing_blog = repo.get_by_params(
-                user=request.user, youtube_link=link, tone=tone, length=length
-            )
-
-            if existing_blog:
-                if force_update:
-                    updated_blog = repo.update_content(
-                        blog_post=existing_blog, new_content=content
-                    )
-                    return Response(
-                        {
-                            "status": "updated",
-                            "message": "Blog updated successfully!",
-                            "id": updated_blog.id,
-                        },
-                        status=status.HTTP_200_OK,
-                    )
-                else:
-                    return Response(
-                        {
-                            "status": "exists",
-                            "message": "A blog for this video with the same settings already exists.",
-                            "id": existing_blog.id,
-                        },
-                        status=status.HTTP_200_OK,
-                    )
-
-            # Save to database
-            post = BlogRepository().create(
+            post, outcome = BlogRepository().save_or_update(
                 user=request.user,
-                youtube_title=title,
                 youtube_link=link,
-                generated_content=content,
                 tone=tone,
                 length=length,
+                youtube_title=title,
+                generated_content=content or "",
+                content_markdown=markdown_text or "",
+                overwrite=bool(force_update),
             )
 
+            if outcome == "updated":
+                return Response(
+                    {
+                        "status": "updated",
+                        "message": "Blog updated successfully!",
+                        "id": post.id,
+                    },
+                    status=status.HTTP_200_OK,
+                )
+            if outcome == "exists":
+                return Response(
+                    {
+                        "status": "exists",
+                        "message": "A blog for this video with the same settings already exists.",
+                        "id": post.id,
+                    },
+                    status=status.HTTP_200_OK,
+                )
+
             return Response(
                 {
                     "id": post.id,
@@ -241,10 +438,12 @@ class SaveBlogView(APIView):
             )
 
         except Exception as e:
-            import logging
-
-            logger = logging.getLogger(__name__)
-            logger.error(f"Blog save failed for user {request.user.id}: {str(e)}")
+            logger.exception(
+                "Blog save failed for user %s: %s",
+                request.user.id,
+                e,
+                extra={"user_id": request.user.id},
+            )
 
             return Response(
                 {"detail": f"Save failed: {str(e)}"},
@@ -253,15 +452,121 @@ class SaveBlogView(APIView):
 
 
 class BlogListAPIView(APIView):
+    """
+    GET /api/blogs?q=<search>&sort=<newest|oldest|title|title-desc>&page_size=<n>
+
+    Paginated list without article bodies: sorted (newest first by default)
+    with a cursor, or by page for the title sorts and for ranked search
+    results when ``q`` is given, in which case ``sort`` is ignored. The first page also carries ``stats``,
+    totals over the whole library, since the client only holds loaded pages.
+    Each item carries the excerpt, word count and reading time stored when the
+    post was saved; the full content is served by the detail endpoint.
+
+    The ETag combines the user's list version with the full query string, so
+    an unchanged page is answered with 304 before touching the posts table.
+    """
+
     permission_classes = [IsAuthenticated]
     throttle_classes = []
 
     def get(self, request):
-        query = request.query_params.get("q")
+        version = BlogVersions().get(request.user.pk)
+        digest = hashlib.sha256(
+            f"{version.token}:{request.get_full_path()}".encode("utf-8")
+        ).hexdigest()[:32]
+        etag = f'W/"{digest}"'
+        not_modified = conditional_response(
+            request, etag=etag, last_modified=version.modified
+        )
+        if not_modified is not None:
+            return not_modified
+
+        query = (request.query_params.get("q") or "").strip()
         repo = BlogRepository()
-        blog_qs = repo.list_for_user(request.user, query=query)
-        serializer = BlogPostSerializer(blog_qs, many=True)
-        return Response(serializer.data)
+        blog_qs = repo.slim(repo.list_for_user(request.user, query=query))
+
+        paginator = blog_list_pagination(request, query)
+        page = paginator.paginate_queryset(blog_qs, request, view=self)
+        serializer = BlogPostListSerializer(page, many=True)
+        response = paginator.get_paginated_response(serializer.data)
+        if paginator.get_previous_link() is None:
+            response.data["stats"] = repo.library_stats(request.user)
+        return set_validators(response, etag=etag, last_modified=version.modified)
+
+
+def _bulk_items(data, key: str, limit: int):
+    """The ``key`` list of a bulk body, or an error response."""
+    items = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, Response(
+            {"detail": f"Provide a non-empty '{key}' list."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if len(items) > limit:
+        return None, Response(
+            {"detail": f"At most {limit} items per request."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return items, None
+
+
+class BlogBulkAPIView(APIView):
+    """
+    POST   /api/blogs/bulk/ Body: { "items": [{title, content|markdown, link, tone, length}], "force_update": bool }
+    PATCH  /api/blogs/bulk/ Body: { "items": [{id, youtube_title?, generated_content?, content_markdown?}] }
+    DELETE /api/blogs/bulk/ Body: { "ids": [1, 2, ...] } (or ?ids=1,2,...)
+
+    Saves, edits or deletes many of the user's posts in a handful of queries
+    instead of one request per post. At most BLOG_BULK_MAX_ITEMS per request.
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_classes = []
+
+    def post(self, request):
+        items, error = _bulk_items(request.data, "items", settings.BLOG_BULK_MAX_ITEMS)
+        if error:
+            return error
+        serializer = BlogBulkSaveItemSerializer(data=items, many=True)
+        serializer.is_valid(raise_exception=True)
+        results = BlogRepository().bulk_save(
+            user=request.user,
+            items=serializer.validated_data,
+            overwrite=bool(request.data.get("force_update", False)),
+        )
+        counts = {
+            outcome: sum(1 for result in results if result["status"] == outcome)
+            for outcome in ("created", "updated", "exists")
+        }
+        return Response({"counts": counts, "results": results})
+
+    def patch(self, request):
+        items, error = _bulk_items(request.data, "items", settings.BLOG_BULK_MAX_ITEMS)
+        if error:
+            return error
+        serializer = BlogBulkUpdateItemSerializer(data=items, many=True)
+        serializer.is_valid(raise_exception=True)
+        updated, missing = BlogRepository().bulk_update(
+            user=request.user, items=serializer.validated_data
+        )
+        return Response({"updated": updated, "not_found": missing})
+
+    def delete(self, request):
+        data = request.data
+        if not data and request.query_params.get("ids"):
+            data = {"ids": request.query_params["ids"].split(",")}
+        ids, error = _bulk_items(data, "ids", settings.BLOG_BULK_MAX_ITEMS)
+        if error:
+            return error
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "'ids' must be integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        deleted = BlogRepository().bulk_delete(user=request.user, ids=ids)
+        return Response({"deleted": deleted})
 
 
 class BlogDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
@@ -278,22 +583,80 @@ class BlogDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return BlogPost.objects.filter(user=self.request.user)
 
+    def retrieve(self, request, *args, **kwargs):
+        # Only the timestamp is read before deciding on 304; the content
+        # column is loaded and serialized only for a changed post.
+        updated_at = (
+            self.get_queryset()
+            .filter(pk=kwargs[self.lookup_field])
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is not None:
+            etag = f'"{kwargs[self.lookup_field]}-{int(updated_at.timestamp() * 1e6)}"'
+            not_modified = conditional_response(
+                request, etag=etag, last_modified=updated_at
+            )
+            if not_modified is not None:
+                return not_modified
+        response = super().retrieve(request, *args, **kwargs)
+        if updated_at is not None:
+            set_validators(response, etag=etag, last_modified=updated_at)
+        return response
+
     def delete(self, request, *args, **kwargs):
         self.destroy(request, *args, **kwargs)
         return Response({"success": True}, status=status.HTTP_204_NO_CONTENT)
 
+    def perform_update(self, serializer):
+        data = serializer.validated_data
+        if "generated_content" not in data and "content_markdown" not in data:
+            serializer.save()
+            return
+        # Markdown wins; HTML edited on its own drops the stale markdown.
+        content = render_content(
+            markdown_text=data.get("content_markdown", ""),
+            html=data.get("generated_content", ""),
+        )
+        serializer.save(**content.as_fields())
+
     def partial_update(self, request, *args, **kwargs):
         """Handle PATCH requests for partial updates"""
         instance = self.get_object()
 
         # Only allow updating these fields
-        allowed_fields = ["youtube_title", "generated_content"]
+        allowed_fields = ["youtube_title", "generated_content", "content_markdown"]
         filtered_data = {
             key: value for key, value in request.data.items() if key in allowed_fields
         }
 
         serializer = self.get_serializer(instance, data=filtered_data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        self.perform_update(serializer)
 
         return Response(serializer.data)
+
+
+class MetricsView(APIView):
+    """
+    GET /metrics -> Prometheus text exposition of the generation metrics,
+    summed over every process when PROMETHEUS_MULTIPROC_DIR is set.
+
+    Scrapers send "Authorization: Bearer <METRICS_TOKEN>". Without a
+    METRICS_TOKEN only staff users (JWT) can read it.
+    """
+
+    permission_classes = [MetricsPermission]
+    throttle_classes = []
+
+    def get_authenticators(self):
+        # The metrics token is not a JWT; don't let JWT auth reject it.
+        if settings.METRICS_TOKEN:
+            return []
+        return super().get_authenticators()
+
+    def get(self, request):
+        return HttpResponse(
+            metrics_registry.render(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
@@ -114,6 +114,7 @@ export class BlogGeneratorComponent {
     const payload = {
       title: this.blogResponse.title,
       content: this.blogResponse.content,
+      markdown: this.blogResponse.markdown,
       link: this.linkForm.get('link')?.value,
       tone: this.linkForm.get('tone')?.value,
       length: this.linkForm.get('length')?.value,
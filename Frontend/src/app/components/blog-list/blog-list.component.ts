@@ -2,27 +2,33 @@ import { CommonModule } from '@angular/common';
 import { Component, HostListener, OnInit } from '@angular/core';
 import { FormsModule } from '@angular/forms';
 import { RouterModule } from '@angular/router';
-import { Blog } from '../../models/blog';
-import { TruncateHtmlPipe } from '../../pipes/truncate-html.pipe';
+import { BlogSummary } from '../../models/blog-summary';
+import { LibraryStats } from '../../models/library-stats';
 import { AuthService } from '../../services/auth.service';
 import { BlogService } from '../../services/blog.service';
 import { ThemeService } from '../../services/theme.service';
 
 @Component({
   selector: 'app-blog-list',
-  imports: [CommonModule, RouterModule, FormsModule, TruncateHtmlPipe],
+  imports: [CommonModule, RouterModule, FormsModule],
   templateUrl: './blog-list.component.html',
   styleUrl: './blog-list.component.css',
   standalone: true
 })
 export class BlogListComponent implements OnInit {
-  blogs: Blog[] = [];
+  blogs: BlogSummary[] = [];
+  // Totals over the whole library, not just the loaded pages.
+  stats: LibraryStats = { count: 0, videos: 0, reading_time: 0 };
+  // Posts matching the current view (the library, or the search results).
+  totalCount = 0;
+  nextPageUrl: string | null = null;
+  loadingMore = false;
   searchTerm = '';
   user = localStorage.getItem('username') || '';
   darkMode = false;
   isMobileMenuOpen: boolean = false;
   showScrollTop = false;
-  blogToDelete?: Blog;
+  blogToDelete?: BlogSummary;
 
   // New properties for enhanced features
   viewMode: 'grid' | 'list' = 'grid';
@@ -46,17 +52,43 @@ export class BlogListComponent implements OnInit {
   }
 
   loadBlogs() {
-    this.blogService.getBlogs(this.searchTerm)
+    this.blogService.getBlogs(this.searchTerm, this.sortBy)
       .subscribe({
-        next: (data) => {
-          this.blogs = data;
-          this.applySorting();
+        next: (page) => {
+          this.blogs = page.results;
+          this.nextPageUrl = page.next;
+          if (page.stats) {
+            this.stats = page.stats;
+          }
+          this.totalCount = this.searchTerm ? (page.count ?? page.results.length) : this.stats.count;
+          this.currentPage = 1;
           this.calculatePagination();
         },
         error: (err) => console.error('Error fetching blogs', err)
       });
   }
 
+  // The API pages the library; fetch the next page and append it, until the
+  // current client-side page is filled.
+  loadMore() {
+    if (!this.nextPageUrl || this.loadingMore) return;
+    this.loadingMore = true;
+    this.blogService.getBlogsPage(this.nextPageUrl)
+      .subscribe({
+        next: (page) => {
+          this.blogs = [...this.blogs, ...page.results];
+          this.nextPageUrl = page.next;
+          this.loadingMore = false;
+          this.calculatePagination();
+          this.fillCurrentPage();
+        },
+        error: (err) => {
+          this.loadingMore = false;
+          console.error('Error fetching blogs', err);
+        }
+      });
+  }
+
   toggleMobileMenu(): void {
     this.isMobileMenuOpen = !this.isMobileMenuOpen;
   }
@@ -74,59 +106,16 @@ export class BlogListComponent implements OnInit {
     this.onSearch();
   }
 
+  // The API sorts the whole library; client-side sorting would only reorder
+  // the loaded pages (and would undo the ranking of search results).
   onSortChange() {
-    this.applySorting();
-  }
-
-  applySorting() {
-    if (!this.blogs || this.blogs.length === 0) return;
-
-    switch (this.sortBy) {
-      case 'newest':
-        // Sort by ID descending (assuming higher ID = newer)
-        this.blogs.sort((a, b) => b.id - a.id);
-        break;
-      case 'oldest':
-        // Sort by ID ascending
-        this.blogs.sort((a, b) => a.id - b.id);
-        break;
-      case 'title':
-        // Sort alphabetically A-Z
-        this.blogs.sort((a, b) =>
-          a.youtube_title.localeCompare(b.youtube_title)
-        );
-        break;
-      case 'title-desc':
-        // Sort alphabetically Z-A
-        this.blogs.sort((a, b) =>
-          b.youtube_title.localeCompare(a.youtube_title)
-        );
-        break;
-    }
-  }
-
-  // Helper methods for stats and content analysis
-  getWordCount(content: string): number {
-    if (!content) return 0;
-    const text = content.replace(/<[^>]*>/g, '');
-    return text.trim().split(/\s+/).filter(word => word.length > 0).length;
-  }
-
-  getReadingTime(content: string): number {
-    const words = this.getWordCount(content);
-    return Math.ceil(words / 200); // 200 words per minute average reading speed
-  }
-
-  getTotalReadingTime(): number {
-    if (!this.blogs || this.blogs.length === 0) return 0;
-    return this.blogs.reduce((total, blog) => {
-      return total + this.getReadingTime(blog.generated_content);
-    }, 0);
+    this.loadBlogs();
   }
 
   // Pagination methods
   calculatePagination() {
-    this.totalPages = Math.ceil(this.blogs.length / this.itemsPerPage);
+    const total = Math.max(this.totalCount, this.blogs.length);
+    this.totalPages = Math.ceil(total / this.itemsPerPage);
     // Reset to page 1 if current page exceeds total pages
     if (this.currentPage > this.totalPages) {
       this.currentPage = 1;
@@ -136,9 +125,16 @@ export class BlogListComponent implements OnInit {
   goToPage(page: number) {
     if (page < 1 || page > this.totalPages) return;
     this.currentPage = page;
+    this.fillCurrentPage();
     window.scrollTo({ top: 0, behavior: 'smooth' });
   }
 
+  fillCurrentPage() {
+    if (this.blogs.length < this.currentPage * this.itemsPerPage && this.nextPageUrl) {
+      this.loadMore();
+    }
+  }
+
   getPageNumbers(): number[] {
     const pages: number[] = [];
     const maxPagesToShow = 5;
@@ -167,7 +163,7 @@ export class BlogListComponent implements OnInit {
     return pages;
   }
 
-  getPaginatedBlogs(): Blog[] {
+  getPaginatedBlogs(): BlogSummary[] {
     const startIndex = (this.currentPage - 1) * this.itemsPerPage;
     const endIndex = startIndex + this.itemsPerPage;
     return this.blogs.slice(startIndex, endIndex);
@@ -188,7 +184,7 @@ export class BlogListComponent implements OnInit {
     window.scrollTo({ top: 0, behavior: 'smooth' });
   }
 
-  openDeleteModal(blog: Blog) {
+  openDeleteModal(blog: BlogSummary) {
     this.blogToDelete = blog;
   }
 
@@ -201,11 +197,14 @@ export class BlogListComponent implements OnInit {
     this.blogService.deleteBlog(this.blogToDelete.id).subscribe({
       next: () => {
         this.blogs = this.blogs.filter(b => b.id !== this.blogToDelete!.id);
+        this.totalCount = Math.max(0, this.totalCount - 1);
+        this.refreshStats();
         this.calculatePagination();
         // If current page is now empty, go to previous page
         if (this.getPaginatedBlogs().length === 0 && this.currentPage > 1) {
           this.currentPage--;
         }
+        this.fillCurrentPage();
         this.closeDeleteModal();
       },
       error: (err) => {
@@ -215,6 +214,17 @@ export class BlogListComponent implements OnInit {
     });
   }
 
+  refreshStats() {
+    this.blogService.getLibraryStats().subscribe({
+      next: (stats) => {
+        if (stats) {
+          this.stats = stats;
+        }
+      },
+      error: (err) => console.error('Error fetching library stats', err)
+    });
+  }
+
   logout() {
     this.auth.logout();
   }
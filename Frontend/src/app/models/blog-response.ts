@@ -2,6 +2,7 @@ export interface BlogResponse {
     id?: number;
     title: string;
     content: string;
+    markdown?: string;
     tone?: string;
     length?: string;
 }
\ No newline at end of file
@@ -0,0 +1,10 @@
+export interface BlogSummary {
+    id: number;
+    youtube_title: string;
+    tone: string;
+    length: string;
+    created_at?: string;
+    excerpt: string;
+    word_count: number;
+    reading_time: number;
+}
\ No newline at end of file
@@ -2,8 +2,11 @@ export interface Blog {
     id: number;
     youtube_title: string;
     generated_content: string;
+    content_markdown?: string;
     youtube_link: string;
     created_at?: string;
     tone: string;
     length: string;
+    word_count?: number;
+    reading_time?: number;
 }
\ No newline at end of file
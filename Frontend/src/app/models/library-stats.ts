@@ -0,0 +1,5 @@
+export interface LibraryStats {
+    count: number;
+    videos: number;
+    reading_time: number;
+}
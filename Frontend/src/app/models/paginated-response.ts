@@ -0,0 +1,10 @@
+import { LibraryStats } from './library-stats';
+
+export interface PaginatedResponse<T> {
+    next: string | null;
+    previous: string | null;
+    count?: number;
+    results: T[];
+    // First page only: totals over the whole library.
+    stats?: LibraryStats;
+}
\ No newline at end of file
@@ -1,6 +1,7 @@
 export interface SaveBlogRequest {
     title: string;
     content: string;
+    markdown?: string;
     link: string;
     tone: string;
     length: string;
@@ -1,9 +1,12 @@
 import { HttpClient, HttpParams } from '@angular/common/http';
 import { Injectable } from '@angular/core';
-import { Observable } from 'rxjs';
+import { Observable, map } from 'rxjs';
 import { Blog } from '../models/blog';
 import { BlogExportData } from '../models/blog-export-data';
+import { BlogSummary } from '../models/blog-summary';
 import { BlogUpdateRequest } from '../models/blog-update-request';
+import { LibraryStats } from '../models/library-stats';
+import { PaginatedResponse } from '../models/paginated-response';
 
 @Injectable({
   providedIn: 'root'
@@ -12,12 +15,27 @@ export class BlogService {
   private readonly apiUrl = 'http://localhost:8000/api';
   constructor(private http: HttpClient) { }
 
-  getBlogs(q: string) {
+  // First page of the library in the chosen order, or ranked by relevance
+  // when searching (sort only applies without q).
+  getBlogs(q: string, sort: string = 'newest'): Observable<PaginatedResponse<BlogSummary>> {
     let params = new HttpParams();
     if (q) {
       params = params.set('q', q);
+    } else {
+      params = params.set('sort', sort);
     }
-    return this.http.get<Blog[]>(`${this.apiUrl}/blogs`, { params });
+    return this.http.get<PaginatedResponse<BlogSummary>>(`${this.apiUrl}/blogs`, { params });
+  }
+
+  // Following pages: the API returns the full `next` URL.
+  getBlogsPage(url: string): Observable<PaginatedResponse<BlogSummary>> {
+    return this.http.get<PaginatedResponse<BlogSummary>>(url);
+  }
+
+  getLibraryStats(): Observable<LibraryStats | undefined> {
+    const params = new HttpParams().set('page_size', '1');
+    return this.http.get<PaginatedResponse<BlogSummary>>(`${this.apiUrl}/blogs`, { params })
+      .pipe(map(page => page.stats));
   }
 
   deleteBlog(id: number) {